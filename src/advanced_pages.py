@@ -32,6 +32,16 @@ try:
 except ImportError:
     from themes import ALL_THEMES, get_theme_names, set_current_theme
 
+# Inventaire partagé des logiciels installés
+try:
+    from .installed_inventory import get_inventory
+    from .tool_discovery import get_tool_discovery
+    from .update_service import get_update_service
+except ImportError:
+    from installed_inventory import get_inventory
+    from tool_discovery import get_tool_discovery
+    from update_service import get_update_service
+
 # Import optionnel de psutil et wmi
 try:
     import psutil
@@ -1752,15 +1762,8 @@ class BackupPage(ctk.CTkFrame):
             if not result:
                 return
 
-            # Vérifier winget
-            check_result = subprocess.run(
-                ["winget", "--version"],
-                capture_output=True,
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-            )
-
-            if check_result.returncode != 0:
+            # Vérifier winget (recherche PATH, sans lancer de processus)
+            if not get_tool_discovery().available('winget'):
                 messagebox.showerror(
                     "WinGet non disponible",
                     "WinGet n'est pas installé ou n'est pas dans le PATH.\n\n"
@@ -2797,17 +2800,11 @@ class UpdatesPage(ctk.CTkFrame):
                 "Cela peut prendre quelques secondes."
             )
 
-            result = subprocess.run(
-                ["winget", "list"],
-                capture_output=True,
-                text=True
-            )
-
-            if result.returncode == 0:
-                # Compter les apps
-                lines = result.stdout.split('\n')
-                app_count = len([l for l in lines if l.strip() and not l.startswith('-')])
+            # Instantané partagé: registre, winget et dossiers en une seule passe
+            inventory = get_inventory(refresh=True)
+            app_count = inventory.installed_count()
 
+            if app_count or inventory.winget_available:
                 messagebox.showinfo(
                     "Scan terminé",
                     f"✅ {app_count} applications détectées !\n\n"
@@ -2816,7 +2813,7 @@ class UpdatesPage(ctk.CTkFrame):
                     "voir les apps obsolètes."
                 )
             else:
-                raise Exception("Winget non disponible")
+                raise Exception("Aucune source d'inventaire disponible")
 
         except Exception as e:
             messagebox.showerror(
@@ -2826,57 +2823,102 @@ class UpdatesPage(ctk.CTkFrame):
             )
 
     def _check_updates(self):
-        """Vérifier les mises à jour"""
-        try:
-            messagebox.showinfo(
-                "Vérification",
-                "Vérification des mises à jour disponibles...\n\n"
-                "Cela peut prendre quelques minutes."
-            )
-
-            result = subprocess.run(
-                ["winget", "upgrade"],
-                capture_output=True,
-                text=True
-            )
-
-            if result.returncode == 0:
-                # Afficher les résultats
-                window = tk.Toplevel(self)
-                window.title("Mises à Jour Disponibles")
-                window.geometry("800x600")
-                window.configure(fg_color=ModernColors.BG_DARK)
-
-                text = scrolledtext.ScrolledText(
-                    window,
-                    font=("Consolas", 9),
-                    fg_color=ModernColors.BG_LIGHT,
-                    text_color=ModernColors.TEXT_PRIMARY,
-                    wrap=tk.WORD
-                )
-                text.pack(fill=tk.BOTH, expand=True)
-                text.insert(tk.END, result.stdout)
-                text.configure(state=tk.DISABLED)
-            else:
-                raise Exception("Erreur winget")
+        """Vérifier les mises à jour (analyse winget en arrière-plan)"""
+        self._scan_status("🔍 Vérification des mises à jour en cours...")
+        get_update_service().scan_async(lambda scan: self.after(0, lambda: self._show_updates(scan)), refresh=True)
+
+    def _scan_status(self, text):
+        """Affiche l'état de l'analyse sous la section mises à jour"""
+        if getattr(self, '_updates_status', None) is None:
+            self._updates_status = ctk.CTkLabel(
+                self.scrollable_frame,
+                text="",
+                font=("Segoe UI", 10),
+                fg_color=ModernColors.BG_DARK,
+                text_color=ModernColors.TEXT_SECONDARY,
+                anchor='w')
+            self._updates_status.pack(fill=tk.X)
+        self._updates_status.configure(text=text)
 
-        except Exception as e:
+    def _show_updates(self, scan):
+        """Afficher les mises à jour détectées (nouveautés mises en évidence)"""
+        if not scan.ok:
+            self._scan_status("")
             messagebox.showerror(
                 "Erreur",
-                f"Impossible de vérifier les mises à jour.\n\n{str(e)}"
+                f"Impossible de vérifier les mises à jour.\n\n{scan.error}"
             )
+            return
+        source = " (d'après le catalogue, WinGet absent)" if scan.offline else ""
+        self._scan_status(f"🔄 {len(scan.records)} mise(s) à jour disponible(s){source} — {scan.diff.summary()}")
 
-    def _update_all(self):
-        """Mettre à jour toutes les apps avec fenêtre de progression"""
-        result = messagebox.askyesno(
-            "Mise à jour globale",
-            "Mettre à jour toutes les applications obsolètes ?\n\n"
-            "Cette opération peut prendre du temps.\n\n"
-            "Continuer ?"
-        )
+        window = tk.Toplevel(self)
+        window.title("Mises à Jour Disponibles")
+        window.geometry("800x600")
+        window.configure(fg_color=ModernColors.BG_DARK)
 
-        if not result:
-            return
+        summary = ctk.CTkLabel(
+            window,
+            text=f"{len(scan.records)} mise(s) à jour disponible(s) — changements: {scan.diff.summary()}",
+            font=("Segoe UI", 11, "bold"),
+            fg_color=ModernColors.BG_DARK,
+            text_color=ModernColors.TEXT_PRIMARY)
+        summary.pack(fill=tk.X, pady=10)
+
+        rows = ctk.CTkScrollableFrame(window, fg_color=ModernColors.BG_DARK)
+        rows.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        new_ids = {record.id for record in scan.diff.added + scan.diff.changed}
+        # Cases à cocher propres à cette fenêtre: oubliées à sa fermeture
+        selection = self._update_selection = {}
+
+        def close():
+            if self._update_selection is selection:
+                self._update_selection = {}
+            window.destroy()
+
+        window.protocol("WM_DELETE_WINDOW", close)
+        for record in scan.records:
+            selected = tk.BooleanVar(value=not record.truncated)
+            selection[record.id] = selected
+            marker = "🆕 " if record.id in new_ids else ""
+            ctk.CTkCheckBox(
+                rows,
+                text=f"{marker}{record.name or record.id}  ({record.id})   "
+                     f"{record.installed_version} → {record.available_version}",
+                variable=selected,
+                font=("Consolas", 10),
+                text_color=ModernColors.TEXT_PRIMARY
+            ).pack(fill=tk.X, anchor='w', pady=2)
+
+        ctk.CTkButton(
+            window,
+            text="⚡ Mettre à Jour la Sélection",
+            font=("Segoe UI", 10, "bold"),
+            fg_color=ModernColors.GREEN_SUCCESS,
+            text_color=ModernColors.TEXT_PRIMARY,
+            command=lambda: (self._update_all(confirm=False), close())
+        ).pack(pady=10)
+
+    def _update_all(self, confirm=True):
+        """
+        Mettre à jour les apps par lots, avec fenêtre de progression
+
+        Args:
+            confirm: True depuis le bouton (confirmation, toutes les mises à jour
+                     de la nouvelle analyse); False depuis la fenêtre des
+                     résultats (seulement les cases cochées)
+        """
+        if confirm:
+            result = messagebox.askyesno(
+                "Mise à jour globale",
+                "Mettre à jour toutes les applications obsolètes ?\n\n"
+                "Cette opération peut prendre du temps.\n\n"
+                "Continuer ?"
+            )
+
+            if not result:
+                return
 
         try:
             # Créer fenêtre de progression
@@ -2889,7 +2931,7 @@ class UpdatesPage(ctk.CTkFrame):
             # Header
             header = ctk.CTkLabel(
                 progress_window,
-                text="🔄 Mise à jour de toutes les applications",
+                text="🔄 Mise à jour des applications",
                 font=("Segoe UI", 14, "bold"),
                 fg_color=ModernColors.BG_DARK,
                 text_color=ModernColors.TEXT_PRIMARY
@@ -2899,7 +2941,7 @@ class UpdatesPage(ctk.CTkFrame):
             # Status label
             status_label = ctk.CTkLabel(
                 progress_window,
-                text="Lancement de WinGet...",
+                text="Recherche des mises à jour...",
                 font=("Segoe UI", 10),
                 fg_color=ModernColors.BG_DARK,
                 text_color=ModernColors.TEXT_SECONDARY
@@ -2917,40 +2959,26 @@ class UpdatesPage(ctk.CTkFrame):
             )
             log_text.pack(padx=20, fill=tk.BOTH, expand=True)
 
-            def run_updates():
-                try:
-                    log_text.insert(tk.END, "Démarrage de WinGet upgrade --all\n")
-                    log_text.insert(tk.END, "="*60 + "\n\n")
-                    progress_window.update()
-
-                    # Exécuter winget upgrade --all
-                    process = subprocess.Popen(
-                        ["winget", "upgrade", "--all", "--accept-source-agreements", "--accept-package-agreements"],
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True,
-                        creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-                    )
-
-                    # Lire la sortie en temps réel
-                    for line in process.stdout:
-                        log_text.insert(tk.END, line)
-                        log_text.see(tk.END)
-                        progress_window.update()
+            stop_event = threading.Event()
+            progress_window.protocol("WM_DELETE_WINDOW", lambda: (stop_event.set(), progress_window.destroy()))
+            # Cases de la fenêtre des résultats seulement (jamais celles d'une ancienne fenêtre)
+            selection = {} if confirm else {
+                package_id: var.get() for package_id, var in getattr(self, '_update_selection', {}).items()
+            }
 
-                    # Attendre la fin
-                    process.wait()
+            def ui(func):
+                if not stop_event.is_set():
+                    self.after(0, func)
 
-                    # Afficher résultat
-                    log_text.insert(tk.END, "\n" + "="*60 + "\n")
-                    if process.returncode == 0:
-                        log_text.insert(tk.END, "\n✅ Mises à jour terminées avec succès!\n")
-                        status_label.configure(text="✅ Terminé!")
-                    else:
-                        log_text.insert(tk.END, f"\n⚠️ Terminé avec code: {process.returncode}\n")
-                        status_label.configure(text="⚠️ Terminé avec avertissements")
+            def log(message):
+                def append():
+                    log_text.insert(tk.END, message + "\n")
+                    log_text.see(tk.END)
+                ui(append)
 
-                    # Bouton fermer
+            def finish(text):
+                def show():
+                    status_label.configure(text=text)
                     close_btn = ctk.CTkButton(
                         progress_window,
                         text="Fermer",
@@ -2959,10 +2987,42 @@ class UpdatesPage(ctk.CTkFrame):
                         text_color=ModernColors.TEXT_PRIMARY,
                         command=progress_window.destroy)
                     close_btn.pack(pady=10)
+                ui(show)
+
+            def run_updates():
+                service = get_update_service()
+                try:
+                    scan = service.scan()
+                    if not scan.ok:
+                        log(f"❌ Erreur: {scan.error}")
+                        finish("❌ Erreur lors de la mise à jour")
+                        return
+                    ids = [record.id for record in scan.records if selection.get(record.id, confirm)]
+                    if not ids:
+                        log("✅ Aucune mise à jour à appliquer")
+                        finish("✅ Terminé!")
+                        return
+
+                    log(f"Mise à jour de {len(ids)} application(s) par lots")
+                    log("=" * 60)
+
+                    def progress(done, total):
+                        ui(lambda: status_label.configure(text=f"Mise à jour {done}/{total}..."))
+
+                    results = service.upgrade(ids, log_callback=log, progress_callback=progress,
+                                              stop_event=stop_event)
+                    failed = [package_id for package_id, ok in results.items() if not ok]
+                    log("=" * 60)
+                    if failed:
+                        log(f"⚠️ {len(failed)} échec(s): {', '.join(failed)}")
+                        finish("⚠️ Terminé avec avertissements")
+                    else:
+                        log("✅ Mises à jour terminées avec succès!")
+                        finish("✅ Terminé!")
 
                 except Exception as e:
-                    log_text.insert(tk.END, f"\n❌ Erreur: {str(e)}\n")
-                    status_label.configure(text="❌ Erreur lors de la mise à jour")
+                    log(f"❌ Erreur: {str(e)}")
+                    finish("❌ Erreur lors de la mise à jour")
 
             # Lancer dans un thread
             threading.Thread(target=run_updates, daemon=True).start()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Moteur d'installation asyncio
+Orchestration des sessions d'installation d'InstallerManager: chaque
+programme est une tâche (téléchargement + vérification, puis installation)
+annulable par un jeton et bornée par un délai. Les étapes bloquantes
+(requests, sous-processus, courtier d'élévation) s'exécutent dans deux pools
+de taille fixe; les programmes en attente ne sont que des coroutines.
+
+Un arrêt annule le jeton de session: les téléchargements s'interrompent au
+bloc suivant, les processus sont tués, et `run()` rend la main immédiatement
+sans attendre les threads (qui se terminent d'eux-mêmes).
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Délais par défaut d'une étape (secondes, None = illimité)
+DEFAULT_DOWNLOAD_TIMEOUT = 3600
+DEFAULT_INSTALL_TIMEOUT = 3600
+
+
+class OperationCancelled(Exception):
+    """Opération interrompue par un jeton d'annulation"""
+
+
+class CancellationToken:
+    """
+    Jeton d'annulation thread-safe
+
+    Les callbacks enregistrés sont appelés une seule fois, dans le thread qui
+    annule (ou immédiatement si le jeton est déjà annulé). Un jeton enfant
+    est annulé avec son parent.
+    """
+
+    def __init__(self, parent: Optional['CancellationToken'] = None):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: Dict[int, Callable[[], None]] = {}
+        self._next_id = 0
+        self.reason = ''
+        if parent is not None:
+            parent.add_callback(lambda: self.cancel(parent.reason))
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = 'Annulé'):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = list(self._callbacks.values()), {}
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.debug(f"Callback d'annulation en erreur: {e}")
+
+    def add_callback(self, callback: Callable[[], None]) -> Optional[int]:
+        """Enregistre une action d'annulation; retourne un identifiant pour remove_callback"""
+        with self._lock:
+            if not self._event.is_set():
+                self._next_id += 1
+                self._callbacks[self._next_id] = callback
+                return self._next_id
+        callback()
+        return None
+
+    def remove_callback(self, handle: Optional[int]):
+        if handle is not None:
+            with self._lock:
+                self._callbacks.pop(handle, None)
+
+    def child(self) -> 'CancellationToken':
+        return CancellationToken(self)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise OperationCancelled(self.reason)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._event.wait(timeout)
+
+
+class AsyncInstallEngine:
+    """Exécute une session d'installation d'InstallerManager sur une boucle asyncio"""
+
+    def __init__(self, manager, download_timeout: Optional[float] = DEFAULT_DOWNLOAD_TIMEOUT,
+                 install_timeout: Optional[float] = DEFAULT_INSTALL_TIMEOUT):
+        """
+        Args:
+            manager: InstallerManager (catalogue, journal, étapes d'installation)
+            download_timeout: Délai maximum du téléchargement d'un programme
+            install_timeout: Délai maximum de l'installation d'un programme
+        """
+        self.manager = manager
+        self.download_timeout = download_timeout or None
+        self.install_timeout = install_timeout or None
+        self.token = CancellationToken()
+        self._job_tokens: Dict[str, CancellationToken] = {}
+        self.total_programs = 0
+
+    def cancel(self):
+        """Arrête la session (retour immédiat, appelable depuis n'importe quel thread)"""
+        self.token.cancel("Installation arrêtée par l'utilisateur")
+
+    def run_sync(self, program_list: List[str], progress_callback, success_list: List[Dict],
+                 failed_list: List[Dict], resume_session_id: Optional[str] = None) -> Optional[int]:
+        """Façade synchrone de run() pour les appels depuis un thread de l'interface"""
+        return asyncio.run(self.run(program_list, progress_callback, success_list, failed_list, resume_session_id))
+
+    def _job_token(self, program_name: str) -> CancellationToken:
+        token = self._job_tokens.get(program_name)
+        if token is None:
+            token = self._job_tokens[program_name] = self.token.child()
+        return token
+
+    def _call(self, token: CancellationToken, func, *args):
+        """Exécute une étape bloquante avec le jeton du programme attaché au thread"""
+        token.raise_if_cancelled()
+        with self.manager.cancellation_scope(token):
+            return func(*args)
+
+    async def _until_stopped(self, awaitable, stop_waiter: asyncio.Future):
+        """Attend un résultat, ou lève OperationCancelled dès l'arrêt de la session"""
+        future = asyncio.ensure_future(awaitable)
+        done, _ = await asyncio.wait({future, stop_waiter}, return_when=asyncio.FIRST_COMPLETED)
+        if future not in done:
+            future.cancel()
+            raise OperationCancelled(self.token.reason)
+        return future.result()
+
+    async def _prepare(self, program_name: str, executor) -> Dict:
+        """Étape téléchargement et vérification d'empreinte"""
+        # Jeton propre au téléchargement: un dépassement de délai laisse le repli winget possible
+        token = self._job_token(program_name).child()
+        loop = asyncio.get_running_loop()
+        step = loop.run_in_executor(executor, self._call, token, self.manager._prepare_program, program_name)
+        try:
+            return await asyncio.wait_for(step, self.download_timeout)
+        except asyncio.TimeoutError:
+            token.cancel('Délai de téléchargement dépassé')
+            self.manager.log_callback(f"⏱️ Délai de téléchargement dépassé pour {program_name}", "warning")
+        except OperationCancelled:
+            pass
+        except Exception as e:
+            self.manager.log_callback(f"❌ Erreur lors de la préparation de {program_name}: {e}", "error")
+        return {'status': 'error', 'installer_path': None, 'sha256': None}
+
+    async def _install(self, program_name: str, prepare_task: asyncio.Future, executor):
+        """Étape installation (après le téléchargement du programme)"""
+        prepared = await prepare_task
+        token = self._job_token(program_name)
+        loop = asyncio.get_running_loop()
+        step = loop.run_in_executor(executor, self._call, token, self.manager._install_task, program_name, prepared)
+        try:
+            return await asyncio.wait_for(step, self.install_timeout)
+        except asyncio.TimeoutError:
+            token.cancel("Délai d'installation dépassé")
+            program_info = self.manager.programs_db.get(program_name, {})
+            return False, "Délai d'installation dépassé", self.manager._attempted_methods(program_info, prepared)
+        except OperationCancelled:
+            return False, token.reason or 'Annulé', None
+        except Exception as e:
+            self.manager.log_callback(f"❌ Erreur lors de l'installation de {program_name}: {e}", "error")
+            return False, str(e), None
+        finally:
+            # Étape annulée avant son exécution: l'installateur n'a pas libéré son chemin
+            self.manager._release_prepared(prepared)
+
+    async def run(self, program_list: List[str], progress_callback, success_list: List[Dict],
+                  failed_list: List[Dict], resume_session_id: Optional[str] = None) -> Optional[int]:
+        """
+        Exécute la session complète
+
+        Returns:
+            Nombre d'installations réussies, ou None si la session a été arrêtée
+        """
+        manager = self.manager
+        loop = asyncio.get_running_loop()
+        stop_event = asyncio.Event()
+        handle = self.token.add_callback(lambda: loop.call_soon_threadsafe(stop_event.set))
+        stop_waiter = asyncio.ensure_future(stop_event.wait())
+
+        # Les installations MSI/winget sont sérialisées par le planificateur
+        download_executor = ThreadPoolExecutor(max_workers=manager.max_concurrent_downloads,
+                                               thread_name_prefix="nitrite-download")
+        install_executor = ThreadPoolExecutor(max_workers=manager.max_concurrent_installs,
+                                              thread_name_prefix="nitrite-install")
+        prepare_tasks: Dict[str, asyncio.Future] = {}
+        running: Dict[asyncio.Future, str] = {}
+        scheduler = None
+
+        try:
+            scheduler = manager._create_scheduler(program_list)
+            order = scheduler.order
+            total_programs = self.total_programs = len(order)
+            manager._journal_start(order, resume_session_id)
+
+            # Bilan, inventaire et lot winget: étapes bloquantes hors de la boucle
+            prelude = loop.run_in_executor(install_executor, self._call, self.token,
+                                           manager._prepare_session, order, progress_callback)
+            batch_results = await self._until_stopped(prelude, stop_waiter)
+
+            success_count = 0
+            finished_count = 0
+            next_to_submit = 0
+            prefetch_window = manager.max_concurrent_downloads * 2
+
+            def record(program_name, success, error_reason, method):
+                nonlocal success_count, finished_count
+                manager._record_result(program_name, success, error_reason, method, success_list, failed_list)
+                success_count += int(success)
+                finished_count += 1
+
+            while not scheduler.finished:
+                # Garder la fenêtre de préchargement pleine
+                while next_to_submit < total_programs and \
+                        next_to_submit <= finished_count + len(running) + prefetch_window:
+                    program_name = order[next_to_submit]
+                    if program_name not in batch_results:
+                        prepare_tasks[program_name] = asyncio.ensure_future(
+                            self._prepare(program_name, download_executor))
+                    next_to_submit += 1
+
+                skipped = []
+                for program_name in scheduler.ready(limit=manager.max_concurrent_installs - len(running)):
+                    scheduler.start(program_name)
+                    if program_name in batch_results:
+                        success, error_reason, method = batch_results[program_name]
+                        skipped += scheduler.finish(program_name, success, error_reason or '')
+                        record(program_name, success, error_reason, method)
+                        continue
+                    progress_callback((finished_count / total_programs) * 100, f"Installation de {program_name}...")
+                    prepare_task = prepare_tasks.pop(program_name, None) or \
+                        asyncio.ensure_future(self._prepare(program_name, download_executor))
+                    running[asyncio.ensure_future(self._install(program_name, prepare_task, install_executor))] = program_name
+
+                if running:
+                    done, _ = await asyncio.wait(set(running) | {stop_waiter}, return_when=asyncio.FIRST_COMPLETED)
+                    if stop_waiter in done:
+                        raise OperationCancelled(self.token.reason)
+                    for task in done:
+                        program_name = running.pop(task)
+                        success, error_reason, method = task.result()
+                        skipped += scheduler.finish(program_name, success, error_reason or '')
+                        record(program_name, success, error_reason, method)
+                elif not skipped and not scheduler.ready():
+                    break  # Rien ne peut plus démarrer (ne devrait pas arriver)
+
+                # Programmes dont une dépendance a échoué
+                for program_name in skipped:
+                    record(program_name, False, scheduler.tasks[program_name].reason, None)
+
+            if self.token.cancelled:
+                raise OperationCancelled(self.token.reason)
+            manager._journal_end('completed')
+            return success_count
+
+        except OperationCancelled:
+            if scheduler is not None:
+                scheduler.cancel_pending()
+            manager._journal_end('stopped')
+            return None
+
+        finally:
+            self.token.remove_callback(handle)
+            stop_waiter.cancel()
+            for task in list(prepare_tasks.values()) + list(running):
+                task.cancel()
+            # Installateurs préchargés mais jamais exécutés (arrêt, dépendance en échec)
+            for task in prepare_tasks.values():
+                if task.done() and not task.cancelled():
+                    manager._release_prepared(task.result())
+            # Ne pas attendre les threads: ils s'arrêtent sur leur jeton
+            download_executor.shutdown(wait=False, cancel_futures=True)
+            install_executor.shutdown(wait=False, cancel_futures=True)
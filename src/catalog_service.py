@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Service de catalogue des programmes
+programs.json n'est analysé qu'une fois: le résultat, accompagné d'index
+précalculés (nom, catégorie, identifiant winget), est conservé en mémoire
+pour tout le processus et dans un cache binaire (pickle) validé par la date
+de modification et la taille du fichier source.
+
+Les données retournées sont partagées: les consommateurs qui les modifient
+doivent travailler sur une copie (voir ConfigManager).
+
+get_catalog() inclut les modifications du journal d'écriture anticipée
+(programs_journal) pas encore compactées dans programs.json: une URL
+modifiée ou un programme ajouté est visible tout de suite.
+
+Mesure du gain:
+    python catalog_service.py --bench [chemin/vers/programs.json]
+"""
+
+import os
+import sys
+import json
+import time
+import pickle
+import hashlib
+import logging
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .portable_paths import get_portable_cache_dir, get_executable_dir
+except ImportError:
+    from portable_paths import get_portable_cache_dir, get_executable_dir
+
+logger = logging.getLogger(__name__)
+
+# À incrémenter si la structure du cache change
+CACHE_VERSION = 3
+
+
+class Catalog:
+    """Catalogue analysé et indexé (lecture seule)"""
+
+    def __init__(self, categorized: Dict[str, Dict]):
+        self.categorized = categorized
+        # Index compacts (sérialisés dans le cache): nom -> catégorie, noms par catégorie,
+        # identifiant winget et nom en minuscules -> nom
+        self.category_by_name: Dict[str, str] = {}
+        self.categories: Dict[str, List[str]] = {}
+        self.by_winget_id: Dict[str, str] = {}
+        self.by_lower_name: Dict[str, str] = {}
+        for category, programs in categorized.items():
+            if not isinstance(programs, dict):
+                continue
+            names = self.categories.setdefault(category, [])
+            for name, info in programs.items():
+                if not isinstance(info, dict):
+                    continue
+                names.append(name)
+                # Nom présent dans plusieurs catégories: la première l'emporte
+                self.category_by_name.setdefault(name, category)
+                self.by_lower_name.setdefault(name.lower(), name)
+                winget_id = info.get('winget_id')
+                if winget_id:
+                    self.by_winget_id.setdefault(winget_id.lower(), name)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop('_flat', None)
+        return state
+
+    @property
+    def flat(self) -> Dict[str, Dict]:
+        """{nom: infos + 'category' + 'name'} (copies construites au premier accès)"""
+        flat = self.__dict__.get('_flat')
+        if flat is None:
+            flat = self._flat = {
+                name: dict(self.categorized[category][name], category=category, name=name)
+                for name, category in self.category_by_name.items()
+            }
+        return flat
+
+    @property
+    def count(self) -> int:
+        return len(self.category_by_name)
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Programme par nom exact, sinon insensible à la casse"""
+        info = self.flat.get(name)
+        if info is None:
+            real_name = self.by_lower_name.get(name.lower())
+            info = self.flat.get(real_name) if real_name else None
+        return info
+
+    def lookup(self, name: str) -> Optional[Tuple[str, Dict]]:
+        """(catégorie, infos d'origine) d'un programme par nom exact"""
+        category = self.category_by_name.get(name)
+        if category is None:
+            return None
+        return category, self.categorized[category][name]
+
+    def category_of(self, name: str) -> Optional[str]:
+        category = self.category_by_name.get(name)
+        if category is None and name.lower() in self.by_lower_name:
+            category = self.category_by_name[self.by_lower_name[name.lower()]]
+        return category
+
+    def find_by_winget_id(self, winget_id: str) -> Optional[Dict]:
+        name = self.by_winget_id.get(winget_id.lower())
+        return self.flat.get(name) if name else None
+
+
+class CatalogService:
+    """Chargement d'un fichier catalogue avec cache mémoire et cache disque"""
+
+    def __init__(self, source, cache_dir=None):
+        """
+        Args:
+            source: Chemin de programs.json
+            cache_dir: Dossier du cache binaire (par défaut cache/catalog à côté de l'exe)
+        """
+        self.source = Path(source).resolve()
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+        self._lock = threading.Lock()
+        self._catalog: Optional[Catalog] = None
+        self._signature = None
+        self._journaled = None  # (vue du journal, Catalogue construit sur cette vue)
+
+    @property
+    def cache_file(self) -> Path:
+        cache_dir = self._cache_dir or get_portable_cache_dir('catalog')
+        key = hashlib.sha1(str(self.source).encode('utf-8')).hexdigest()[:16]
+        return Path(cache_dir) / f"{self.source.stem}-{key}.pickle"
+
+    def _source_signature(self):
+        stat = self.source.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load_cache(self, signature) -> Optional[Catalog]:
+        try:
+            with open(self.cache_file, 'rb') as f:
+                data = pickle.load(f)
+            if (data.get('version') == CACHE_VERSION and data.get('source') == str(self.source)
+                    and tuple(data.get('signature', ())) == signature):
+                # Index sérialisés en types natifs: le cache ne dépend pas du chemin d'import du module
+                catalog = Catalog.__new__(Catalog)
+                catalog.__dict__.update(data['catalog'])
+                return catalog
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"⚠️ Cache du catalogue ignoré: {e}")
+        return None
+
+    def _save_cache(self, catalog: Catalog, signature):
+        try:
+            cache_file = self.cache_file
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'wb') as f:
+                pickle.dump({
+                    'version': CACHE_VERSION,
+                    'source': str(self.source),
+                    'signature': signature,
+                    'catalog': catalog.__getstate__()
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            logger.warning(f"⚠️ Cache du catalogue non enregistré: {e}")
+
+    def get(self) -> Catalog:
+        """
+        Catalogue à jour (rechargé seulement si le fichier source a changé)
+
+        Raises:
+            OSError: si le fichier source est introuvable
+            ValueError: si le JSON est invalide
+        """
+        signature = self._source_signature()
+        with self._lock:
+            if self._catalog is not None and self._signature == signature:
+                return self._catalog
+            catalog = self._load_cache(signature)
+            if catalog is None:
+                with open(self.source, 'r', encoding='utf-8') as f:
+                    catalog = Catalog(json.load(f))
+                self._save_cache(catalog, signature)
+            self._catalog = catalog
+            self._signature = signature
+            return catalog
+
+    def current(self) -> Catalog:
+        """
+        Catalogue + modifications journalisées pas encore compactées
+
+        Reconstruit seulement quand le fichier source ou le journal change
+        (la vue du journal est conservée tant qu'aucune transaction n'est ajoutée).
+        """
+        # Import différé: programs_journal dépend de ce module
+        try:
+            from .programs_journal import get_programs_journal
+        except ImportError:
+            from programs_journal import get_programs_journal
+        base = self.get()
+        view = get_programs_journal(self.source).view(base.categorized)
+        if view is base.categorized:
+            return base
+        with self._lock:
+            if self._journaled is None or self._journaled[0] is not view:
+                self._journaled = (view, Catalog(view))
+            return self._journaled[1]
+
+    def invalidate(self):
+        """Oublie le catalogue en mémoire (après une écriture du fichier source)"""
+        with self._lock:
+            self._catalog = None
+            self._signature = None
+            self._journaled = None
+
+
+_services: Dict[str, CatalogService] = {}
+_services_lock = threading.Lock()
+
+
+def default_catalog_path() -> Path:
+    return get_executable_dir() / 'data' / 'programs.json'
+
+
+def bundled_data_file(name: str) -> Path:
+    """Fichier de données en lecture seule (embarqué dans _MEIPASS en mode exécutable)"""
+    if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
+        bundled = Path(sys._MEIPASS) / 'data' / name
+        if bundled.exists():
+            return bundled
+    return get_executable_dir() / 'data' / name
+
+
+def get_catalog_service(source=None) -> CatalogService:
+    """Service partagé d'un fichier catalogue (un seul par chemin et par processus)"""
+    key = str(source or default_catalog_path())
+    service = _services.get(key)
+    if service is not None:
+        return service
+    path = Path(key).resolve()
+    with _services_lock:
+        service = _services.get(str(path))
+        if service is None:
+            service = _services[str(path)] = CatalogService(path)
+        # Chemin tel que fourni: évite de le résoudre à chaque appel
+        _services[key] = service
+        return service
+
+
+def get_catalog(source=None) -> Catalog:
+    """Raccourci: catalogue à jour d'un fichier, journal des modifications compris"""
+    return get_catalog_service(source).current()
+
+
+def benchmark(source, rounds: int = 20) -> Dict[str, float]:
+    """
+    Compare l'analyse JSON, le chargement depuis le cache disque et l'accès
+    en mémoire (millisecondes par chargement)
+    """
+    source = Path(source)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        with open(source, 'r', encoding='utf-8') as f:
+            Catalog(json.load(f))
+    json_ms = (time.perf_counter() - start) * 1000 / rounds
+
+    service = CatalogService(source)
+    service.get()  # Écrit le cache disque
+    start = time.perf_counter()
+    for _ in range(rounds):
+        service.invalidate()
+        service.get()
+    cache_ms = (time.perf_counter() - start) * 1000 / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        service.get()
+    memory_ms = (time.perf_counter() - start) * 1000 / rounds
+    return {'json': json_ms, 'cache_disque': cache_ms, 'memoire': memory_ms}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='catalog_service', description="Mesure du cache du catalogue")
+    parser.add_argument('--bench', nargs='?', const=str(default_catalog_path()), metavar='PROGRAMS_JSON')
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args(argv)
+    if not args.bench:
+        parser.print_help()
+        return 0
+    result = benchmark(args.bench, args.rounds)
+    print(f"Analyse JSON + index : {result['json']:.2f} ms")
+    print(f"Cache disque (pickle): {result['cache_disque']:.2f} ms")
+    print(f"Instance partagée    : {result['memoire']:.4f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,23 @@
 Gestionnaire de configuration pour NiTrite v.2
 """
 
+import copy
 import json
 import logging
+from contextlib import contextmanager
 from pathlib import Path
 import os
 import sys
 
+try:
+    from .catalog_service import get_catalog_service
+    from .programs_journal import (get_programs_journal, apply_ops, write_json_atomic,
+                                   OP_SET, OP_UPDATE, OP_DELETE)
+except ImportError:
+    from catalog_service import get_catalog_service
+    from programs_journal import (get_programs_journal, apply_ops, write_json_atomic,
+                                  OP_SET, OP_UPDATE, OP_DELETE)
+
 class ConfigManager:
     """Gestionnaire de configuration de l'application"""
     
@@ -42,6 +53,13 @@ class ConfigManager:
             'language': 'fr',
             'auto_cleanup': True,
             'max_concurrent_downloads': 3,
+            'max_concurrent_installs': 2,
+            'mirror_dir': '',
+            'mirror_url': '',
+            'http_pool_size': 16,
+            'http_retries': 3,
+            'download_job_timeout': 3600,
+            'install_job_timeout': 3600,
             'download_timeout': 300,
             'install_timeout': 600,
             'verify_signatures': True,
@@ -50,6 +68,9 @@ class ConfigManager:
         }
         
         self.config = self.default_config.copy()
+        
+        # Modifications de la base des programmes en attente dans un batch()
+        self._batch_ops = None
     
     def load_config(self):
         """Charge la configuration depuis le fichier"""
@@ -294,8 +315,7 @@ class ConfigManager:
         }
         
         try:
-            with open(self.programs_file, 'w', encoding='utf-8') as f:
-                json.dump(programs_db, f, indent=4, ensure_ascii=False)
+            write_json_atomic(self.programs_file, programs_db)
             self.logger.info(f"Base de données des programmes créée avec {len(programs_db)} programmes")
             
         except Exception as e:
@@ -312,28 +332,74 @@ class ConfigManager:
                     with open(source_file, 'r', encoding='utf-8') as f:
                         data = json.load(f)
                     # Copier dans le dossier de l'exe pour les futures modifications
-                    with open(self.programs_file, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=4, ensure_ascii=False)
+                    write_json_atomic(self.programs_file, data)
                     return data
             
-            if not self.programs_file.exists():
-                self.create_programs_database()
-            
-            with open(self.programs_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # Données partagées en lecture seule: les modifications passent par le journal
+            programs_db = get_programs_journal(self.programs_file).view(self._base_programs())
+            if self._batch_ops:
+                programs_db = apply_ops(programs_db, self._batch_ops)
+            return programs_db
                 
         except Exception as e:
             self.logger.error(f"Erreur lors du chargement de la base de données: {e}")
             return {}
     
+    def _base_programs(self):
+        """Contenu de programs.json, sans le journal"""
+        if not self.programs_file.exists():
+            self.create_programs_database()
+        return get_catalog_service(self.programs_file).get().categorized
+    
+    def _commit_ops(self, ops):
+        """Journalise des modifications (ou les garde pour la fin du batch en cours)"""
+        if self._batch_ops is not None:
+            self._batch_ops.extend(ops)
+        else:
+            get_programs_journal(self.programs_file).append(ops, self._base_programs)
+    
+    @contextmanager
+    def batch(self):
+        """
+        Regroupe des modifications de programmes en une seule transaction
+        
+        Les modifications sont visibles dans le batch et journalisées ensemble
+        à la sortie; une exception les annule toutes.
+        
+        Exemple:
+            with config_manager.batch():
+                for program_id, info in programmes.items():
+                    config_manager.add_custom_program(program_id, info)
+        """
+        if self._batch_ops is not None:
+            # Batch imbriqué: rattaché à la transaction englobante
+            yield self
+            return
+        self._batch_ops = []
+        try:
+            yield self
+            ops = self._batch_ops
+        finally:
+            self._batch_ops = None
+        self._commit_ops(ops)
+        self.logger.info(f"Transaction de {len(ops)} modification(s) de programmes enregistrée")
+    
+    def compact_programs(self):
+        """Intègre immédiatement le journal des modifications dans programs.json"""
+        try:
+            return get_programs_journal(self.programs_file).compact(self._base_programs())
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la compaction de la base des programmes: {e}")
+            return False
+    
+    def _replace_programs(self, programs_db):
+        """Remplace toute la base des programmes (écriture atomique, journal vidé)"""
+        get_programs_journal(self.programs_file).replace(programs_db)
+    
     def add_custom_program(self, program_id, program_info):
         """Ajoute un programme personnalisé"""
         try:
-            programs_db = self.load_programs_database()
-            programs_db[program_id] = program_info
-            
-            with open(self.programs_file, 'w', encoding='utf-8') as f:
-                json.dump(programs_db, f, indent=4, ensure_ascii=False)
+            self._commit_ops([{'op': OP_SET, 'id': program_id, 'info': copy.deepcopy(program_info)}])
             
             self.logger.info(f"Programme personnalisé ajouté: {program_id}")
             return True
@@ -347,10 +413,7 @@ class ConfigManager:
         try:
             programs_db = self.load_programs_database()
             if program_id in programs_db:
-                del programs_db[program_id]
-                
-                with open(self.programs_file, 'w', encoding='utf-8') as f:
-                    json.dump(programs_db, f, indent=4, ensure_ascii=False)
+                self._commit_ops([{'op': OP_DELETE, 'id': program_id}])
                 
                 self.logger.info(f"Programme supprimé: {program_id}")
                 return True
@@ -366,11 +429,8 @@ class ConfigManager:
         """Met à jour les informations d'un programme"""
         try:
             programs_db = self.load_programs_database()
-            if program_id in programs_db:
-                programs_db[program_id].update(program_info)
-                
-                with open(self.programs_file, 'w', encoding='utf-8') as f:
-                    json.dump(programs_db, f, indent=4, ensure_ascii=False)
+            if isinstance(programs_db.get(program_id), dict):
+                self._commit_ops([{'op': OP_UPDATE, 'id': program_id, 'info': copy.deepcopy(dict(program_info))}])
                 
                 self.logger.info(f"Programme mis à jour: {program_id}")
                 return True
@@ -411,8 +471,7 @@ class ConfigManager:
                 self.save_config()
             
             if 'programs' in import_data:
-                with open(self.programs_file, 'w', encoding='utf-8') as f:
-                    json.dump(import_data['programs'], f, indent=4, ensure_ascii=False)
+                self._replace_programs(import_data['programs'])
             
             self.logger.info(f"Configuration importée depuis: {import_path}")
             return True
@@ -429,8 +488,7 @@ class ConfigManager:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     programs_data = json.load(f)
                     # Sauvegarder dans le fichier programs.json local
-                    with open(self.programs_file, 'w', encoding='utf-8') as f2:
-                        json.dump(programs_data, f2, indent=4, ensure_ascii=False)
+                    self._replace_programs(programs_data)
                     self.logger.info(f"✅ Programmes chargés depuis {file_path}")
                     self.logger.info(f"📊 {self.get_programs_count(programs_data)} programmes disponibles")
                     return True
@@ -462,5 +520,5 @@ class ConfigManager:
         all_programs = {}
         for category, programs in programs_db.items():
             if isinstance(programs, dict):
-                all_programs.update(programs)
+                all_programs.update((name, copy.copy(info)) for name, info in programs.items())
         return all_programs
\ No newline at end of file
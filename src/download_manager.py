@@ -0,0 +1,598 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gestionnaire de téléchargements pour NiTriTe
+Téléchargements reprenables (HTTP Range), segmentés en parallèle pour les gros
+fichiers, avec un cache adressé par contenu (SHA-256) réutilisable sur clé USB
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Import conditionnel pour requests
+try:
+    import requests
+except ImportError:
+    requests = None
+
+try:
+    from .http_client import get_http_client
+except ImportError:
+    from http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Taille des tampons d'écriture et de hachage (1 Mio au lieu de 8 Kio)
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+# Taille des blocs lus sur le réseau (granularité de reprise après coupure)
+NETWORK_CHUNK_SIZE = 64 * 1024
+# Taille à partir de laquelle un fichier est découpé en segments parallèles
+DEFAULT_SEGMENT_THRESHOLD = 32 * 1024 * 1024
+# Codes HTTP définitifs: une nouvelle tentative donnerait la même réponse
+PERMANENT_STATUS_CODES = (404, 410)
+
+
+class DownloadCancelled(Exception):
+    """Téléchargement interrompu par son jeton d'annulation"""
+
+
+class SegmentsRejected(IOError):
+    """Segments refusés (Range ignoré ou fichier modifié en amont): reprise en un seul flux"""
+
+
+@dataclass
+class DownloadResult:
+    """Résultat d'un téléchargement"""
+    path: str
+    sha256: str
+    size: int
+    from_cache: bool = False
+
+
+@dataclass
+class RemoteInfo:
+    """Métadonnées HTTP d'une ressource distante (réponse HEAD)"""
+    url: str
+    size: int = 0
+    etag: str = ''
+    last_modified: str = ''
+    accept_ranges: bool = False
+
+
+def hash_file(file_path, buffer_size=DEFAULT_BUFFER_SIZE) -> str:
+    """Calcule le hash SHA256 d'un fichier"""
+    sha256_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for byte_block in iter(lambda: f.read(buffer_size), b""):
+            sha256_hash.update(byte_block)
+    return sha256_hash.hexdigest()
+
+
+def _unique_tmp(path: Path) -> Path:
+    """Fichier temporaire propre au processus et au thread, à côté de `path`"""
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+# Verrous des index de cache, partagés par chemin entre les instances de DownloadCache
+_index_locks: Dict[str, threading.Lock] = {}
+_index_locks_lock = threading.Lock()
+
+
+def _index_lock(index_file: Path) -> threading.Lock:
+    """Verrou de l'index (un par fichier pour tout le processus)"""
+    key = str(index_file.resolve())
+    with _index_locks_lock:
+        lock = _index_locks.get(key)
+        if lock is None:
+            lock = _index_locks[key] = threading.Lock()
+        return lock
+
+
+class DownloadCache:
+    """
+    Cache de fichiers adressé par contenu
+
+    Les fichiers sont stockés sous blobs/<sha256>. Un index JSON associe
+    chaque URL à son dernier blob connu (avec ETag, taille et Last-Modified)
+    pour pouvoir réutiliser un artefact sans le retélécharger.
+
+    Plusieurs instances (et processus) peuvent partager le dossier: l'index
+    est relu et fusionné avant chaque sauvegarde, et les fichiers temporaires
+    ont des noms uniques.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.blobs_dir = self.cache_dir / 'blobs'
+        self.index_file = self.cache_dir / 'index.json'
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = _index_lock(self.index_file)
+        self._index_mtime = None
+        self._index = self._load_index()
+
+    def _index_signature(self):
+        try:
+            return self.index_file.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _load_index(self) -> Dict:
+        """Charge l'index du cache"""
+        try:
+            if self.index_file.exists():
+                self._index_mtime = self._index_signature()
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ Index du cache illisible, réinitialisation: {e}")
+        return {}
+
+    def _save_index(self):
+        """Sauvegarde l'index du cache (écriture atomique)"""
+        tmp_file = _unique_tmp(self.index_file)
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.index_file)
+            self._index_mtime = self._index_signature()
+        finally:
+            if tmp_file.exists():
+                tmp_file.unlink()
+
+    def blob_path(self, sha256: str) -> Path:
+        """Chemin du blob correspondant à un hash"""
+        return self.blobs_dir / sha256.lower()
+
+    def lookup(self, url: str, remote: Optional[RemoteInfo] = None) -> Optional[Dict]:
+        """
+        Recherche une entrée valide pour une URL
+
+        Si les métadonnées distantes sont connues, l'entrée n'est réutilisée que
+        si l'ETag (ou à défaut taille + Last-Modified) correspond. Sans
+        métadonnées (hors ligne), la dernière version connue est réutilisée.
+
+        Returns:
+            dict de l'entrée ({'sha256', 'size', 'etag', ...}) ou None
+        """
+        with self._lock:
+            if self._index_signature() != self._index_mtime:
+                self._index = self._load_index()
+            entry = self._index.get(url)
+        if not entry:
+            return None
+
+        blob = self.blob_path(entry['sha256'])
+        if not blob.exists() or blob.stat().st_size != entry.get('size', -1):
+            return None
+
+        if remote:
+            if remote.etag and entry.get('etag'):
+                if remote.etag != entry['etag']:
+                    return None
+            else:
+                if remote.size and remote.size != entry.get('size'):
+                    return None
+                if remote.last_modified and entry.get('last_modified') \
+                        and remote.last_modified != entry['last_modified']:
+                    return None
+        return entry
+
+    def store(self, url: str, file_path, sha256: str, remote: Optional[RemoteInfo] = None) -> Path:
+        """
+        Ajoute un fichier au cache (lien physique si possible, copie sinon)
+
+        Returns:
+            Path: chemin du blob
+        """
+        file_path = Path(file_path)
+        blob = self.blob_path(sha256)
+        if not blob.exists():
+            tmp_blob = _unique_tmp(blob)
+            try:
+                try:
+                    os.link(file_path, tmp_blob)
+                except OSError:
+                    shutil.copyfile(file_path, tmp_blob)
+                os.replace(tmp_blob, blob)
+            finally:
+                if tmp_blob.exists():
+                    tmp_blob.unlink()
+
+        entry = {
+            'sha256': sha256,
+            'size': blob.stat().st_size,
+            'etag': remote.etag if remote else '',
+            'last_modified': remote.last_modified if remote else '',
+            'filename': file_path.name,
+            'stored': datetime.now().isoformat()
+        }
+        with self._lock:
+            # Relire l'index: une autre instance ou un autre processus a pu l'enrichir
+            index = self._load_index()
+            index[url] = entry
+            self._index = index
+            self._save_index()
+        return blob
+
+    def materialize(self, sha256: str, dest_path) -> Path:
+        """Place une copie (ou un lien) du blob à l'emplacement demandé"""
+        dest_path = Path(dest_path)
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        blob = self.blob_path(sha256)
+        tmp_dest = _unique_tmp(dest_path)
+        try:
+            try:
+                os.link(blob, tmp_dest)
+            except OSError:
+                shutil.copyfile(blob, tmp_dest)
+            os.replace(tmp_dest, dest_path)
+        finally:
+            if tmp_dest.exists():
+                tmp_dest.unlink()
+        return dest_path
+
+
+class ChunkedDownloader:
+    """
+    Téléchargeur HTTP reprenable
+
+    - reprise des fichiers partiels (.part) via l'en-tête Range
+    - découpage des gros fichiers en segments téléchargés en parallèle
+    - tampons d'écriture de 1 Mio
+    - cache adressé par contenu (optionnel)
+    """
+
+    def __init__(self, cache: Optional[DownloadCache] = None, log_callback=None,
+                 buffer_size=DEFAULT_BUFFER_SIZE, segment_threshold=DEFAULT_SEGMENT_THRESHOLD,
+                 max_segments=4, session=None):
+        """
+        Args:
+            cache: Cache de téléchargements (None = pas de cache)
+            log_callback: Fonction (message, level) pour les logs
+            buffer_size: Taille des tampons d'écriture
+            segment_threshold: Taille minimale pour découper en segments (0 = jamais)
+            max_segments: Nombre maximum de segments parallèles
+            session: Session HTTP à utiliser (client HTTP partagé par défaut)
+        """
+        self.cache = cache
+        self.log_callback = log_callback if log_callback else self._default_log
+        self.buffer_size = buffer_size
+        self.segment_threshold = segment_threshold
+        self.max_segments = max(1, max_segments)
+        if session is None and requests is not None:
+            session = get_http_client()
+        self.session = session
+
+    def _default_log(self, message, level="info"):
+        """Callback de log par défaut si aucun n'est fourni."""
+        log_func = getattr(logger, level, logger.info)
+        log_func(message)
+
+    def probe(self, url: str, timeout=15) -> Optional[RemoteInfo]:
+        """Récupère les métadonnées d'une URL via HEAD (None si indisponible)"""
+        try:
+            response = self.session.head(url, allow_redirects=True, timeout=timeout)
+            if response.status_code >= 400:
+                return None
+            headers = response.headers
+            return RemoteInfo(
+                url=response.url or url,
+                size=int(headers.get('content-length', 0) or 0),
+                etag=headers.get('etag', ''),
+                last_modified=headers.get('last-modified', ''),
+                accept_ranges='bytes' in headers.get('accept-ranges', '').lower()
+            )
+        except Exception as e:
+            logger.debug(f"HEAD impossible pour {url}: {e}")
+            return None
+
+    def download(self, url: str, dest_path, max_retries=3, timeout=60,
+                 progress_callback: Optional[Callable[[int, int], None]] = None,
+                 expected_sha256: Optional[str] = None, cancel_token=None) -> Optional[DownloadResult]:
+        """
+        Télécharge une URL vers dest_path
+
+        Le SHA-256 est calculé pendant la réception (ou pendant l'assemblage
+        des segments), sans relire le fichier une fois écrit.
+
+        Args:
+            url: URL à télécharger
+            dest_path: Chemin final du fichier
+            max_retries: Nombre maximum de tentatives
+            timeout: Timeout réseau (secondes)
+            progress_callback: Fonction (octets_reçus, octets_totaux)
+            expected_sha256: Empreinte attendue, vérifiée avant de renommer le
+                             fichier .part (un fichier non conforme n'est jamais livré)
+            cancel_token: Jeton d'annulation (async_installer.CancellationToken),
+                          vérifié à chaque bloc; le .part est conservé pour reprise
+
+        Returns:
+            DownloadResult ou None si échec
+        """
+        if not requests:
+            self.log_callback("Le module 'requests' est manquant.", "error")
+            return None
+
+        dest_path = Path(dest_path)
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        remote = self.probe(url, timeout=min(timeout, 15))
+        expected_sha256 = expected_sha256.lower() if expected_sha256 else None
+
+        # Réutiliser un artefact déjà présent dans le cache
+        if self.cache:
+            entry = self.cache.lookup(url, remote)
+            if entry and expected_sha256 and entry['sha256'] != expected_sha256:
+                entry = None  # Version en cache différente de celle attendue
+            if entry:
+                self.cache.materialize(entry['sha256'], dest_path)
+                self.log_callback(f"♻️ Fichier réutilisé depuis le cache: {dest_path.name}", "info")
+                return DownloadResult(str(dest_path), entry['sha256'], entry['size'], from_cache=True)
+
+        part_path = dest_path.with_name(dest_path.name + '.part')
+
+        for attempt in range(1, max_retries + 1):
+            try:
+                if attempt > 1:
+                    delay = 2 ** (attempt - 1)  # 2s, 4s, 8s
+                    self.log_callback(f"⏳ Nouvelle tentative dans {delay}s... (tentative {attempt}/{max_retries})", "info")
+                    if cancel_token is not None:
+                        cancel_token.wait(delay)
+                    else:
+                        time.sleep(delay)
+                if cancel_token is not None and cancel_token.cancelled:
+                    raise DownloadCancelled()
+
+                self.log_callback(f"📥 Téléchargement de {dest_path.name}... (tentative {attempt}/{max_retries})", "info")
+                sha256 = None
+                if self._can_segment(remote):
+                    try:
+                        sha256 = self._download_segmented(url, part_path, remote, timeout, progress_callback,
+                                                          cancel_token)
+                    except SegmentsRejected as e:
+                        self.log_callback(f"⚠️ {e}: téléchargement en un seul flux", "warning")
+                        # Taille et validateurs de la version actuelle du fichier
+                        remote = self.probe(url, timeout=min(timeout, 15))
+                        if remote:
+                            remote.accept_ranges = False
+                if sha256 is None:
+                    sha256 = self._download_single(url, part_path, remote, timeout, progress_callback, cancel_token)
+
+                if remote and remote.size and part_path.stat().st_size != remote.size:
+                    raise IOError(f"Taille incorrecte ({part_path.stat().st_size} au lieu de {remote.size})")
+
+                if expected_sha256 and sha256 != expected_sha256:
+                    # Contenu corrompu ou modifié: repartir de zéro
+                    part_path.unlink()
+                    raise IOError(f"Empreinte SHA-256 incorrecte ({sha256} au lieu de {expected_sha256})")
+                if expected_sha256:
+                    self.log_callback(f"🔒 Empreinte SHA-256 vérifiée: {dest_path.name}", "info")
+
+                os.replace(part_path, dest_path)
+                size = dest_path.stat().st_size
+                if self.cache:
+                    self.cache.store(url, dest_path, sha256, remote)
+
+                self.log_callback(f"✅ Téléchargement terminé: {dest_path}", "success")
+                return DownloadResult(str(dest_path), sha256, size)
+
+            except DownloadCancelled:
+                self.log_callback(f"⏹️ Téléchargement annulé: {dest_path.name}", "warning")
+                return None
+            except requests.exceptions.Timeout as e:
+                self.log_callback(f"⏱️ Timeout lors du téléchargement (tentative {attempt}/{max_retries}): {e}", "warning")
+            except requests.exceptions.ConnectionError as e:
+                self.log_callback(f"🔌 Erreur de connexion (tentative {attempt}/{max_retries}): {e}", "warning")
+            except requests.exceptions.HTTPError as e:
+                status_code = e.response.status_code if e.response is not None else None
+                if status_code in PERMANENT_STATUS_CODES:
+                    self.log_callback(f"❌ Lien mort (HTTP {status_code}): {url}", "error")
+                    return None
+                self.log_callback(f"⚠️ Erreur réseau (tentative {attempt}/{max_retries}): {e}", "warning")
+            except requests.exceptions.RequestException as e:
+                self.log_callback(f"⚠️ Erreur réseau (tentative {attempt}/{max_retries}): {e}", "warning")
+            except IOError as e:
+                self.log_callback(f"⚠️ Fichier incomplet (tentative {attempt}/{max_retries}): {e}", "warning")
+            except Exception as e:
+                self.log_callback(f"❌ Erreur inattendue lors du téléchargement: {e}", "error")
+                logger.exception(e)
+                return None
+
+        # Toutes les tentatives ont échoué (le .part est conservé pour reprise)
+        if cancel_token is not None and cancel_token.cancelled:
+            self.log_callback(f"⏹️ Téléchargement annulé: {dest_path.name}", "warning")
+            return None
+        self.log_callback(f"❌ Échec du téléchargement après {max_retries} tentatives", "error")
+        return None
+
+    def _can_segment(self, remote: Optional[RemoteInfo]) -> bool:
+        """Indique si le fichier peut être découpé en segments parallèles"""
+        return bool(
+            remote and remote.accept_ranges and remote.size
+            and self.segment_threshold and self.max_segments > 1
+            and remote.size >= self.segment_threshold
+        )
+
+    def _range_headers(self, start: int, end: Optional[int], remote: Optional[RemoteInfo]) -> Dict:
+        """Construit les en-têtes Range/If-Range d'une requête de reprise"""
+        headers = {'Range': f"bytes={start}-{'' if end is None else end}"}
+        # If-Range: le serveur renvoie le fichier complet s'il a changé entre-temps
+        if remote and (remote.etag or remote.last_modified):
+            headers['If-Range'] = remote.etag or remote.last_modified
+        return headers
+
+    def _stream_to(self, response, f, cancel_token, on_chunk):
+        """
+        Écrit le corps d'une réponse dans f, en vérifiant l'annulation à chaque bloc
+
+        La connexion n'est pas fermée depuis le thread qui annule (la fermeture
+        attendrait la lecture en cours): le thread s'arrête au bloc suivant ou
+        au timeout réseau, sans retenir l'appelant.
+        """
+        for chunk in response.iter_content(chunk_size=NETWORK_CHUNK_SIZE):
+            if cancel_token is not None and cancel_token.cancelled:
+                raise DownloadCancelled()
+            if chunk:  # Filtrer les chunks vides
+                f.write(chunk)
+                on_chunk(chunk)
+
+    def _download_single(self, url, part_path: Path, remote, timeout, progress_callback, cancel_token=None) -> str:
+        """
+        Téléchargement en un seul flux, repris à partir du fichier .part
+
+        Returns:
+            SHA-256 du fichier .part complet
+        """
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        if remote and remote.size and offset > remote.size:
+            offset = 0
+        if remote and remote.size and offset == remote.size:
+            # Fichier partiel déjà complet (interruption avant renommage)
+            return hash_file(part_path, self.buffer_size)
+
+        headers = self._range_headers(offset, None, remote) if offset else {}
+        with self.session.get(url, stream=True, timeout=timeout, headers=headers) as response:
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                # Le serveur ignore Range: recommencer depuis le début
+                offset = 0
+            sha256_hash = hashlib.sha256()
+            if offset:
+                self.log_callback(f"↪️ Reprise du téléchargement à {offset / (1024 * 1024):.1f} Mo", "info")
+                # Seule la partie déjà reçue est relue pour initialiser l'empreinte
+                with open(part_path, 'rb') as f:
+                    remaining = offset
+                    while remaining:
+                        block = f.read(min(self.buffer_size, remaining))
+                        if not block:
+                            break
+                        sha256_hash.update(block)
+                        remaining -= len(block)
+
+            total = remote.size if remote and remote.size else offset + int(response.headers.get('content-length', 0) or 0)
+            received = offset
+
+            def on_chunk(chunk):
+                nonlocal received
+                sha256_hash.update(chunk)
+                received += len(chunk)
+                if progress_callback:
+                    progress_callback(received, total)
+
+            with open(part_path, 'ab' if offset else 'wb', buffering=self.buffer_size) as f:
+                self._stream_to(response, f, cancel_token, on_chunk)
+        return sha256_hash.hexdigest()
+
+    def _segment_ranges(self, size: int) -> List[Tuple[int, int]]:
+        """Découpe [0, size) en segments contigus"""
+        count = min(self.max_segments, max(1, size // max(1, self.segment_threshold // 2)))
+        step = size // count
+        ranges = []
+        for i in range(count):
+            start = i * step
+            end = size - 1 if i == count - 1 else start + step - 1
+            ranges.append((start, end))
+        return ranges
+
+    def _download_segmented(self, url, part_path: Path, remote: RemoteInfo, timeout, progress_callback,
+                            cancel_token=None) -> str:
+        """
+        Téléchargement en segments parallèles, chaque segment étant reprenable
+
+        Returns:
+            SHA-256 du fichier assemblé (calculé pendant l'assemblage)
+        """
+        ranges = self._segment_ranges(remote.size)
+        segment_paths = [part_path.with_name(f"{part_path.name}.seg{i}") for i in range(len(ranges))]
+        # Les segments d'une autre version du fichier (ETag, taille) ne sont pas repris
+        state_path = part_path.with_name(part_path.name + '.segments')
+        state = {'size': remote.size, 'etag': remote.etag, 'last_modified': remote.last_modified,
+                 'segments': len(ranges)}
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            previous = None
+        if previous != state:
+            self._discard_segments(part_path)
+            with open(state_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+        progress = [0] * len(ranges)
+        progress_lock = threading.Lock()
+
+        def report(index, done):
+            if progress_callback:
+                with progress_lock:
+                    progress[index] = done
+                    total_done = sum(progress)
+                progress_callback(total_done, remote.size)
+
+        def fetch(index):
+            start, end = ranges[index]
+            seg_path = segment_paths[index]
+            expected = end - start + 1
+            done = seg_path.stat().st_size if seg_path.exists() else 0
+            if done > expected:
+                seg_path.unlink()
+                done = 0
+            report(index, done)
+            if done == expected:
+                return
+            headers = self._range_headers(start + done, end, remote)
+            with self.session.get(url, stream=True, timeout=timeout, headers=headers) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise SegmentsRejected("Fichier modifié sur le serveur ou requêtes Range ignorées")
+                def on_chunk(chunk):
+                    nonlocal done
+                    done += len(chunk)
+                    report(index, done)
+
+                with open(seg_path, 'ab', buffering=self.buffer_size) as f:
+                    self._stream_to(response, f, cancel_token, on_chunk)
+            if done != expected:
+                raise IOError(f"Segment {index} incomplet ({done}/{expected})")
+
+        self.log_callback(f"🧩 Téléchargement en {len(ranges)} segments parallèles", "info")
+        with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix="nitrite-segment") as executor:
+            futures = [executor.submit(fetch, i) for i in range(len(ranges))]
+            try:
+                for future in futures:
+                    future.result()
+            except SegmentsRejected:
+                # Comme en flux unique: on repart de zéro (après l'arrêt des autres segments)
+                executor.shutdown(wait=True)
+                self._discard_segments(part_path)
+                part_path.unlink(missing_ok=True)
+                raise
+
+        # Assembler les segments dans le fichier .part en calculant l'empreinte
+        sha256_hash = hashlib.sha256()
+        with open(part_path, 'wb') as out:
+            for seg_path in segment_paths:
+                with open(seg_path, 'rb') as seg:
+                    for block in iter(lambda: seg.read(self.buffer_size), b''):
+                        sha256_hash.update(block)
+                        out.write(block)
+        self._discard_segments(part_path)
+        return sha256_hash.hexdigest()
+
+    @staticmethod
+    def _discard_segments(part_path: Path):
+        """Supprime les segments d'un fichier .part et leur état"""
+        prefix = part_path.name + '.seg'
+        for path in list(part_path.parent.iterdir()):
+            if path.name.startswith(prefix):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Courtier d'élévation
+Un seul processus auxiliaire élevé par session (une seule invite UAC) qui
+exécute une file de commandes reçues sur une socket locale et renvoie en
+continu leur sortie et leur code de retour.
+
+Protocole (lignes JSON, UTF-8, sur 127.0.0.1):
+    auxiliaire -> client : {"challenge": <nonce A>}
+    client -> auxiliaire : {"auth": HMAC(jeton, "client:" + A), "challenge": <nonce B>}
+    auxiliaire -> client : {"hello": HMAC(jeton, "helper:" + B), "pid": ..., "admin": bool}
+    client -> auxiliaire : {"op": "run", "id": n, "cmd": [...], "timeout": s,
+                            "cwd": ..., "env": {...}}
+                           {"op": "cancel", "id": n|null} / {"op": "shutdown"}
+    auxiliaire -> client : {"id": n, "stream": "stdout"|"stderr", "data": ligne,
+                            "frame": bool}  (frame: barre de progression \r)
+                           {"id": n, "exit": code, "error": message|null}
+
+L'auxiliaire se connecte au client (il n'écoute sur aucun port) et se
+termine dès que la connexion est fermée. L'authentification est mutuelle et
+le jeton ne circule jamais: un processus qui occuperait le port après
+l'expiration de l'attente du client (invite UAC validée trop tard) ne peut
+pas répondre au défi, et l'auxiliaire se termine sans rien exécuter. Sous Linux, ou si l'application
+est déjà administrateur, il est lancé sans élévation (tests du protocole).
+"""
+
+import os
+import sys
+import hmac
+import json
+import queue
+import atexit
+import socket
+import logging
+import secrets
+import threading
+import subprocess
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    from .elevation_helper import run_as_admin_silent, is_admin
+    from .process_runner import iter_stream_lines, kill_process_tree
+except ImportError:
+    from elevation_helper import run_as_admin_silent, is_admin
+    from process_runner import iter_stream_lines, kill_process_tree
+
+logger = logging.getLogger(__name__)
+
+# Argument de ligne de commande qui démarre l'auxiliaire
+BROKER_ARG = '--elevation-broker'
+# Délai d'attente de la connexion de l'auxiliaire (invite UAC comprise)
+DEFAULT_CONNECT_TIMEOUT = 120
+# Délai de l'échange d'authentification, une fois connecté
+HANDSHAKE_TIMEOUT = 30
+
+
+class BrokerError(Exception):
+    """Courtier indisponible ou connexion perdue"""
+
+
+def _proof(token: str, role: str, nonce) -> str:
+    """Preuve de possession du jeton pour un défi (le jeton lui-même n'est jamais envoyé)"""
+    return hmac.new(token.encode('utf-8'), f"{role}:{nonce}".encode('utf-8'), 'sha256').hexdigest()
+
+
+def _read_message(stream):
+    """Lit un message JSON (None si la ligne est vide ou invalide)"""
+    try:
+        message = json.loads(stream.readline().decode('utf-8') or 'null')
+    except (OSError, ValueError):
+        return None
+    return message if isinstance(message, dict) else None
+
+
+def _send(stream, lock, message):
+    """Écrit un message JSON sur une ligne"""
+    data = (json.dumps(message, ensure_ascii=False) + '\n').encode('utf-8')
+    with lock:
+        stream.write(data)
+        stream.flush()
+
+
+# ---------------------------------------------------------------------------
+# Côté auxiliaire (processus élevé)
+# ---------------------------------------------------------------------------
+
+class _BrokerServer:
+    """Exécute séquentiellement les commandes reçues du client"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.stream = sock.makefile('rwb')
+        self.send_lock = threading.Lock()
+        self.commands = queue.Queue()
+        self.current_process = None
+        self.current_id = None
+        self.last_id = 0  # Dernière commande démarrée (les identifiants sont croissants)
+        self.cancelled_ids = set()  # Annulations reçues avant le démarrage de la commande
+        self.process_lock = threading.Lock()
+
+    def send(self, message):
+        try:
+            _send(self.stream, self.send_lock, message)
+        except OSError:
+            pass  # Client parti: la boucle de lecture s'arrêtera
+
+    def cancel(self, request_id):
+        """Annule la commande request_id (en cours ou encore en file), jamais une autre; None: celle en cours"""
+        with self.process_lock:
+            if request_id is not None and request_id != self.current_id:
+                if isinstance(request_id, int) and request_id > self.last_id:
+                    self.cancelled_ids.add(request_id)
+                return
+        self.kill_current()
+
+    def kill_current(self):
+        with self.process_lock:
+            process = self.current_process
+        # Arbre entier: un msiexec lancé par l'installateur ne doit pas survivre
+        kill_process_tree(process)
+
+    def _pump(self, request_id, pipe, stream_name):
+        for line, is_frame in iter_stream_lines(pipe):
+            self.send({'id': request_id, 'stream': stream_name, 'data': line, 'frame': is_frame})
+        pipe.close()
+
+    def execute(self, request):
+        """Lance une commande et relaie sa sortie"""
+        request_id = request.get('id')
+        with self.process_lock:
+            if request_id in self.cancelled_ids:
+                self.cancelled_ids.discard(request_id)
+                self.send({'id': request_id, 'exit': -1, 'error': 'Annulé'})
+                return
+            self.current_id = request_id
+            if isinstance(request_id, int):
+                self.last_id = max(self.last_id, request_id)
+        env = None
+        if request.get('env'):
+            env = os.environ.copy()
+            env.update({str(k): str(v) for k, v in request['env'].items()})
+        try:
+            process = subprocess.Popen(
+                request['cmd'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                stdin=subprocess.DEVNULL,
+                cwd=request.get('cwd') or None,
+                env=env,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+                start_new_session=os.name != 'nt'
+            )
+        except (OSError, ValueError, KeyError) as e:
+            with self.process_lock:
+                self.current_id = None
+            self.send({'id': request_id, 'exit': -1, 'error': str(e)})
+            return
+
+        with self.process_lock:
+            self.current_process = process
+        readers = [
+            threading.Thread(target=self._pump, args=(request_id, process.stdout, 'stdout'), daemon=True),
+            threading.Thread(target=self._pump, args=(request_id, process.stderr, 'stderr'), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        error = None
+        try:
+            process.wait(timeout=request.get('timeout'))
+        except subprocess.TimeoutExpired:
+            error = "Timeout expired"
+            self.kill_current()
+            process.wait()
+        for reader in readers:
+            reader.join(timeout=5)
+        with self.process_lock:
+            self.current_process = None
+            self.current_id = None
+
+        returncode = -1 if error else process.returncode
+        self.send({'id': request_id, 'exit': returncode, 'error': error})
+
+    def _worker(self):
+        while True:
+            request = self.commands.get()
+            if request is None:
+                return
+            self.execute(request)
+
+    def serve(self):
+        """Boucle de lecture: file de commandes, annulation, arrêt"""
+        worker = threading.Thread(target=self._worker, daemon=True)
+        worker.start()
+        try:
+            for raw in self.stream:
+                try:
+                    message = json.loads(raw.decode('utf-8'))
+                except ValueError:
+                    continue
+                op = message.get('op')
+                if op == 'run':
+                    self.commands.put(message)
+                elif op == 'cancel':
+                    self.cancel(message.get('id'))
+                elif op == 'shutdown':
+                    break
+        except OSError:
+            pass
+        finally:
+            self.kill_current()
+            self.commands.put(None)
+            worker.join(timeout=5)
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+
+
+def serve(port: int, token: str, host: str = '127.0.0.1') -> int:
+    """Point d'entrée de l'auxiliaire: se connecte au client puis exécute ses commandes"""
+    try:
+        sock = socket.create_connection((host, port), timeout=30)
+    except OSError as e:
+        logger.error(f"Courtier d'élévation: connexion impossible: {e}")
+        return 1
+    server = _BrokerServer(sock)
+
+    # Le client doit prouver qu'il détient le jeton avant toute commande
+    sock.settimeout(HANDSHAKE_TIMEOUT)
+    challenge = secrets.token_hex(16)
+    server.send({'challenge': challenge})
+    reply = _read_message(server.stream)
+    if not reply or not hmac.compare_digest(str(reply.get('auth', '')), _proof(token, 'client', challenge)):
+        logger.error("Courtier d'élévation: client non authentifié, arrêt")
+        sock.close()
+        return 1
+    server.send({'hello': _proof(token, 'helper', reply.get('challenge', '')),
+                 'pid': os.getpid(), 'admin': bool(is_admin())})
+    sock.settimeout(None)
+    server.serve()
+    return 0
+
+
+def serve_from_argv(argv) -> int:
+    """Démarre l'auxiliaire à partir des arguments `<port> <jeton>`"""
+    if len(argv) < 2:
+        return 2
+    return serve(int(argv[0]), argv[1])
+
+
+# ---------------------------------------------------------------------------
+# Côté client (application)
+# ---------------------------------------------------------------------------
+
+class ElevationBroker:
+    """
+    Client du courtier d'élévation
+
+    `run()` a la même signature de retour que `run_as_admin_silent`:
+    (success, returncode, stdout, stderr).
+    """
+
+    def __init__(self, elevate: Optional[bool] = None, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT):
+        """
+        Args:
+            elevate: Lancer l'auxiliaire avec élévation UAC (par défaut: sous
+                     Windows quand l'application n'est pas administrateur)
+            connect_timeout: Délai d'attente de la connexion de l'auxiliaire
+        """
+        if elevate is None:
+            elevate = os.name == 'nt' and not is_admin()
+        self.elevate = elevate
+        self.connect_timeout = connect_timeout
+        self.helper_pid = None
+        self.helper_admin = False
+        self._sock = None
+        self._stream = None
+        self._process = None
+        self._send_lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._next_id = 0
+        self._failed = False
+
+    @property
+    def running(self) -> bool:
+        return self._sock is not None
+
+    def _helper_command(self, port: int, token: str):
+        """Ligne de commande de l'auxiliaire (exécutable figé ou script Python)"""
+        if getattr(sys, 'frozen', False):
+            return [sys.executable, BROKER_ARG, str(port), token]
+        return [sys.executable, str(Path(__file__).resolve()), BROKER_ARG, str(port), token]
+
+    def _launch(self, command):
+        """Lance l'auxiliaire, avec une seule invite UAC si nécessaire"""
+        if self.elevate:
+            import ctypes
+            params = ' '.join(f'"{arg}"' if ' ' in arg else arg for arg in command[1:])
+            result = ctypes.windll.shell32.ShellExecuteW(None, "runas", command[0], params, None, 0)
+            if result <= 32:
+                raise BrokerError(f"Élévation refusée (code {result})")
+        else:
+            self._process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            )
+
+    def start(self):
+        """Démarre l'auxiliaire et attend sa connexion authentifiée"""
+        token = secrets.token_hex(16)
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            listener.bind(('127.0.0.1', 0))
+            listener.listen(1)
+            listener.settimeout(self.connect_timeout)
+            self._launch(self._helper_command(listener.getsockname()[1], token))
+            try:
+                sock, _ = listener.accept()
+            except socket.timeout:
+                raise BrokerError("L'auxiliaire d'élévation ne s'est pas connecté")
+        finally:
+            listener.close()
+
+        stream = sock.makefile('rwb')
+        sock.settimeout(HANDSHAKE_TIMEOUT)
+        hello = None
+        offer = _read_message(stream)
+        if offer and offer.get('challenge'):
+            challenge = secrets.token_hex(16)
+            try:
+                _send(stream, self._send_lock, {'auth': _proof(token, 'client', offer['challenge']),
+                                                'challenge': challenge})
+            except OSError:
+                offer = None
+            hello = _read_message(stream) if offer else None
+        if not hello or not hmac.compare_digest(str(hello.get('hello', '')), _proof(token, 'helper', challenge)):
+            sock.close()
+            raise BrokerError("Jeton de l'auxiliaire d'élévation invalide")
+        sock.settimeout(None)
+
+        self._sock = sock
+        self._stream = stream
+        self.helper_pid = hello.get('pid')
+        self.helper_admin = bool(hello.get('admin'))
+        logger.info(f"🔐 Courtier d'élévation actif (PID {self.helper_pid}, admin={self.helper_admin})")
+
+    def ensure_started(self) -> bool:
+        """Démarre l'auxiliaire au premier besoin; False s'il est indisponible pour la session"""
+        with self._start_lock:
+            if self.running:
+                return True
+            if self._failed:
+                return False
+            try:
+                self.start()
+                return True
+            except (BrokerError, OSError) as e:
+                logger.warning(f"⚠️ Courtier d'élévation indisponible: {e}")
+                self._failed = True
+                return False
+
+    def run(self, command, timeout=300, output_callback: Optional[Callable] = None,
+            cwd=None, env=None, cancel_token=None):
+        """
+        Exécute une commande dans l'auxiliaire
+
+        Args:
+            command: Liste ou chaîne de commande
+            timeout: Timeout en secondes (appliqué par l'auxiliaire)
+            output_callback: Fonction (stream, ligne, est_une_trame) appelée pour chaque
+                             ligne de sortie (compatible avec ProcessRunner.feed)
+            cwd: Répertoire de travail
+            env: Variables d'environnement supplémentaires
+            cancel_token: Jeton d'annulation: n'interrompt que cette commande,
+                          même si une autre occupe encore l'auxiliaire
+
+        Returns:
+            tuple: (success, returncode, stdout, stderr)
+
+        Raises:
+            BrokerError: si l'auxiliaire n'est pas connecté ou la connexion est perdue
+            OperationCancelled: si le jeton a été annulé pendant l'attente de
+                                l'auxiliaire (la commande n'est jamais envoyée)
+        """
+        if isinstance(command, str):
+            command = [command]
+        with self._run_lock:
+            # Session arrêtée pendant l'attente du verrou: ne rien lancer, même brièvement
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            if not self.running:
+                raise BrokerError("Courtier d'élévation non démarré")
+            self._next_id += 1
+            request_id = self._next_id
+            stdout_lines, stderr_lines = [], []
+            handle = None
+            try:
+                _send(self._stream, self._send_lock, {
+                    'op': 'run', 'id': request_id, 'cmd': [str(c) for c in command],
+                    'timeout': timeout, 'cwd': str(cwd) if cwd else None, 'env': env or {}
+                })
+                if cancel_token is not None:
+                    handle = cancel_token.add_callback(lambda: self.cancel(request_id))
+                for raw in self._stream:
+                    message = json.loads(raw.decode('utf-8'))
+                    if message.get('id') != request_id:
+                        continue
+                    if 'stream' in message:
+                        is_frame = bool(message.get('frame'))
+                        if not is_frame:
+                            lines = stdout_lines if message['stream'] == 'stdout' else stderr_lines
+                            lines.append(message.get('data', ''))
+                        if output_callback:
+                            output_callback(message['stream'], message.get('data', ''), is_frame)
+                    elif 'exit' in message:
+                        returncode = message['exit']
+                        stderr = '\n'.join(stderr_lines)
+                        if message.get('error'):
+                            stderr = f"{stderr}\n{message['error']}".strip()
+                        return (returncode == 0, returncode, '\n'.join(stdout_lines), stderr)
+            except (OSError, ValueError) as e:
+                self._disconnect()
+                raise BrokerError(f"Connexion au courtier perdue: {e}")
+            finally:
+                if cancel_token is not None:
+                    cancel_token.remove_callback(handle)
+            self._disconnect()
+            raise BrokerError("Connexion au courtier fermée")
+
+    def cancel(self, request_id=None):
+        """
+        Interrompt une commande dans l'auxiliaire
+
+        Args:
+            request_id: Commande visée (sans effet si elle est terminée);
+                        None interrompt celle en cours (arrêt de la session)
+        """
+        if self.running:
+            try:
+                _send(self._stream, self._send_lock, {'op': 'cancel', 'id': request_id})
+            except OSError:
+                pass
+
+    def _disconnect(self):
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def stop(self):
+        """Arrête l'auxiliaire (fin de session)"""
+        if self.running:
+            try:
+                _send(self._stream, self._send_lock, {'op': 'shutdown'})
+            except OSError:
+                pass
+            self._disconnect()
+        if self._process is not None:
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+
+
+# Courtier partagé par l'application
+_broker: Optional[ElevationBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_elevation_broker() -> ElevationBroker:
+    """Retourne le courtier partagé (l'auxiliaire démarre au premier `run_elevated`)"""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = ElevationBroker()
+            atexit.register(_broker.stop)
+        return _broker
+
+
+def run_elevated(command, timeout=300, output_callback: Optional[Callable] = None):
+    """
+    Exécute une commande avec privilèges administrateur via le courtier partagé,
+    ou via `run_as_admin_silent` si le courtier est indisponible
+
+    Returns:
+        tuple: (success, returncode, stdout, stderr)
+    """
+    if is_admin():
+        return run_as_admin_silent(command, timeout)
+
+    broker = get_elevation_broker()
+    if broker.ensure_started():
+        try:
+            return broker.run(command, timeout, output_callback)
+        except BrokerError as e:
+            logger.warning(f"⚠️ {e}, repli sur l'élévation par commande")
+    return run_as_admin_silent(command, timeout)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == BROKER_ARG:
+        sys.exit(serve_from_argv(sys.argv[2:]))
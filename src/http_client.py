@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Client HTTP partagé
+Une Session requests par hôte (connexions TCP/TLS réutilisées grâce au
+keep-alive), taille des pools configurable et politique de retry commune
+(urllib3 Retry avec backoff exponentiel). Fournit aussi des requêtes HEAD
+groupées pour sonder toute une sélection en parallèle.
+
+Mesure du gain keep-alive sur un serveur local:
+    python http_client.py --bench http://127.0.0.1:8000/fichier --count 200
+Le serveur doit parler HTTP/1.1 (keep-alive) sans algorithme de Nagle, sinon
+chaque requête réutilisée attend l'ACK retardé (~40 ms) et la mesure est faussée.
+"""
+
+import sys
+import time
+import logging
+import argparse
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:
+    requests = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+# Codes HTTP temporaires pour lesquels une requête est retentée
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+USER_AGENT = 'NiTrite/17 (+requests)'
+
+
+class HttpClient:
+    """Sessions HTTP poolées par hôte, thread-safe"""
+
+    def __init__(self, pool_maxsize: int = DEFAULT_POOL_MAXSIZE, retries: int = DEFAULT_RETRIES,
+                 backoff_factor: float = DEFAULT_BACKOFF_FACTOR):
+        """
+        Args:
+            pool_maxsize: Connexions conservées par hôte (>= téléchargements x segments simultanés)
+            retries: Nouvelles tentatives sur erreur de connexion ou code temporaire
+            backoff_factor: Base du délai exponentiel entre deux tentatives
+        """
+        if requests is None:
+            raise ImportError("Le module 'requests' est requis pour le client HTTP")
+        self.pool_maxsize = pool_maxsize
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._sessions: Dict[str, 'requests.Session'] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, pool_maxsize: Optional[int] = None, retries: Optional[int] = None,
+                  backoff_factor: Optional[float] = None):
+        """Change les réglages; les sessions existantes sont recréées à la demande"""
+        with self._lock:
+            if (pool_maxsize in (None, self.pool_maxsize) and retries in (None, self.retries)
+                    and backoff_factor in (None, self.backoff_factor)):
+                return
+            if pool_maxsize is not None:
+                self.pool_maxsize = max(1, int(pool_maxsize))
+            if retries is not None:
+                self.retries = max(0, int(retries))
+            if backoff_factor is not None:
+                self.backoff_factor = float(backoff_factor)
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+    def _retry_policy(self) -> 'Retry':
+        return Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['HEAD', 'GET', 'OPTIONS']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+
+    def _create_session(self) -> 'requests.Session':
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize,
+                              max_retries=self._retry_policy())
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['User-Agent'] = USER_AGENT
+        return session
+
+    def session_for(self, url: str) -> 'requests.Session':
+        """Session dédiée à l'hôte de l'URL (créée à la première utilisation)"""
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}".lower()
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = self._create_session()
+            return session
+
+    def request(self, method: str, url: str, **kwargs) -> 'requests.Response':
+        kwargs.setdefault('timeout', 30)
+        return self.session_for(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> 'requests.Response':
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> 'requests.Response':
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> 'requests.Response':
+        return self.request('POST', url, **kwargs)
+
+    def head_many(self, urls: Iterable[str], timeout: float = 10, max_workers: int = 8,
+                  allow_redirects: bool = True) -> Dict[str, Optional['requests.Response']]:
+        """
+        Requêtes HEAD en parallèle (les connexions d'un même hôte sont réutilisées)
+
+        Returns:
+            dict: {url: Response ou None si erreur réseau}
+        """
+        unique = list(dict.fromkeys(u for u in urls if u))
+        if not unique:
+            return {}
+
+        def probe(url):
+            try:
+                return self.head(url, timeout=timeout, allow_redirects=allow_redirects)
+            except requests.RequestException as e:
+                logger.debug(f"HEAD {url} impossible: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique)))) as executor:
+            return dict(zip(unique, executor.map(probe, unique)))
+
+    def close(self):
+        """Ferme toutes les connexions"""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Client HTTP partagé par toute l'application"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def benchmark_keepalive(url: str, count: int = 100) -> Dict[str, float]:
+    """
+    Compare des requêtes GET sans réutilisation de connexion (requests.get)
+    et avec le client poolé
+
+    Returns:
+        dict: durées totales en secondes {'sans_pool', 'avec_pool'} et 'gain' (ratio)
+    """
+    start = time.perf_counter()
+    for _ in range(count):
+        requests.get(url, timeout=10).content
+    without_pool = time.perf_counter() - start
+
+    client = HttpClient()
+    try:
+        client.get(url, timeout=10).content  # Ouverture de la connexion
+        start = time.perf_counter()
+        for _ in range(count):
+            client.get(url, timeout=10).content
+        with_pool = time.perf_counter() - start
+    finally:
+        client.close()
+    return {
+        'sans_pool': without_pool,
+        'avec_pool': with_pool,
+        'gain': without_pool / with_pool if with_pool else 0.0
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='http_client', description="Mesure du gain keep-alive")
+    parser.add_argument('--bench', required=True, metavar='URL', help="URL à interroger (serveur local)")
+    parser.add_argument('--count', type=int, default=100)
+    args = parser.parse_args(argv)
+
+    result = benchmark_keepalive(args.bench, args.count)
+    print(f"Sans pool : {result['sans_pool'] * 1000 / args.count:.2f} ms/requête")
+    print(f"Avec pool : {result['avec_pool'] * 1000 / args.count:.2f} ms/requête")
+    print(f"Gain      : x{result['gain']:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
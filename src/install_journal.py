@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Journal d'installation persistant
+Fichier JSONL en ajout seul (une ligne par changement d'état, fsync à chaque
+écriture) qui permet de reprendre une session d'installation interrompue
+(redémarrage de l'application ou du poste) sans refaire le travail terminé.
+"""
+
+import os
+import json
+import uuid
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+try:
+    from .portable_paths import get_portable_logs_dir
+except ImportError:
+    from portable_paths import get_portable_logs_dir
+
+logger = logging.getLogger(__name__)
+
+# États d'un programme dans une session
+STATE_QUEUED = 'queued'
+STATE_DOWNLOADED = 'downloaded'
+STATE_HASH_VERIFIED = 'hash_verified'
+STATE_INSTALLED = 'installed'
+STATE_FAILED = 'failed'
+
+# Événements de session
+SESSION_START = 'session_start'
+SESSION_END = 'session_end'
+
+# Nombre de sessions conservées lors du compactage du journal
+MAX_SESSIONS = 20
+
+
+@dataclass
+class SessionState:
+    """État reconstruit d'une session à partir du journal"""
+    session_id: str
+    programs: List[str]
+    started_at: str = ''
+    status: str = ''                          # '' (interrompue), 'completed', 'stopped'
+    records: Dict[str, Dict] = field(default_factory=dict)  # dernier enregistrement par programme
+    downloads: Dict[str, Dict] = field(default_factory=dict)  # dernier fichier téléchargé par programme
+
+    def state_of(self, program: str) -> str:
+        return self.records.get(program, {}).get('state', STATE_QUEUED)
+
+    def completed(self) -> List[str]:
+        """Programmes installés avec succès"""
+        return [p for p in self.programs if self.state_of(p) == STATE_INSTALLED]
+
+    def remaining(self) -> List[str]:
+        """Programmes restant à installer (en attente, téléchargés ou en échec)"""
+        return [p for p in self.programs if self.state_of(p) != STATE_INSTALLED]
+
+    @property
+    def finished(self) -> bool:
+        return self.status == 'completed' or not self.remaining()
+
+
+class InstallJournal:
+    """Journal JSONL des sessions d'installation"""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Fichier du journal (par défaut logs/install_journal.jsonl à côté de l'exe)
+        """
+        if path is None:
+            logs_dir = get_portable_logs_dir() or Path(tempfile.gettempdir())
+            path = Path(logs_dir) / 'install_journal.jsonl'
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def _append(self, records: List[Dict]):
+        """Ajoute des enregistrements et force leur écriture sur disque"""
+        timestamp = datetime.now().isoformat(timespec='seconds')
+        data = ''.join(
+            json.dumps({'ts': timestamp, **record}, ensure_ascii=False) + '\n'
+            for record in records
+        ).encode('utf-8')
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a+b') as f:
+                # Ligne tronquée par un arrêt brutal: la terminer avant d'ajouter,
+                # sinon le premier enregistrement serait perdu avec elle
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        data = b'\n' + data
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def load(self) -> List[Dict]:
+        """Lit le journal (les lignes tronquées par un arrêt brutal sont ignorées)"""
+        if not self.path.exists():
+            return []
+        records = []
+        with self._lock, open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records
+
+    def start_session(self, programs: List[str]) -> str:
+        """Ouvre une session et inscrit ses programmes comme 'queued'"""
+        self.compact()
+        session_id = uuid.uuid4().hex[:12]
+        records = [{'session': session_id, 'state': SESSION_START, 'programs': list(programs)}]
+        records += [{'session': session_id, 'program': p, 'state': STATE_QUEUED} for p in programs]
+        self._append(records)
+        return session_id
+
+    def record(self, session_id: str, program: str, state: str, **details):
+        """
+        Enregistre un changement d'état
+
+        Args:
+            details: Informations complémentaires (method, reason, installer_path, sha256...)
+        """
+        record = {'session': session_id, 'program': program, 'state': state}
+        record.update({k: v for k, v in details.items() if v is not None})
+        self._append([record])
+
+    def end_session(self, session_id: str, status: str = 'completed'):
+        """Ferme une session ('completed' ou 'stopped')"""
+        self._append([{'session': session_id, 'state': SESSION_END, 'status': status}])
+
+    def sessions(self) -> List[SessionState]:
+        """Sessions du journal, de la plus ancienne à la plus récente"""
+        sessions: Dict[str, SessionState] = {}
+        for record in self.load():
+            session_id = record.get('session')
+            state = record.get('state')
+            if state == SESSION_START:
+                sessions[session_id] = SessionState(
+                    session_id, record.get('programs', []), started_at=record.get('ts', '')
+                )
+                continue
+            session = sessions.get(session_id)
+            if session is None:
+                continue
+            if state == SESSION_END:
+                session.status = record.get('status', 'completed')
+            elif record.get('program'):
+                session.records[record['program']] = record
+                if record.get('installer_path'):
+                    session.downloads[record['program']] = record
+        return list(sessions.values())
+
+    def pending_session(self) -> Optional[SessionState]:
+        """Dernière session interrompue ou arrêtée avec des programmes restants, sinon None"""
+        sessions = self.sessions()
+        if not sessions or sessions[-1].finished:
+            return None
+        return sessions[-1]
+
+    def compact(self, max_sessions: int = MAX_SESSIONS):
+        """Ne conserve que les dernières sessions (réécriture atomique)"""
+        records = self.load()
+        session_ids = list(dict.fromkeys(
+            r.get('session') for r in records if r.get('state') == SESSION_START
+        ))
+        if len(session_ids) <= max_sessions:
+            return
+        keep = set(session_ids[-max_sessions:])
+        tmp_path = self.path.with_suffix('.jsonl.tmp')
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for record in records:
+                    if record.get('session') in keep:
+                        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planification avant installation
+Sonde en parallèle (requêtes HEAD) les URLs de toute une sélection pour
+annoncer la taille totale à télécharger et la durée estimée, et repérer les
+liens morts avant le démarrage du pipeline. Les réponses sont mises en cache
+par URL (taille, Last-Modified, ETag) et le débit mesuré lors des
+téléchargements précédents sert au calcul de l'ETA.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from .http_client import get_http_client
+    from .portable_paths import get_portable_cache_dir
+except ImportError:
+    from http_client import get_http_client
+    from portable_paths import get_portable_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Durée de validité des réponses en cache (secondes)
+CACHE_TTL = 24 * 3600
+DEAD_CACHE_TTL = 3600
+# Codes indiquant un lien mort (les autres erreurs sont considérées incertaines)
+DEAD_STATUS_CODES = (404, 410)
+# Serveurs qui refusent HEAD: nouvel essai en GET sur le premier octet
+HEAD_REJECTED_CODES = (403, 405, 501)
+# Poids de la dernière mesure dans la moyenne glissante du débit
+BANDWIDTH_SMOOTHING = 0.3
+# Transferts trop courts pour mesurer un débit fiable
+MIN_SAMPLE_BYTES = 512 * 1024
+
+# Statuts d'une entrée du plan
+STATUS_OK = 'ok'
+STATUS_DEAD = 'dead'
+STATUS_UNKNOWN = 'unknown'
+STATUS_NO_URL = 'no_url'
+
+
+@dataclass
+class PlanEntry:
+    """Résultat de la sonde d'un programme"""
+    name: str
+    url: str = ''
+    status: str = STATUS_UNKNOWN
+    size: int = 0
+    last_modified: str = ''
+    status_code: Optional[int] = None
+    error: str = ''
+
+
+@dataclass
+class InstallPlan:
+    """Bilan avant installation"""
+    entries: List[PlanEntry] = field(default_factory=list)
+    bandwidth: float = 0.0          # octets/seconde mesurés (0 = inconnu)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry.size for entry in self.entries)
+
+    @property
+    def dead_links(self) -> List[PlanEntry]:
+        return [entry for entry in self.entries if entry.status == STATUS_DEAD]
+
+    @property
+    def unknown_sizes(self) -> List[PlanEntry]:
+        return [entry for entry in self.entries if entry.status in (STATUS_OK, STATUS_UNKNOWN) and not entry.size]
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Durée estimée des téléchargements (None si le débit n'a jamais été mesuré)"""
+        if not self.bandwidth:
+            return None
+        return self.total_bytes / self.bandwidth
+
+    def summary(self) -> str:
+        text = f"{self.total_bytes / (1024 * 1024):.1f} Mo à télécharger"
+        eta = self.eta_seconds
+        if eta is not None:
+            minutes, seconds = divmod(int(eta), 60)
+            text += f", environ {minutes} min {seconds:02d} s"
+        if self.unknown_sizes:
+            text += f" ({len(self.unknown_sizes)} taille(s) inconnue(s))"
+        if self.dead_links:
+            text += f", {len(self.dead_links)} lien(s) mort(s)"
+        return text
+
+
+class InstallPlanner:
+    """Sonde des URLs avec cache persistant et mesure du débit"""
+
+    def __init__(self, cache_file=None, client=None, max_workers: int = 16):
+        """
+        Args:
+            cache_file: Fichier JSON du cache (par défaut cache/planner/head_cache.json)
+            client: Client HTTP (client partagé par défaut)
+            max_workers: Requêtes HEAD simultanées
+        """
+        if cache_file is None:
+            cache_file = get_portable_cache_dir('planner') / 'head_cache.json'
+        self.cache_file = Path(cache_file)
+        self.client = client
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                data.setdefault('urls', {})
+                return data
+        except Exception as e:
+            logger.warning(f"⚠️ Cache du planificateur illisible, réinitialisation: {e}")
+        return {'urls': {}, 'bandwidth': 0.0}
+
+    def _save(self):
+        """Sauvegarde le cache (écriture atomique)"""
+        with self._lock:
+            data = json.dumps(self._data, indent=2, ensure_ascii=False)
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning(f"⚠️ Cache du planificateur non enregistré: {e}")
+
+    @property
+    def bandwidth(self) -> float:
+        with self._lock:
+            return float(self._data.get('bandwidth') or 0.0)
+
+    def record_transfer(self, size: int, seconds: float):
+        """Intègre un téléchargement réel à la moyenne glissante du débit"""
+        if size < MIN_SAMPLE_BYTES or seconds <= 0:
+            return
+        sample = size / seconds
+        with self._lock:
+            previous = float(self._data.get('bandwidth') or 0.0)
+            self._data['bandwidth'] = sample if not previous else \
+                previous + BANDWIDTH_SMOOTHING * (sample - previous)
+        self._save()
+
+    def _cached(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._data['urls'].get(url)
+        if not entry:
+            return None
+        # Liens morts et serveurs injoignables (sans code HTTP) revérifiés plus tôt
+        short = entry.get('status') == STATUS_DEAD or 'status_code' not in entry
+        ttl = DEAD_CACHE_TTL if short else CACHE_TTL
+        if time.time() - entry.get('checked', 0) > ttl:
+            return None
+        return entry
+
+    def _probe(self, urls: List[str], timeout: float) -> Dict[str, Dict]:
+        """Sonde des URLs en parallèle (HEAD, puis GET d'un octet si HEAD est refusé)"""
+        client = self.client or get_http_client()
+        responses = client.head_many(urls, timeout=timeout, max_workers=self.max_workers)
+        results = {}
+        for url, response in responses.items():
+            if response is not None and response.status_code in HEAD_REJECTED_CODES:
+                try:
+                    with client.get(url, headers={'Range': 'bytes=0-0'}, stream=True, timeout=timeout) as ranged:
+                        results[url] = self._describe(url, ranged)
+                        continue
+                except Exception:
+                    pass
+            results[url] = self._describe(url, response)
+        return results
+
+    @staticmethod
+    def _describe(url: str, response) -> Dict:
+        checked = time.time()
+        if response is None:
+            # Erreur réseau (DNS, proxy, délai): rien ne prouve que le lien est mort
+            return {'status': STATUS_UNKNOWN, 'error': 'Serveur injoignable', 'checked': checked}
+        code = response.status_code
+        if code in DEAD_STATUS_CODES:
+            return {'status': STATUS_DEAD, 'status_code': code, 'error': f"HTTP {code}", 'checked': checked}
+        if code >= 400:
+            return {'status': STATUS_UNKNOWN, 'status_code': code, 'error': f"HTTP {code}", 'checked': checked}
+        headers = response.headers
+        size = 0
+        content_range = headers.get('Content-Range', '')
+        try:
+            if code == 206 and '/' in content_range:
+                size = int(content_range.rsplit('/', 1)[1])
+            else:
+                size = int(headers.get('Content-Length', 0))
+        except ValueError:
+            size = 0
+        return {
+            'status': STATUS_OK,
+            'status_code': code,
+            'size': size,
+            'last_modified': headers.get('Last-Modified', ''),
+            'etag': headers.get('ETag', ''),
+            'checked': checked
+        }
+
+    def plan(self, program_names: Iterable[str], programs_db: Dict[str, Dict],
+             refresh: bool = False, timeout: float = 10) -> InstallPlan:
+        """
+        Construit le bilan d'une sélection
+
+        Args:
+            program_names: Programmes sélectionnés
+            programs_db: Catalogue {nom: infos}
+            refresh: Ignorer le cache et sonder toutes les URLs
+            timeout: Timeout de chaque requête
+        """
+        names = list(dict.fromkeys(program_names))
+        urls = {name: (programs_db.get(name, {}).get('download_url') or '').strip() for name in names}
+
+        to_probe = []
+        known = {}
+        for url in dict.fromkeys(u for u in urls.values() if u):
+            cached = None if refresh else self._cached(url)
+            if cached:
+                known[url] = cached
+            else:
+                to_probe.append(url)
+
+        if to_probe:
+            probed = self._probe(to_probe, timeout)
+            known.update(probed)
+            with self._lock:
+                self._data['urls'].update(probed)
+            self._save()
+
+        plan = InstallPlan(bandwidth=self.bandwidth)
+        for name in names:
+            url = urls[name]
+            if not url:
+                plan.entries.append(PlanEntry(name=name, status=STATUS_NO_URL))
+                continue
+            info = known.get(url, {})
+            plan.entries.append(PlanEntry(
+                name=name,
+                url=url,
+                status=info.get('status', STATUS_UNKNOWN),
+                size=info.get('size', 0),
+                last_modified=info.get('last_modified', ''),
+                status_code=info.get('status_code'),
+                error=info.get('error', '')
+            ))
+        return plan
+
+
+_planner: Optional[InstallPlanner] = None
+_planner_lock = threading.Lock()
+
+
+def get_install_planner() -> InstallPlanner:
+    """Planificateur partagé (cache et mesure de débit communs)"""
+    global _planner
+    with _planner_lock:
+        if _planner is None:
+            _planner = InstallPlanner()
+        return _planner
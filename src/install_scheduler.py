@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planificateur d'installations
+Graphe de dépendances (DAG) construit à partir des champs optionnels de
+programs.json, pour exécuter en parallèle les installations indépendantes
+et sérialiser celles qui partagent une ressource exclusive (Windows
+Installer: une seule installation MSI à la fois, sinon erreur 1618).
+
+Champs optionnels d'un programme:
+    "depends_on": ["Microsoft Visual C++ 2015-2022 (x64)"]   installé avant
+    "conflicts_with": ["Autre programme"]   jamais exécutés en même temps
+    "exclusive_resource": "windows_installer"   (chaîne ou liste)
+
+Le planificateur est une machine à états sans thread: l'appelant demande
+les tâches prêtes (`ready`), les démarre (`start`) puis signale leur fin
+(`finish`). Il peut donc être piloté par un pool de threads ou par asyncio.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Ressource exclusive des installations passant par Windows Installer
+WINDOWS_INSTALLER = 'windows_installer'
+
+# États d'une tâche
+PENDING = 'pending'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+
+class SchedulerError(Exception):
+    """Graphe invalide (cycle de dépendances)"""
+
+
+def _as_set(value) -> Set[str]:
+    if not value:
+        return set()
+    if isinstance(value, str):
+        return {value}
+    return set(value)
+
+
+def default_resources(program_info: Dict) -> Set[str]:
+    """
+    Ressources exclusives d'un programme
+
+    `exclusive_resource` explicite, sinon Windows Installer pour les MSI et
+    pour tout programme doté d'un winget_id: winget lance souvent un MSI, et
+    un installateur EXE en échec est repris par winget dans la même tâche
+    (sans la ressource, erreur 1618). Aucune pour les portables (jamais de
+    repli winget) et les installateurs EXE sans winget_id.
+    """
+    explicit = _as_set(program_info.get('exclusive_resource'))
+    if explicit:
+        return explicit
+    if program_info.get('portable') or program_info.get('install_args') == 'portable':
+        return set()
+    download_url = program_info.get('download_url', '').strip()
+    if program_info.get('install_type', '').lower() == 'msi' or download_url.lower().split('?')[0].endswith('.msi'):
+        return {WINDOWS_INSTALLER}
+    if program_info.get('winget_id'):
+        return {WINDOWS_INSTALLER}
+    return set()
+
+
+@dataclass
+class InstallTask:
+    """Programme à installer et ses contraintes"""
+    name: str
+    index: int
+    depends_on: Set[str] = field(default_factory=set)
+    conflicts_with: Set[str] = field(default_factory=set)
+    resources: Set[str] = field(default_factory=set)
+    state: str = PENDING
+    reason: str = ''
+
+
+class InstallScheduler:
+    """Machine à états de planification des installations"""
+
+    def __init__(
+        self,
+        program_list: Iterable[str],
+        programs_db: Dict[str, Dict],
+        include_dependencies: bool = True,
+        resource_resolver: Callable[[Dict], Set[str]] = default_resources
+    ):
+        """
+        Args:
+            program_list: Programmes sélectionnés (l'ordre sert de priorité)
+            programs_db: Catalogue {nom: infos}
+            include_dependencies: Ajouter les dépendances du catalogue absentes de la sélection
+            resource_resolver: Fonction (infos) -> ressources exclusives
+
+        Raises:
+            SchedulerError: en cas de cycle de dépendances
+        """
+        self.tasks: Dict[str, InstallTask] = {}
+        self._held_resources: Set[str] = set()
+        self._running: Set[str] = set()
+
+        order = self._expand(list(dict.fromkeys(program_list)), programs_db, include_dependencies)
+        for index, name in enumerate(order):
+            info = programs_db.get(name, {})
+            self.tasks[name] = InstallTask(
+                name=name,
+                index=index,
+                # Dépendances hors sélection et hors catalogue ignorées
+                depends_on={d for d in _as_set(info.get('depends_on')) if d in order and d != name},
+                conflicts_with=_as_set(info.get('conflicts_with')) - {name},
+                resources=resource_resolver(info) if info else set()
+            )
+        # Les conflits sont symétriques
+        for task in self.tasks.values():
+            for other in task.conflicts_with:
+                if other in self.tasks:
+                    self.tasks[other].conflicts_with.add(task.name)
+        self._check_cycles()
+
+    @staticmethod
+    def _expand(selection: List[str], programs_db: Dict[str, Dict], include_dependencies: bool) -> List[str]:
+        """Sélection complétée par les dépendances (placées avant leurs dépendants)"""
+        if not include_dependencies:
+            return selection
+        order: List[str] = []
+        seen: Set[str] = set()
+
+        def visit(name, stack):
+            if name in seen or name in stack:
+                return
+            stack.add(name)
+            for dependency in sorted(_as_set(programs_db.get(name, {}).get('depends_on'))):
+                if dependency in programs_db or dependency in selection:
+                    visit(dependency, stack)
+            stack.discard(name)
+            seen.add(name)
+            order.append(name)
+
+        for name in selection:
+            visit(name, set())
+        return order
+
+    def _check_cycles(self):
+        """Tri topologique (Kahn): lève SchedulerError si un cycle subsiste"""
+        remaining = {name: set(task.depends_on) for name, task in self.tasks.items()}
+        while remaining:
+            free = [name for name, deps in remaining.items() if not deps]
+            if not free:
+                raise SchedulerError(f"Cycle de dépendances: {', '.join(sorted(remaining))}")
+            for name in free:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(free)
+
+    @property
+    def order(self) -> List[str]:
+        """Programmes planifiés (dépendances incluses), dans l'ordre de priorité"""
+        return sorted(self.tasks, key=lambda name: self.tasks[name].index)
+
+    @property
+    def finished(self) -> bool:
+        return all(task.state not in (PENDING, RUNNING) for task in self.tasks.values())
+
+    @property
+    def running(self) -> List[str]:
+        return sorted(self._running, key=lambda name: self.tasks[name].index)
+
+    def _blocked(self, task: InstallTask) -> bool:
+        if any(self.tasks[d].state != SUCCEEDED for d in task.depends_on):
+            return True
+        if task.resources & self._held_resources:
+            return True
+        return bool(task.conflicts_with & self._running)
+
+    def ready(self, limit: Optional[int] = None) -> List[str]:
+        """
+        Tâches démarrables maintenant, par priorité
+
+        Les tâches retournées sont compatibles entre elles (ressources et
+        conflits), elles peuvent donc toutes être démarrées.
+        """
+        result = []
+        resources = set(self._held_resources)
+        names = set(self._running)
+        for name in self.order:
+            if limit is not None and len(result) >= limit:
+                break
+            task = self.tasks[name]
+            if task.state != PENDING:
+                continue
+            if any(self.tasks[d].state != SUCCEEDED for d in task.depends_on):
+                continue
+            if task.resources & resources or task.conflicts_with & names:
+                continue
+            result.append(name)
+            resources |= task.resources
+            names.add(name)
+        return result
+
+    def start(self, name: str):
+        """Marque une tâche comme démarrée et réserve ses ressources"""
+        task = self.tasks[name]
+        if task.state != PENDING or self._blocked(task):
+            raise SchedulerError(f"Tâche non démarrable: {name}")
+        task.state = RUNNING
+        self._running.add(name)
+        self._held_resources |= task.resources
+
+    def finish(self, name: str, success: bool, reason: str = '') -> List[str]:
+        """
+        Termine une tâche et libère ses ressources
+
+        Returns:
+            Tâches abandonnées parce que cette tâche (ou une dépendance) a échoué
+        """
+        task = self.tasks[name]
+        if task.state == RUNNING:
+            self._running.discard(name)
+            self._held_resources -= task.resources
+        task.state = SUCCEEDED if success else FAILED
+        task.reason = reason
+        return [] if success else self._skip_dependents(name)
+
+    def _skip_dependents(self, failed_name: str) -> List[str]:
+        skipped = []
+        changed = True
+        while changed:
+            changed = False
+            for task in self.tasks.values():
+                if task.state != PENDING:
+                    continue
+                failed = [d for d in task.depends_on if self.tasks[d].state in (FAILED, SKIPPED)]
+                if failed:
+                    task.state = SKIPPED
+                    task.reason = f"Dépendance non installée: {', '.join(sorted(failed))}"
+                    skipped.append(task.name)
+                    changed = True
+        return skipped
+
+    def cancel_pending(self, reason: str = 'Annulé') -> List[str]:
+        """Abandonne toutes les tâches non démarrées"""
+        cancelled = []
+        for task in self.tasks.values():
+            if task.state == PENDING:
+                task.state = SKIPPED
+                task.reason = reason
+                cancelled.append(task.name)
+        return cancelled
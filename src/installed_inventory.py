@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Inventaire des logiciels installés
+Instantané unique (registre Uninstall, `winget list`, dossiers d'installation)
+partagé par toutes les détections d'installation de l'application
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+try:
+    from .winget_session import get_winget_session
+    from .name_matcher import NameIndex, DEFAULT_MIN_SCORE
+except ImportError:
+    from winget_session import get_winget_session
+    from name_matcher import NameIndex, DEFAULT_MIN_SCORE
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_name(name: str) -> str:
+    """Normalise un nom de programme pour les comparaisons (casse, espaces, tirets)"""
+    return name.lower().replace(' ', '').replace('-', '').replace('_', '')
+
+
+@dataclass
+class InstalledEntry:
+    """Logiciel détecté sur le poste"""
+    name: str
+    source: str                 # 'registry', 'winget' ou 'folder'
+    version: str = ''
+    publisher: str = ''
+    winget_id: str = ''
+    location: str = ''
+
+
+class InventoryBackend:
+    """Source de données de l'inventaire (surchargée pour Windows ou les tests)"""
+
+    def collect_registry(self) -> List[InstalledEntry]:
+        return []
+
+    def collect_winget(self) -> Optional[List[InstalledEntry]]:
+        """Retourne None si winget n'est pas disponible"""
+        return None
+
+    def collect_folders(self) -> List[InstalledEntry]:
+        return []
+
+
+class WindowsInventoryBackend(InventoryBackend):
+    """Lecture du registre, de winget et des dossiers standards sous Windows"""
+
+    UNINSTALL_KEYS = [
+        ('HKEY_LOCAL_MACHINE', r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+        ('HKEY_LOCAL_MACHINE', r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
+        ('HKEY_CURRENT_USER', r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+    ]
+
+    def collect_registry(self) -> List[InstalledEntry]:
+        """Parcourt une seule fois les ruches Uninstall"""
+        try:
+            import winreg
+        except ImportError:
+            return []
+
+        entries = []
+        for hkey_name, path in self.UNINSTALL_KEYS:
+            try:
+                with winreg.OpenKey(getattr(winreg, hkey_name), path) as key:
+                    for i in range(winreg.QueryInfoKey(key)[0]):
+                        try:
+                            subkey_name = winreg.EnumKey(key, i)
+                            with winreg.OpenKey(key, subkey_name) as subkey:
+                                values = {}
+                                for value_name in ("DisplayName", "DisplayVersion", "Publisher", "InstallLocation"):
+                                    try:
+                                        values[value_name] = str(winreg.QueryValueEx(subkey, value_name)[0])
+                                    except OSError:
+                                        values[value_name] = ''
+                                if values["DisplayName"]:
+                                    entries.append(InstalledEntry(
+                                        name=values["DisplayName"],
+                                        source='registry',
+                                        version=values["DisplayVersion"],
+                                        publisher=values["Publisher"],
+                                        location=values["InstallLocation"]
+                                    ))
+                        except OSError:
+                            continue
+            except OSError:
+                continue  # Erreur d'accès à cette clé
+        return entries
+
+    def collect_winget(self) -> Optional[List[InstalledEntry]]:
+        """Une seule exécution de `winget list` (session winget partagée)"""
+        records = get_winget_session().list_installed(refresh=True)
+        if records is None:
+            return None
+
+        return [
+            InstalledEntry(
+                name=record.get('name', ''),
+                source='winget',
+                version=record.get('version', ''),
+                winget_id=record.get('id', '')
+            )
+            for record in records
+        ]
+
+    def collect_folders(self) -> List[InstalledEntry]:
+        """Liste les sous-dossiers des emplacements d'installation courants"""
+        home = Path(os.path.expanduser("~"))
+        search_paths = [
+            Path(os.environ.get('ProgramFiles', 'C:/Program Files')),
+            Path(os.environ.get('ProgramFiles(x86)', 'C:/Program Files (x86)')),
+            home / 'AppData' / 'Local',
+            home / 'AppData' / 'Local' / 'Programs',
+            home / 'AppData' / 'Roaming',
+            Path("C:/Users/Public/Desktop"),
+            home / 'Desktop',
+        ]
+
+        entries = []
+        seen = set()
+        for search_path in search_paths:
+            if search_path in seen or not search_path.exists():
+                continue
+            seen.add(search_path)
+            try:
+                for item in search_path.iterdir():
+                    if item.is_dir():
+                        entries.append(InstalledEntry(name=item.name, source='folder', location=str(item)))
+            except (PermissionError, OSError):
+                continue  # Ignorer les erreurs d'accès
+        return entries
+
+
+class FixtureInventoryBackend(InventoryBackend):
+    """
+    Inventaire construit à partir de données fixes (tests, machines non Windows)
+
+    Format: {"registry": [{...}], "winget": [{...}] ou null, "folders": [{...}]}
+    où chaque élément contient les champs d'InstalledEntry (sans 'source').
+    """
+
+    def __init__(self, data=None, json_path=None):
+        if json_path is not None:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        self.data = data or {}
+
+    def _entries(self, key, source):
+        return [InstalledEntry(source=source, **item) for item in self.data.get(key) or []]
+
+    def collect_registry(self) -> List[InstalledEntry]:
+        return self._entries('registry', 'registry')
+
+    def collect_winget(self) -> Optional[List[InstalledEntry]]:
+        if self.data.get('winget') is None:
+            return None
+        return self._entries('winget', 'winget')
+
+    def collect_folders(self) -> List[InstalledEntry]:
+        return self._entries('folders', 'folder')
+
+
+class InstalledInventory:
+    """
+    Instantané des logiciels installés avec index de recherche
+
+    Construit en une passe (registre + winget + dossiers) puis interrogé en
+    O(1) par identifiant winget et par nom normalisé, et par similarité via
+    un index de tokens/trigrammes (NameIndex).
+    """
+
+    def __init__(self, backend: Optional[InventoryBackend] = None):
+        self.backend = backend if backend is not None else WindowsInventoryBackend()
+        self.entries: List[InstalledEntry] = []
+        self.winget_available = False
+        self.created_at = 0.0
+        self.by_winget_id: Dict[str, InstalledEntry] = {}
+        self.by_normalized_name: Dict[str, List[InstalledEntry]] = {}
+        self.name_index = NameIndex()
+        self.refresh()
+
+    def refresh(self):
+        """Reconstruit l'instantané à partir du backend"""
+        start = time.perf_counter()
+        entries = []
+        entries.extend(self.backend.collect_registry())
+        winget_entries = self.backend.collect_winget()
+        self.winget_available = winget_entries is not None
+        entries.extend(winget_entries or [])
+        entries.extend(self.backend.collect_folders())
+
+        by_winget_id = {}
+        by_normalized_name = {}
+        for entry in entries:
+            if entry.winget_id:
+                by_winget_id[entry.winget_id.lower()] = entry
+            key = normalize_name(entry.name)
+            if key:
+                by_normalized_name.setdefault(key, []).append(entry)
+
+        self.entries = entries
+        self.by_winget_id = by_winget_id
+        self.by_normalized_name = by_normalized_name
+        self.name_index = NameIndex((entry.name, entry) for entry in entries)
+        self.created_at = time.time()
+        logger.info(f"📦 Inventaire: {len(entries)} entrées en {time.perf_counter() - start:.2f}s")
+
+    @property
+    def age(self) -> float:
+        """Âge de l'instantané en secondes"""
+        return time.time() - self.created_at
+
+    def has_winget_id(self, winget_id: str) -> bool:
+        """Indique si un identifiant winget figure dans `winget list`"""
+        return bool(winget_id) and winget_id.lower() in self.by_winget_id
+
+    def get_by_name(self, name: str) -> List[InstalledEntry]:
+        """Entrées dont le nom normalisé est identique"""
+        return self.by_normalized_name.get(normalize_name(name), [])
+
+    def find_by_name(self, name: str, sources=None, min_score=DEFAULT_MIN_SCORE) -> List[InstalledEntry]:
+        """
+        Entrées dont le nom correspond au nom recherché, de la plus probable
+        à la moins probable
+
+        Args:
+            name: Nom du programme
+            sources: Sources à considérer ('registry', 'winget', 'folder'), toutes par défaut
+            min_score: Score de similarité minimum (voir NameIndex)
+        """
+        return [
+            entry for entry, _ in self.name_index.matches(name, min_score)
+            if sources is None or entry.source in sources
+        ]
+
+    def best_match(self, name: str, sources=None, min_score=DEFAULT_MIN_SCORE):
+        """Meilleure entrée (InstalledEntry, score) pour un nom, ou None"""
+        for entry, score in self.name_index.matches(name, min_score):
+            if sources is None or entry.source in sources:
+                return entry, score
+        return None
+
+    def names(self, sources=None) -> List[str]:
+        """Noms de tous les logiciels détectés"""
+        return [e.name for e in self.entries if sources is None or e.source in sources]
+
+    def installed_count(self) -> int:
+        """Nombre de logiciels distincts (registre + winget, sans les dossiers)"""
+        return len({
+            normalize_name(e.name) for e in self.entries
+            if e.source in ('registry', 'winget') and e.name
+        })
+
+    def to_dict(self) -> Dict:
+        """Export de l'instantané (même format que FixtureInventoryBackend)"""
+        data = {'registry': [], 'winget': [] if self.winget_available else None, 'folders': []}
+        keys = {'registry': 'registry', 'winget': 'winget', 'folder': 'folders'}
+        for entry in self.entries:
+            item = asdict(entry)
+            del item['source']
+            data[keys[entry.source]].append(item)
+        return data
+
+
+# Instantané partagé par l'application
+_inventory: Optional[InstalledInventory] = None
+_inventory_lock = threading.Lock()
+
+
+def get_inventory(refresh=False, max_age=None, backend=None) -> InstalledInventory:
+    """
+    Retourne l'instantané partagé, en le construisant au premier appel
+
+    Args:
+        refresh: Forcer la reconstruction
+        max_age: Reconstruire si l'instantané est plus vieux (secondes)
+        backend: Backend à utiliser (remplace l'instantané existant)
+    """
+    global _inventory
+    with _inventory_lock:
+        if backend is not None:
+            _inventory = InstalledInventory(backend)
+        elif _inventory is None:
+            _inventory = InstalledInventory()
+        elif refresh or (max_age is not None and _inventory.age > max_age):
+            _inventory.refresh()
+        return _inventory
@@ -12,10 +12,10 @@ import json
 import time
 import threading
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 import logging
 from urllib.parse import urlparse
-import hashlib
 import ctypes
 from ctypes import wintypes
 
@@ -57,6 +57,51 @@ except ImportError:
     except ImportError:
         PortableDatabase = None
 
+# Import du gestionnaire de téléchargements (reprise, segments, cache)
+try:
+    from .download_manager import ChunkedDownloader, DownloadCache, hash_file
+    from .portable_paths import get_portable_cache_dir
+    from .mirror_repository import MirrorResolver
+    from .http_client import get_http_client
+    from .install_planner import get_install_planner
+    from .async_installer import AsyncInstallEngine, DEFAULT_DOWNLOAD_TIMEOUT, DEFAULT_INSTALL_TIMEOUT
+    from .catalog_service import get_catalog
+    from .tool_discovery import get_tool_discovery
+except ImportError:
+    from download_manager import ChunkedDownloader, DownloadCache, hash_file
+    from portable_paths import get_portable_cache_dir
+    from mirror_repository import MirrorResolver
+    from http_client import get_http_client
+    from install_planner import get_install_planner
+    from async_installer import AsyncInstallEngine, DEFAULT_DOWNLOAD_TIMEOUT, DEFAULT_INSTALL_TIMEOUT
+    from catalog_service import get_catalog
+    from tool_discovery import get_tool_discovery
+
+# Import de l'inventaire des logiciels installés (instantané partagé)
+try:
+    from .installed_inventory import get_inventory
+    from .winget_session import get_winget_session
+    from .elevation_broker import get_elevation_broker, run_elevated, BrokerError
+    from .process_runner import ProcessRunner, kill_process_tree
+    from . import install_journal
+    from .install_scheduler import InstallScheduler, SchedulerError
+except ImportError:
+    from installed_inventory import get_inventory
+    from winget_session import get_winget_session
+    from elevation_broker import get_elevation_broker, run_elevated, BrokerError
+    from process_runner import ProcessRunner, kill_process_tree
+    import install_journal
+    from install_scheduler import InstallScheduler, SchedulerError
+
+# Import du gestionnaire de configuration (paramètres de téléchargement)
+try:
+    from .config_manager import ConfigManager
+except ImportError:
+    try:
+        from config_manager import ConfigManager
+    except ImportError:
+        ConfigManager = None
+
 def get_windows_folder_path(csidl):
     """
     Obtient le chemin d'un dossier Windows spécial via SHGetFolderPath.
@@ -82,21 +127,78 @@ def get_desktop_path():
 class InstallerManager:
     """Gestionnaire des installations de programmes"""
 
-    def __init__(self, config_path=None, log_callback=None, app_dir=None):
+    def __init__(self, config_path=None, log_callback=None, app_dir=None, max_concurrent_downloads=None,
+                 progress_event_callback=None):
         self.logger = logging.getLogger(__name__)
         self.log_callback = log_callback if log_callback else self._default_log
+        # Événements de progression des installateurs (process_runner.ProgressEvent)
+        self.progress_event_callback = progress_event_callback
         
         self.download_dir = Path(tempfile.gettempdir()) / 'NiTrite_Downloads'
         self.download_dir.mkdir(exist_ok=True)
         
+        # Paramètres de l'application, lus une seule fois (voir _get_app_setting)
+        self._app_settings = self._load_app_settings()
+        
+        # Nombre de téléchargements en parallèle (clé 'max_concurrent_downloads' de ConfigManager)
+        if max_concurrent_downloads is None:
+            max_concurrent_downloads = self._get_app_setting('max_concurrent_downloads', 3)
+        self.max_concurrent_downloads = max(1, int(max_concurrent_downloads))
+        # Installations simultanées autorisées par le planificateur (hors MSI/winget, sérialisés)
+        self.max_concurrent_installs = max(1, int(self._get_app_setting('max_concurrent_installs', 2)))
+        
+        # Connexions HTTP poolées par hôte, partagées par tous les téléchargements
+        if requests:
+            get_http_client().configure(
+                pool_maxsize=self._get_app_setting('http_pool_size', 16),
+                retries=self._get_app_setting('http_retries', 3)
+            )
+        
+        # Téléchargeur avec cache partagé à côté de l'exe (réutilisable d'un poste à l'autre)
+        try:
+            download_cache = DownloadCache(get_portable_cache_dir('downloads'))
+        except Exception as e:
+            self.logger.warning(f"Cache de téléchargements indisponible: {e}")
+            download_cache = None
+        self.downloader = ChunkedDownloader(cache=download_cache, log_callback=self.log_callback)
+        # Sources des installateurs: miroir local -> miroir réseau -> URL d'origine
+        self.mirror = MirrorResolver(
+            self.downloader,
+            local_dir=self._get_app_setting('mirror_dir', '') or None,
+            remote_url=self._get_app_setting('mirror_url', ''),
+            log_callback=self.log_callback
+        )
+        
+        # Fichiers en cours de téléchargement (évite les collisions de noms entre workers)
+        self._active_downloads = set()
+        self._active_downloads_lock = threading.Lock()
+        
         if config_path is None:
             raise ValueError("Le chemin vers le fichier de configuration est requis.")
         
         self.config_path = Path(config_path)
+        self._catalog = None
         self.programs_db = self._load_config()
         
         self.stop_requested = False
         self.current_process = None
+        # Processus d'installation en cours (plusieurs si installations parallèles)
+        self._active_processes = set()
+        self._active_processes_lock = threading.Lock()
+        
+        # Journal des sessions (reprise après redémarrage)
+        try:
+            self.journal = install_journal.InstallJournal()
+        except Exception as e:
+            self.logger.warning(f"Journal d'installation indisponible: {e}")
+            self.journal = None
+        self._journal_session = None
+        self._resume_downloads = {}
+        # URLs signalées mortes par le bilan avant installation (url -> PlanEntry)
+        self._dead_urls = {}
+        # Moteur de la session en cours et jeton d'annulation de l'étape de chaque thread
+        self._engine = None
+        self._cancel_scope = threading.local()
         
         # Initialiser la base de données portable
         if PortableDatabase and app_dir:
@@ -121,6 +223,22 @@ class InstallerManager:
         log_func = getattr(self.logger, level, self.logger.info)
         log_func(message)
 
+    def _load_app_settings(self):
+        """Charge les paramètres de l'application via ConfigManager (vide si indisponible)."""
+        if not ConfigManager:
+            return {}
+        try:
+            config_manager = ConfigManager()
+            config_manager.load_config()
+            return dict(config_manager.config)
+        except Exception as e:
+            self.logger.debug(f"Paramètres de l'application indisponibles: {e}")
+            return {}
+
+    def _get_app_setting(self, key, default):
+        """Lit un paramètre de l'application chargé à l'initialisation (valeur par défaut sinon)."""
+        return self._app_settings.get(key, default)
+
     def _load_config(self):
         """Charge la configuration des programmes depuis le fichier JSON."""
         try:
@@ -128,18 +246,10 @@ class InstallerManager:
                 self.log_callback(f"Fichier de configuration non trouvé: {self.config_path}", "error")
                 return {}
             
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                categorized_programs = json.load(f)
-            
-            # Aplatir la structure pour un accès facile
-            all_programs = {}
-            for category, programs in categorized_programs.items():
-                if isinstance(programs, dict):
-                    for program_name, program_info in programs.items():
-                        # Ajouter la catégorie et le nom pour référence future
-                        program_info['category'] = category
-                        program_info['name'] = program_name
-                        all_programs[program_name] = program_info
+            # Catalogue partagé déjà aplati (avec 'category' et 'name'); copie par programme
+            # car les entrées sont modifiées pendant les installations
+            catalog = self._catalog = get_catalog(self.config_path)
+            all_programs = {name: dict(info) for name, info in catalog.flat.items()}
             
             self.log_callback(f"Configuration chargée: {len(all_programs)} programmes", "info")
             return all_programs
@@ -147,6 +257,14 @@ class InstallerManager:
             self.log_callback(f"Erreur lors du chargement de la configuration: {e}", "error")
             return {}
 
+    def _refresh_programs_db(self):
+        """Recharge les programmes si le catalogue a changé (édition via ConfigManager)"""
+        try:
+            if get_catalog(self.config_path) is not self._catalog:
+                self.programs_db = self._load_config()
+        except Exception as e:
+            self.logger.debug(f"Catalogue non rechargé: {e}")
+
     def get_programs_db(self):
         """Retourne la base de données des programmes."""
         return self.programs_db
@@ -160,18 +278,22 @@ class InstallerManager:
         thread.daemon = True
         thread.start()
 
-    def install_programs(self, program_list, progress_callback, completion_callback=None, success_list=None, failed_list=None):
+    def install_programs(self, program_list, progress_callback, completion_callback=None, success_list=None, failed_list=None,
+                         resume_session_id=None):
         """
         Installe une liste de programmes.
         
+        Façade synchrone du moteur asyncio (async_installer): à appeler depuis
+        un thread de travail, stop_installation() l'interrompt immédiatement.
+        
         Args:
             program_list: Liste des noms de programmes à installer
             progress_callback: Fonction appelée pour mettre à jour la progression (progress, message)
             completion_callback: Fonction appelée à la fin (success)
+            resume_session_id: Session du journal à poursuivre (voir resume_session)
         """
         self.stop_requested = False
-        total_programs = len(program_list)
-        success_count = 0
+        self._refresh_programs_db()
         
         # Listes pour tracking (si fournies depuis GUI)
         if success_list is None:
@@ -181,47 +303,249 @@ class InstallerManager:
         
         self.log_callback("🚀 Début de l'installation...", "info")
         
-        for i, program_name in enumerate(program_list):
-            if self.stop_requested:
-                self.log_callback("⚠️ Installation arrêtée par l'utilisateur.", "warning")
-                if completion_callback:
-                    completion_callback(False)
-                return
-            
-            progress = (i / total_programs) * 100
-            progress_callback(progress, f"Installation de {program_name}...")
+        engine = AsyncInstallEngine(
+            self,
+            download_timeout=self._get_app_setting('download_job_timeout', DEFAULT_DOWNLOAD_TIMEOUT),
+            install_timeout=self._get_app_setting('install_job_timeout', DEFAULT_INSTALL_TIMEOUT)
+        )
+        self._engine = engine
+        try:
+            success_count = engine.run_sync(program_list, progress_callback, success_list, failed_list,
+                                            resume_session_id)
+        finally:
+            self._engine = None
+        
+        if success_count is None or self.stop_requested:
+            self.log_callback("⚠️ Installation arrêtée par l'utilisateur.", "warning")
+            if completion_callback:
+                completion_callback(False)
+            return
+        
+        progress_callback(100, "Installation terminée")
+        self.log_callback(f"✅ Toutes les installations sont terminées. ({success_count}/{engine.total_programs} réussies)", "success")
+        if completion_callback:
+            completion_callback(True)
 
-            program_info = self.programs_db.get(program_name, {})
-            success, error_reason, method = self.install_single_program(program_name)
+    def _prepare_session(self, order, progress_callback):
+        """
+        Étapes préalables d'une session (exécutées hors de la boucle asyncio):
+        bilan des URLs, inventaire, lot winget.
 
-            if success:
-                success_count += 1
-                # Ajouter aux installations réussies
-                success_list.append({
+        Returns:
+            dict: Résultats du lot winget {program_name: (success, error_reason, method)}
+        """
+        # Bilan avant installation: taille totale, durée estimée, liens morts
+        self._preflight(order)
+        
+        # Un seul instantané des logiciels installés pour toute la session
+        try:
+            get_inventory(refresh=True)
+        except Exception as e:
+            self.logger.warning(f"Inventaire des logiciels indisponible: {e}")
+        
+        # Programmes disponibles uniquement via winget: un seul `winget import`
+        return self._install_winget_batch(order, progress_callback)
+
+    def _record_result(self, program_name, success, error_reason, method, success_list, failed_list):
+        """Inscrit le résultat d'un programme au journal et dans les listes de l'interface"""
+        program_info = self.programs_db.get(program_name, {})
+        if success:
+            self._journal_record(program_name, install_journal.STATE_INSTALLED, method=method)
+            # Ajouter aux installations réussies
+            success_list.append({
+                'name': program_name,
+                'category': program_info.get('category', 'N/A'),
+                'method': method if method else 'Unknown'
+            })
+        else:
+            # Ajouter aux installations échouées
+            self._journal_record(program_name, install_journal.STATE_FAILED,
+                                 reason=error_reason or 'Installation échouée', method=method)
+            if not self.stop_requested:
+                self.log_callback(f"❌ Échec de l'installation de {program_name}", "error")
+                failed_list.append({
                     'name': program_name,
                     'category': program_info.get('category', 'N/A'),
-                    'method': method if method else 'Unknown'
+                    'reason': error_reason if error_reason else 'Installation échouée'
                 })
-            else:
-                # Ajouter aux installations échouées
-                if not self.stop_requested:
-                    self.log_callback(f"❌ Échec de l'installation de {program_name}", "error")
-                    failed_list.append({
-                        'name': program_name,
-                        'category': program_info.get('category', 'N/A'),
-                        'reason': error_reason if error_reason else 'Installation échouée'
-                    })
-            
-            time.sleep(1)
-        
-        if not self.stop_requested:
-            progress_callback(100, "Installation terminée")
-            self.log_callback(f"✅ Toutes les installations sont terminées. ({success_count}/{total_programs} réussies)", "success")
-            if completion_callback:
-                completion_callback(True)
-        else:
-            if completion_callback:
-                completion_callback(False)
+
+    def _create_scheduler(self, program_list):
+        """Planificateur de la session (sans dépendances si le graphe contient un cycle)"""
+        try:
+            return InstallScheduler(program_list, self.programs_db)
+        except SchedulerError as e:
+            self.log_callback(f"⚠️ {e} - dépendances ignorées", "warning")
+            programs = {
+                name: {k: v for k, v in self.programs_db.get(name, {}).items() if k != 'depends_on'}
+                for name in program_list
+            }
+            return InstallScheduler(program_list, programs, include_dependencies=False)
+
+    def _install_task(self, program_name, prepared):
+        """
+        Installation d'un programme déjà préparé (exécutée dans un worker).
+
+        Returns:
+            tuple: (success, error_reason, method)
+        """
+        program_info = self.programs_db.get(program_name, {})
+        success, error_reason, method = self._install_prepared(program_name, prepared)
+        if not success:
+            method = self._attempted_methods(program_info, prepared)
+        return success, error_reason, method
+
+    @contextmanager
+    def cancellation_scope(self, token):
+        """Attache un jeton d'annulation au thread courant (téléchargements, processus)"""
+        previous = getattr(self._cancel_scope, 'token', None)
+        self._cancel_scope.token = token
+        try:
+            yield token
+        finally:
+            self._cancel_scope.token = previous
+
+    def _current_token(self):
+        """Jeton d'annulation de l'étape en cours dans ce thread (ou None)"""
+        return getattr(self._cancel_scope, 'token', None)
+
+    def resume_session(self, progress_callback, completion_callback=None, success_list=None, failed_list=None):
+        """
+        Reprend la dernière session interrompue du journal: les programmes déjà
+        installés sont ignorés et les installateurs déjà téléchargés sont
+        réutilisés s'ils sont intacts (empreinte SHA-256 identique).
+
+        Returns:
+            bool: True si une session a été reprise
+        """
+        session = self.get_pending_session()
+        if session is None:
+            self.log_callback("ℹ️ Aucune session d'installation à reprendre", "info")
+            return False
+
+        completed = session.completed()
+        remaining = session.remaining()
+        self.log_callback(
+            f"♻️ Reprise de la session {session.session_id}: "
+            f"{len(completed)} déjà installé(s), {len(remaining)} restant(s)", "info"
+        )
+        if success_list is not None:
+            for program_name in completed:
+                success_list.append({
+                    'name': program_name,
+                    'category': self.programs_db.get(program_name, {}).get('category', 'N/A'),
+                    'method': session.records[program_name].get('method') or 'Unknown'
+                })
+
+        self._resume_downloads = {
+            name: record for name, record in session.downloads.items() if name in remaining
+        }
+        try:
+            self.install_programs(remaining, progress_callback, completion_callback,
+                                  success_list, failed_list, resume_session_id=session.session_id)
+        finally:
+            self._resume_downloads = {}
+        return True
+
+    def get_pending_session(self):
+        """Dernière session interrompue (install_journal.SessionState) ou None"""
+        if not self.journal:
+            return None
+        try:
+            return self.journal.pending_session()
+        except Exception as e:
+            self.logger.warning(f"Lecture du journal d'installation impossible: {e}")
+            return None
+
+    def _journal_start(self, program_list, resume_session_id=None):
+        """Ouvre une session du journal (ou poursuit une session reprise)"""
+        self._journal_session = resume_session_id
+        if self.journal and not resume_session_id:
+            try:
+                self._journal_session = self.journal.start_session(program_list)
+            except Exception as e:
+                self.logger.warning(f"Journal d'installation indisponible: {e}")
+
+    def _journal_record(self, program_name, state, **details):
+        """Enregistre l'état d'un programme dans la session en cours"""
+        if self.journal and self._journal_session:
+            try:
+                self.journal.record(self._journal_session, program_name, state, **details)
+            except Exception as e:
+                self.logger.warning(f"Écriture du journal impossible: {e}")
+
+    def _journal_end(self, status):
+        if self.journal and self._journal_session:
+            try:
+                self.journal.end_session(self._journal_session, status)
+            except Exception as e:
+                self.logger.warning(f"Écriture du journal impossible: {e}")
+        self._journal_session = None
+
+    def _attempted_methods(self, program_info, prepared):
+        """Méthodes tentées pour un programme en échec (pour le journal)"""
+        methods = []
+        if prepared.get('status') == 'portable':
+            methods.append('Portable')
+        elif prepared.get('installer_path'):
+            methods.append('Direct')
+        if prepared.get('status') != 'portable' and program_info.get('winget_id'):
+            methods.append('WinGet')
+        return '+'.join(methods) or None
+
+    def _install_winget_batch(self, program_list, progress_callback):
+        """
+        Installe en un seul lot (`winget import`) les programmes sans URL de
+        téléchargement direct qui ne sont pas encore installés.
+
+        Returns:
+            dict: {program_name: (success, error_reason, method)} pour les programmes
+                  installés par le lot; les échecs repassent par la logique individuelle
+        """
+        session = get_winget_session()
+        if not session.available:
+            return {}
+
+        candidates = {}
+        for program_name in dict.fromkeys(program_list):
+            program_info = self.programs_db.get(program_name)
+            if (not program_info or self._is_portable_program(program_info)
+                    or program_info.get('download_url', '').strip()
+                    or not program_info.get('winget_id')
+                    or program_info.get('depends_on')):
+                continue
+            if self.is_program_installed(program_info):
+                continue
+            candidates[program_name] = program_info
+
+        if len(candidates) < 2:
+            return {}
+
+        progress_callback(0, f"Installation groupée WinGet ({len(candidates)} programmes)...")
+        admin_required = any(info.get('admin_required', True) for info in candidates.values())
+        try:
+            results = session.install_many(
+                [info['winget_id'] for info in candidates.values()],
+                runner=run_elevated if admin_required else None,
+                log_callback=self.log_callback
+            )
+        except Exception as e:
+            self.log_callback(f"⚠️ Installation groupée WinGet impossible: {e}", "warning")
+            return {}
+
+        batch_results = {}
+        for program_name, program_info in candidates.items():
+            result = results.get(program_info['winget_id'])
+            if result and result.success:
+                self.log_callback(f"✅ {program_name} installé avec succès via winget (lot).", "success")
+                batch_results[program_name] = (True, None, "WinGet")
+            elif result:
+                self.log_callback(f"⚠️ {program_name} absent du lot winget: {result.message}", "warning")
+
+        try:
+            get_inventory(refresh=True)
+        except Exception as e:
+            self.logger.warning(f"Inventaire des logiciels indisponible: {e}")
+        return batch_results
 
     def install_single_program(self, program_name):
         """
@@ -233,7 +557,152 @@ class InstallerManager:
                 - error_reason (str): Raison de l'échec si applicable, None sinon
                 - method (str): Méthode utilisée ('Direct', 'WinGet', 'Portable', 'Already Installed')
         """
+        self._refresh_programs_db()
+        return self._install_prepared(program_name, self._prepare_program(program_name))
+
+    def plan_installation(self, program_list, refresh=False):
+        """
+        Sonde en parallèle les URLs d'une sélection (sans rien télécharger)
+
+        Returns:
+            InstallPlan (taille totale, ETA, liens morts) ou None si indisponible
+        """
+        if not requests:
+            return None
+        try:
+            return get_install_planner().plan(program_list, self.programs_db, refresh=refresh)
+        except Exception as e:
+            self.logger.warning(f"Bilan avant installation indisponible: {e}")
+            return None
+
+    def _preflight(self, order):
+        """Annonce le bilan de la session et mémorise les liens morts"""
+        self._dead_urls = {}
+        plan = self.plan_installation(order)
+        if plan is None:
+            return
+        self.log_callback(f"📊 Bilan: {plan.summary()}", "info")
+        for entry in plan.dead_links:
+            self.log_callback(f"🔗 Lien mort pour {entry.name} ({entry.error}): {entry.url}", "warning")
+        # Avec un miroir, le fichier peut être disponible même si l'origine ne répond plus
+        if not self.mirror.enabled:
+            self._dead_urls = {entry.url: entry for entry in plan.dead_links}
+
+    def _is_portable_program(self, program_info):
+        """Indique si le programme est une application portable."""
+        return program_info.get('portable', False) or program_info.get('install_args', '') == 'portable'
+
+    def _prepare_program(self, program_name):
+        """
+        Étape téléchargement du pipeline: vérifie l'installation existante et
+        télécharge l'installateur si nécessaire. Peut s'exécuter dans un worker.
+
+        Returns:
+            dict: {'status': 'unknown'|'portable'|'installed'|'download',
+                   'installer_path': str|None, 'sha256': str|None,
+                   'claim': chemin réservé jusqu'à la fin de _install_prepared, ou None}
+        """
         if program_name not in self.programs_db:
+            return {'status': 'unknown', 'installer_path': None, 'sha256': None}
+
+        program_info = self.programs_db[program_name]
+
+        download_url = program_info.get('download_url', '').strip()
+        dead = self._dead_urls.get(download_url) if download_url else None
+        # Lien mort d'après le bilan: pas de téléchargement (ni de nouvelles tentatives)
+        dead_error = f"Lien mort ({dead.error or f'HTTP {dead.status_code}'})" if dead else None
+
+        if self._is_portable_program(program_info):
+            if dead:
+                self.log_callback(f"❌ {dead_error}, {program_name} ignoré: {download_url}", "error")
+                return {'status': 'portable', 'installer_path': None, 'sha256': None, 'error': dead_error}
+            installer_path, sha256, claim = self._fetch_installer(program_name, program_info)
+            return {'status': 'portable', 'installer_path': installer_path, 'sha256': sha256, 'claim': claim}
+
+        if self.is_program_installed(program_info):
+            return {'status': 'installed', 'installer_path': None, 'sha256': None}
+
+        installer_path, sha256, claim = None, None, None
+        if dead and program_info.get('winget_id'):
+            self.log_callback(f"⏭️ Lien mort, {program_name} sera installé via winget", "info")
+        elif dead:
+            self.log_callback(f"❌ {dead_error}, aucune alternative pour {program_name}: {download_url}", "error")
+            return {'status': 'download', 'installer_path': None, 'sha256': None, 'error': dead_error}
+        elif download_url:
+            installer_path, sha256, claim = self._fetch_installer(program_name, program_info)
+        return {'status': 'download', 'installer_path': installer_path, 'sha256': sha256, 'claim': claim}
+
+    def _fetch_installer(self, program_name, program_info):
+        """
+        Télécharge l'installateur d'un programme et l'inscrit au journal, ou
+        réutilise celui d'une session reprise s'il est intact.
+
+        L'empreinte est calculée pendant le téléchargement; si le catalogue
+        fournit un champ 'sha256', elle est vérifiée avant la livraison du fichier.
+        Le chemin reste réservé jusqu'à l'installation (_install_prepared): un
+        programme préchargé portant le même nom de fichier ne peut pas le remplacer.
+
+        Returns:
+            tuple: (chemin de l'installateur ou None, SHA-256 ou None, chemin réservé ou None)
+        """
+        catalog_sha256 = (program_info.get('sha256') or '').lower() or None
+        previous = self._resume_downloads.get(program_name)
+        if previous:
+            path = previous.get('installer_path')
+            expected = previous.get('sha256')
+            try:
+                if (path and expected and (catalog_sha256 is None or expected == catalog_sha256)
+                        and os.path.exists(path) and self._claim_existing_path(Path(path))):
+                    if hash_file(path) == expected:
+                        self.log_callback(f"♻️ Installateur déjà téléchargé réutilisé: {Path(path).name}", "info")
+                        self._journal_record(program_name, install_journal.STATE_HASH_VERIFIED,
+                                             installer_path=path, sha256=expected)
+                        return path, expected, Path(path)
+                    self._release_download_path(Path(path))
+            except OSError:
+                self._release_download_path(Path(path))
+
+        download_url = program_info.get('download_url', '')
+        file_path = self._claim_download_path(program_info, self._download_filename(program_info, download_url))
+        started = time.monotonic()
+        try:
+            result = self._download_program_result(program_info, file_path=file_path)
+        except BaseException:
+            self._release_download_path(file_path)
+            raise
+        if result is None:
+            self._release_download_path(file_path)
+            return None, None, None
+        if not result.from_cache:
+            # Débit réel, utilisé pour l'ETA des prochains bilans
+            get_install_planner().record_transfer(result.size, time.monotonic() - started)
+        state = install_journal.STATE_HASH_VERIFIED if catalog_sha256 else install_journal.STATE_DOWNLOADED
+        self._journal_record(program_name, state, installer_path=str(result.path), sha256=result.sha256)
+        return str(result.path), result.sha256, file_path
+
+    def _install_prepared(self, program_name, prepared):
+        """
+        Étape installation du pipeline: exécute l'installateur préparé,
+        puis bascule sur winget en cas d'échec.
+
+        Returns:
+            tuple: (success, error_reason, method) comme install_single_program
+        """
+        try:
+            return self._run_prepared(program_name, prepared)
+        finally:
+            # L'installateur a été exécuté: son chemin peut être réutilisé
+            self._release_prepared(prepared)
+
+    def _release_prepared(self, prepared):
+        """Libère le chemin réservé par _prepare_program (sans effet s'il l'est déjà)"""
+        if prepared and prepared.get('claim') is not None:
+            self._release_download_path(prepared['claim'])
+
+    def _run_prepared(self, program_name, prepared):
+        """Corps de _install_prepared (stratégies direct, portable, winget)"""
+        status = prepared.get('status')
+        if status == 'unknown' or program_name not in self.programs_db:
             self.log_callback(f"Programme '{program_name}' non trouvé.", "error")
             return False, "Programme non trouvé dans la base de données", None
 
@@ -241,37 +710,34 @@ class InstallerManager:
         self.log_callback(f"Début de l'installation de {program_name}", "info")
         self.log_callback(f"📋 Config: portable={program_info.get('portable', False)}, install_args={program_info.get('install_args', '')}, winget_id={program_info.get('winget_id', 'None')}, download_url={program_info.get('download_url', 'None')}", "info")
 
+        installer_path = prepared.get('installer_path')
+        installer_sha256 = prepared.get('sha256')
+
         # LOGIQUE CORRIGÉE POUR LES PORTABLES
-        is_portable = program_info.get('portable', False)
-        install_args = program_info.get('install_args', '')
-        if is_portable or install_args == 'portable':
+        if status == 'portable':
             self.log_callback(f"🌀 Traitement de l'application portable: {program_name}", "info")
-            installer_path = self._download_program(program_info)
             if installer_path:
-                success = self.execute_installation(installer_path, program_info)
+                success = self.execute_installation(installer_path, program_info, sha256=installer_sha256)
                 if success:
                     return True, None, "Portable"
                 else:
                     return False, "Échec de l'exécution de l'installateur portable", None
             else:
                 self.log_callback(f"❌ Échec du téléchargement pour l'application portable {program_name}", "error")
-                return False, "Échec du téléchargement", None
+                return False, prepared.get('error') or "Échec du téléchargement", None
 
         # Logique pour les programmes non-portables
-        if self.is_program_installed(program_info):
+        if status == 'installed':
             self.log_callback(f"{program_name} est déjà installé.", "info")
             return True, None, "Already Installed"
 
         # Stratégie 1: Téléchargement direct
-        download_url = program_info.get('download_url', '').strip()
-        if download_url:
+        if installer_path:
             self.log_callback("🔄 Tentative via téléchargement direct...", "info")
-            installer_path = self._download_program(program_info)
-            if installer_path:
-                if self.execute_installation(installer_path, program_info):
-                    self.log_callback(f"✅ {program_name} installé avec succès via téléchargement direct.", "success")
-                    return True, None, "Direct"
-                self.log_callback("⚠️ Échec de l'installation après téléchargement.", "warning")
+            if self.execute_installation(installer_path, program_info):
+                self.log_callback(f"✅ {program_name} installé avec succès via téléchargement direct.", "success")
+                return True, None, "Direct"
+            self.log_callback("⚠️ Échec de l'installation après téléchargement.", "warning")
 
         # Stratégie 2: Winget (en fallback)
         winget_id = program_info.get('winget_id')
@@ -293,6 +759,8 @@ class InstallerManager:
                         return True, None, "WinGet (Fallback)"
                     self.log_callback(f"⚠️ Échec avec ID alternatif {fallback_id}.", "warning")
 
+        if prepared.get('error'):
+            return False, prepared['error'], None
         self.log_callback(f"❌ Échec de toutes les méthodes d'installation pour {program_name}", "error")
         return False, "Toutes les méthodes d'installation ont échoué", None
 
@@ -307,6 +775,17 @@ class InstallerManager:
         Returns:
             str: Chemin du fichier téléchargé ou None si échec
         """
+        result = self._download_program_result(program_info, max_retries)
+        return str(result.path) if result else None
+
+    def _download_program_result(self, program_info, max_retries=3, file_path=None):
+        """
+        Comme _download_program, mais retourne le DownloadResult (chemin, SHA-256, taille)
+
+        Args:
+            file_path: Chemin déjà réservé par l'appelant (qui le libère lui-même);
+                       sinon un chemin est réservé le temps du téléchargement
+        """
         if not requests:
             self.log_callback("Le module 'requests' est manquant.", "error")
             return None
@@ -316,56 +795,77 @@ class InstallerManager:
             self.log_callback("URL de téléchargement manquante", "error")
             return None
 
+        if file_path is not None:
+            return self._download_to_path(download_url, file_path, program_info, max_retries)
+
+        file_path = self._claim_download_path(program_info, self._download_filename(program_info, download_url))
+        try:
+            return self._download_to_path(download_url, file_path, program_info, max_retries)
+        finally:
+            self._release_download_path(file_path)
+
+    @staticmethod
+    def _download_filename(program_info, download_url):
+        """Nom du fichier téléchargé (champ 'filename' ou fin de l'URL)"""
         filename = program_info.get('filename', os.path.basename(urlparse(download_url).path))
         if not filename:
             filename = f"download_{int(time.time())}"
+        return filename
 
+    def _claim_existing_path(self, file_path):
+        """Réserve un fichier déjà présent (reprise de session); False s'il est déjà réservé"""
+        with self._active_downloads_lock:
+            if file_path in self._active_downloads:
+                return False
+            self._active_downloads.add(file_path)
+            return True
+
+    def _release_download_path(self, file_path):
+        with self._active_downloads_lock:
+            self._active_downloads.discard(file_path)
+
+    def _claim_download_path(self, program_info, filename):
+        """
+        Réserve le chemin de destination d'un téléchargement.
+        Si deux programmes partagent le même nom de fichier (ex: setup.exe),
+        le second est placé dans un sous-dossier portant le nom du programme.
+        """
         file_path = self.download_dir / filename
+        with self._active_downloads_lock:
+            if file_path in self._active_downloads:
+                safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in program_info.get('name', 'program'))
+                file_path = self.download_dir / safe_name / filename
+                suffix = 2
+                while file_path in self._active_downloads:
+                    file_path = self.download_dir / f"{safe_name}_{suffix}" / filename
+                    suffix += 1
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+            self._active_downloads.add(file_path)
+        return file_path
 
-        # Retry avec backoff exponentiel
-        for attempt in range(1, max_retries + 1):
-            try:
-                if attempt > 1:
-                    delay = 2 ** (attempt - 1)  # 2s, 4s, 8s
-                    self.log_callback(f"⏳ Nouvelle tentative dans {delay}s... (tentative {attempt}/{max_retries})", "info")
-                    time.sleep(delay)
-
-                self.log_callback(f"📥 Téléchargement de {filename}... (tentative {attempt}/{max_retries})", "info")
-                timeout = program_info.get('download_timeout', 60)  # 60s par défaut
-                response = requests.get(download_url, stream=True, timeout=timeout)
-                response.raise_for_status()
-
-                # Téléchargement avec progression
-                with open(file_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:  # Filtrer les chunks vides
-                            f.write(chunk)
-
-                self.log_callback(f"✅ Téléchargement terminé: {file_path}", "success")
-                return str(file_path)
-
-            except requests.exceptions.Timeout as e:
-                self.log_callback(f"⏱️ Timeout lors du téléchargement (tentative {attempt}/{max_retries}): {e}", "warning")
-            except requests.exceptions.ConnectionError as e:
-                self.log_callback(f"🔌 Erreur de connexion (tentative {attempt}/{max_retries}): {e}", "warning")
-            except requests.exceptions.RequestException as e:
-                self.log_callback(f"⚠️ Erreur réseau (tentative {attempt}/{max_retries}): {e}", "warning")
-            except Exception as e:
-                self.log_callback(f"❌ Erreur inattendue lors du téléchargement: {e}", "error")
-                self.logger.exception(e)
-                return None
+    def _download_to_path(self, download_url, file_path, program_info, max_retries):
+        """Télécharge download_url vers file_path (miroir, reprise, segments, cache) avec retry.
 
-        # Toutes les tentatives ont échoué
-        self.log_callback(f"❌ Échec du téléchargement après {max_retries} tentatives", "error")
-        return None
+        Returns:
+            DownloadResult ou None si échec
+        """
+        timeout = program_info.get('download_timeout', 60)  # 60s par défaut
+        cancel_token = self._current_token()
+        if self.mirror.enabled:
+            return self.mirror.download(program_info, file_path, max_retries=max_retries, timeout=timeout,
+                                        cancel_token=cancel_token)
+        return self.downloader.download(download_url, file_path, max_retries=max_retries, timeout=timeout,
+                                        expected_sha256=program_info.get('sha256') or None,
+                                        cancel_token=cancel_token)
 
-    def execute_installation(self, installer_path, program_info):
+    def execute_installation(self, installer_path, program_info, sha256=None):
         """
         Exécute l'installation ou la copie du programme.
         
         Args:
             installer_path: Chemin vers l'installateur
             program_info: Informations du programme
+            sha256: Empreinte déjà calculée au téléchargement (évite de relire le fichier)
             
         Returns:
             bool: True si l'installation a réussi
@@ -398,7 +898,8 @@ class InstallerManager:
                         admin_required=program_info.get('admin_required', False),
                         notes=program_info.get('note', ''),
                         essential=program_info.get('essential', False),
-                        winget_id=program_info.get('winget_id', '')
+                        winget_id=program_info.get('winget_id', ''),
+                        file_hash=sha256
                     )
                     if app_id:
                         self.log_callback(f"💾 Application ajoutée à la base de données (ID: {app_id})", "info")
@@ -444,6 +945,11 @@ class InstallerManager:
                 return True
             self.log_callback("⚠️ Échec sans privilèges admin, tentative avec élévation...", "warning")
         
+        # Courtier d'élévation: une seule invite UAC pour toute la session
+        brokered = self._execute_command_brokered(base_cmd, timeout)
+        if brokered is not None:
+            return brokered
+        
         # Méthode 1: PowerShell avec élévation
         self.log_callback("🔐 Exécution avec privilèges administrateur (PowerShell)...")
         success = self._execute_command_elevated_ps(base_cmd, timeout)
@@ -471,43 +977,79 @@ class InstallerManager:
             env['WINGET_DISABLE_INTERACTIVITY'] = '1'
             env['NITRITE_INSTALLATION'] = '1'
             
-            self.current_process = subprocess.Popen(
+            runner = ProcessRunner(progress_callback=self.progress_event_callback)
+            result = runner.run(
                 cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                startupinfo=startup_info,
+                timeout=timeout,
                 env=env,
-                creationflags=subprocess.CREATE_NO_WINDOW | subprocess.DETACHED_PROCESS
+                startupinfo=startup_info,
+                creationflags=subprocess.CREATE_NO_WINDOW | subprocess.DETACHED_PROCESS,
+                on_start=self._track_process
             )
             
-            stdout, stderr = self.current_process.communicate(timeout=timeout)
-            return_code = self.current_process.returncode
+            if result.timed_out:
+                self.log_callback("⏱️ Timeout installation (mode normal)", "warning")
+                return False
             
-            if return_code == 0:
+            if result.returncode == 0:
                 self.log_callback("✅ Installation réussie (mode normal)", "success")
                 return True
             else:
-                error_msg = stderr.decode('utf-8', errors='ignore')
+                error_msg = result.stderr
                 if "access denied" in error_msg.lower() or "privilège" in error_msg.lower():
                     self.log_callback("⚠️ Privilèges insuffisants", "warning")
                 else:
-                    self.log_callback(f"❌ Erreur (code {return_code}): {error_msg[:200]}", "error")
+                    self.log_callback(f"❌ Erreur (code {result.returncode}): {error_msg[:200]}", "error")
                 return False
                 
-        except subprocess.TimeoutExpired:
-            self.log_callback("⏱️ Timeout installation (mode normal)", "warning")
-            try:
-                self.current_process.terminate()
-                time.sleep(2)
-                if self.current_process.poll() is None:
-                    self.current_process.kill()
-            except Exception:
-                pass
-            return False
         except Exception as e:
             self.log_callback(f"❌ Erreur exécution normale: {e}", "error")
             return False
     
+    def _track_process(self, process):
+        """Enregistre un processus d'installation (arrêté par stop_installation ou son jeton)"""
+        self.current_process = process
+        with self._active_processes_lock:
+            self._active_processes = {p for p in self._active_processes if p.poll() is None}
+            self._active_processes.add(process)
+        token = self._current_token()
+        if token is not None:
+            token.add_callback(lambda: self._kill_process(process))
+
+    def _kill_process(self, process):
+        try:
+            kill_process_tree(process)
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'arrêt du processus: {e}")
+
+    def _execute_command_brokered(self, cmd, timeout):
+        """
+        Exécute une commande via le courtier d'élévation de la session.
+
+        Returns:
+            bool si la commande a été exécutée par le courtier, None s'il est
+            indisponible (les méthodes d'élévation par commande prennent le relais)
+        """
+        if is_admin():
+            return None
+        broker = get_elevation_broker()
+        if not broker.ensure_started():
+            return None
+        self.log_callback("🔐 Exécution avec privilèges administrateur (courtier de session)...")
+        runner = ProcessRunner(progress_callback=self.progress_event_callback)
+        try:
+            # L'annulation ne vise que cette commande (pas celle d'un autre programme)
+            success, returncode, stdout, stderr = broker.run(cmd, timeout, output_callback=runner.feed,
+                                                             cancel_token=self._current_token())
+        except BrokerError as e:
+            self.log_callback(f"⚠️ {e}", "warning")
+            return None
+        if success:
+            self.log_callback("✅ Installation réussie (élévation de session)", "success")
+            return True
+        self.log_callback(f"❌ Erreur (code {returncode}): {(stderr or stdout)[:200]}", "error")
+        return False
+
     def _execute_command_elevated_ps(self, cmd, timeout):
         """Exécute une commande avec privilèges administrateur via PowerShell et élévation automatique"""
         try:
@@ -703,22 +1245,11 @@ class InstallerManager:
             return False
     
     def check_winget_installation(self, winget_id):
-        """Vérifie l'installation via winget list"""
+        """Vérifie l'installation via l'instantané `winget list` partagé"""
         try:
-            result = subprocess.run(
-                ['winget', 'list', '--id', winget_id],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            
-            if result.returncode == 0:
-                # Vérifier si le programme est vraiment dans la liste
-                output = result.stdout.lower()
-                return winget_id.lower() in output and "no installed package found" not in output
-                
-        except (subprocess.TimeoutExpired, FileNotFoundError, Exception) as e:
+            inventory = get_inventory()
+            return inventory.winget_available and inventory.has_winget_id(winget_id)
+        except Exception as e:
             self.logger.debug(f"Erreur vérification winget pour {winget_id}: {e}")
         
         return False
@@ -730,34 +1261,13 @@ class InstallerManager:
             if not program_name:
                 return False
             
-            # Nettoyer le nom du programme pour la recherche
-            clean_name = program_name.replace(' ', '').replace('-', '').replace('_', '').lower()
-            
-            # Dossiers à vérifier
-            search_paths = [
-                Path("C:/Program Files"),
-                Path("C:/Program Files (x86)"),
-                Path(os.path.expanduser("~/AppData/Local")),
-                Path(os.path.expanduser("~/AppData/Roaming")),
-                Path("C:/Users/Public/Desktop"),
-                Path(os.path.expanduser("~/Desktop"))
-            ]
-            
-            for search_path in search_paths:
-                if not search_path.exists():
-                    continue
-                
+            # Rechercher des dossiers contenant le nom du programme
+            for entry in get_inventory().find_by_name(program_name, sources=('folder',)):
                 try:
-                    # Rechercher des dossiers contenant le nom du programme
-                    for item in search_path.iterdir():
-                        if item.is_dir():
-                            item_name = item.name.replace(' ', '').replace('-', '').replace('_', '').lower()
-                            if clean_name in item_name or item_name in clean_name:
-                                # Vérifier s'il y a des exécutables
-                                exe_files = list(item.glob("*.exe"))
-                                if exe_files:
-                                    self.logger.debug(f"Programme trouvé dans: {item}")
-                                    return True
+                    # Vérifier s'il y a des exécutables
+                    if next(Path(entry.location).glob("*.exe"), None):
+                        self.logger.debug(f"Programme trouvé dans: {entry.location}")
+                        return True
                 except (PermissionError, OSError):
                     continue  # Ignorer les erreurs d'accès
             
@@ -770,48 +1280,11 @@ class InstallerManager:
     def check_installed_programs_registry(self, program_info):
         """Vérifie le registre des programmes installés Windows"""
         try:
-            if not winreg:
-                return False
-            
             program_name = program_info.get('name', '')
             if not program_name:
                 return False
             
-            # Clés de registre à vérifier
-            registry_paths = [
-                (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-                (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
-                (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall")
-            ]
-            
-            clean_program_name = program_name.lower().replace(' ', '').replace('-', '')
-            
-            for hkey, path in registry_paths:
-                try:
-                    with winreg.OpenKey(hkey, path) as key:
-                        i = 0
-                        while True:
-                            try:
-                                subkey_name = winreg.EnumKey(key, i)
-                                with winreg.OpenKey(key, subkey_name) as subkey:
-                                    try:
-                                        display_name, _ = winreg.QueryValueEx(subkey, "DisplayName")
-                                        clean_display_name = display_name.lower().replace(' ', '').replace('-', '')
-                                        
-                                        if (clean_program_name in clean_display_name or 
-                                            clean_display_name in clean_program_name):
-                                            return True
-                                            
-                                    except FileNotFoundError:
-                                        pass  # DisplayName n'existe pas
-                                i += 1
-                            except OSError:
-                                break  # Plus de sous-clés
-                                
-                except (OSError, WindowsError):
-                    continue  # Erreur d'accès à cette clé
-            
-            return False
+            return bool(get_inventory().find_by_name(program_name, sources=('registry',)))
             
         except Exception as e:
             self.logger.debug(f"Erreur vérification registre programmes: {e}")
@@ -860,17 +1333,20 @@ class InstallerManager:
             self.log_callback(f"📦 Installation via winget: {winget_id}", "info")
             
             # Construire la commande winget
-            cmd = ['winget', 'install', '--id', winget_id, '--silent', '--accept-package-agreements', '--accept-source-agreements']
+            winget_exe = get_winget_session().executable or 'winget'
+            cmd = [winget_exe, 'install', '--id', winget_id, '--silent', '--accept-package-agreements', '--accept-source-agreements']
             self.log_callback(f"🔧 Commande WinGet: {' '.join(cmd)}", "info")
             
             # Vérifier si admin requis
             admin_required = program_info.get('admin_required', True)
             
             if admin_required:
-                # Exécuter avec privilèges admin
-                success, returncode, stdout, stderr = run_as_admin_silent(cmd, timeout=300)
+                # Exécuter avec privilèges admin (courtier d'élévation de la session)
+                runner = ProcessRunner(progress_callback=self.progress_event_callback)
+                success, returncode, stdout, stderr = run_elevated(cmd, timeout=300, output_callback=runner.feed)
                 
                 if success or returncode == 0:
+                    get_winget_session().invalidate()
                     self.log_callback(f"✅ {program_info['name']} installé via winget", "success")
                     return True
                 else:
@@ -880,15 +1356,13 @@ class InstallerManager:
                     return False
             else:
                 # Exécuter sans privilèges admin
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=300,
-                    creationflags=subprocess.CREATE_NO_WINDOW
-                )
+                runner = ProcessRunner(progress_callback=self.progress_event_callback)
+                result = runner.run(cmd, timeout=300, on_start=self._track_process)
+                if result.timed_out:
+                    raise subprocess.TimeoutExpired(cmd, 300)
                 
                 if result.returncode == 0:
+                    get_winget_session().invalidate()
                     self.log_callback(f"✅ {program_info['name']} installé via winget", "success")
                     return True
                 else:
@@ -918,8 +1392,13 @@ class InstallerManager:
         try:
             self.log_callback(f"🍫 Installation via Chocolatey: {choco_id}", "info")
 
+            choco_exe = get_tool_discovery().executable('choco')
+            if not choco_exe:
+                self.log_callback("⚠️ Chocolatey non disponible: introuvable dans le PATH", "warning")
+                return False
+
             # Construire la commande chocolatey
-            cmd = ['choco', 'install', choco_id, '-y', '--no-progress', '--ignore-checksums']
+            cmd = [choco_exe, 'install', choco_id, '-y', '--no-progress', '--ignore-checksums']
             self.log_callback(f"🔧 Commande Chocolatey: {' '.join(cmd)}", "info")
 
             # Chocolatey nécessite toujours des privilèges admin
@@ -953,37 +1432,59 @@ class InstallerManager:
             bool: True si le hash correspond
         """
         try:
-            sha256_hash = hashlib.sha256()
-            with open(file_path, "rb") as f:
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(byte_block)
-            
-            calculated_hash = sha256_hash.hexdigest()
-            return calculated_hash.lower() == expected_hash.lower()
+            return hash_file(file_path) == expected_hash.lower()
             
         except Exception as e:
             self.logger.error(f"Erreur lors de la vérification du hash: {e}")
             return False
     
     def stop_installation(self):
-        """Arrête l'installation en cours"""
+        """Arrête l'installation en cours (retour immédiat)"""
         self.stop_requested = True
+        # Annule la session: téléchargements interrompus, processus tués, courtier annulé
+        engine = self._engine
+        if engine is not None:
+            engine.cancel()
+        with self._active_processes_lock:
+            processes = set(self._active_processes)
+            self._active_processes.clear()
         if self.current_process:
+            processes.add(self.current_process)
+        for process in processes:
             try:
-                self.current_process.terminate()
-                time.sleep(2)
-                if self.current_process.poll() is None:
-                    self.current_process.kill()
+                process.terminate()
             except Exception as e:
                 self.logger.error(f"Erreur lors de l'arrêt du processus: {e}")
+        if processes:
+            # Forcer l'arrêt des récalcitrants sans bloquer l'appelant
+            timer = threading.Timer(2, lambda: [self._kill_process(p) for p in processes])
+            timer.daemon = True
+            timer.start()
+        # Interrompre la commande en cours dans l'auxiliaire élevé
+        get_elevation_broker().cancel()
         
         self.logger.info("Arrêt de l'installation demandé")
     
     def get_download_size(self, url):
         """Obtient la taille d'un fichier à télécharger"""
         try:
-            response = requests.head(url, timeout=10)
+            response = get_http_client().head(url, timeout=10, allow_redirects=True)
             return int(response.headers.get('content-length', 0))
         except Exception as e:
             self.logger.warning(f"Impossible d'obtenir la taille du fichier: {e}")
-            return 0
\ No newline at end of file
+            return 0
+
+    def get_download_sizes(self, urls):
+        """
+        Obtient la taille de plusieurs fichiers (requêtes HEAD en parallèle)
+
+        Returns:
+            dict: {url: taille en octets, 0 si inconnue}
+        """
+        sizes = {}
+        for url, response in get_http_client().head_many(urls, timeout=10).items():
+            try:
+                sizes[url] = int(response.headers.get('content-length', 0)) if response is not None else 0
+            except ValueError:
+                sizes[url] = 0
+        return sizes
\ No newline at end of file
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Miroir local des installateurs (déploiement hors ligne d'un parc)
+
+Un miroir est un dossier portable (clé USB, partage réseau) contenant:
+    manifest.json                     programme -> fichier, URL d'origine, SHA-256, taille
+    files/<sha256>/<nom du fichier>   installateurs
+
+Les téléchargements sont résolus dans l'ordre: miroir local -> miroir HTTP
+du réseau local (le même dossier servi par `serve`) -> URL d'origine.
+
+Ligne de commande:
+    python mirror_repository.py prefetch --dest D:\\mirror --profile "Bureau Professionnel"
+    python mirror_repository.py prefetch --dest D:\\mirror --programs "7-Zip" "VLC Media Player"
+    python mirror_repository.py serve --dir D:\\mirror --port 8080
+    python mirror_repository.py list --dir D:\\mirror
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+from urllib.parse import quote, urlparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+try:
+    from .download_manager import ChunkedDownloader, DownloadResult, DEFAULT_BUFFER_SIZE
+    from .portable_paths import get_executable_dir
+except ImportError:
+    from download_manager import ChunkedDownloader, DownloadResult, DEFAULT_BUFFER_SIZE
+    from portable_paths import get_executable_dir
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# Délai avant de retenter un miroir réseau injoignable (secondes)
+REMOTE_RETRY_DELAY = 60
+
+
+def default_mirror_dir() -> Path:
+    """Dossier 'mirror' à côté de l'exe (utilisé s'il contient un manifeste)"""
+    return get_executable_dir() / 'mirror'
+
+
+def load_catalog(catalog_path) -> Dict[str, Dict]:
+    """Charge programs.json et l'aplatit en {nom: infos} (comme InstallerManager)"""
+    with open(catalog_path, 'r', encoding='utf-8') as f:
+        categorized_programs = json.load(f)
+    programs = {}
+    for category, entries in categorized_programs.items():
+        if isinstance(entries, dict):
+            for name, info in entries.items():
+                if isinstance(info, dict):
+                    programs[name] = dict(info, category=category, name=name)
+    return programs
+
+
+def copy_with_hash(source, dest_path, buffer_size=DEFAULT_BUFFER_SIZE) -> str:
+    """Copie un fichier en calculant son SHA-256 au passage (une seule lecture)"""
+    sha256_hash = hashlib.sha256()
+    with open(source, 'rb') as src, open(dest_path, 'wb') as dst:
+        for block in iter(lambda: src.read(buffer_size), b''):
+            sha256_hash.update(block)
+            dst.write(block)
+    return sha256_hash.hexdigest()
+
+
+class LocalMirror:
+    """Miroir sur disque (dossier local ou partage réseau monté)"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.manifest_path = self.root / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # Un seul fichier .tmp écrit à la fois
+        self._entries = self._load_manifest()
+
+    @property
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        try:
+            if self.manifest_path.exists():
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    return json.load(f).get('programs', {})
+        except Exception as e:
+            logger.warning(f"⚠️ Manifeste du miroir illisible ({self.manifest_path}): {e}")
+        return {}
+
+    def save(self):
+        """Écrit le manifeste (écriture atomique)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._save_lock:
+            with self._lock:
+                data = {
+                    'version': MANIFEST_VERSION,
+                    'updated': datetime.now().isoformat(timespec='seconds'),
+                    'programs': dict(sorted(self._entries.items()))
+                }
+            tmp_path = self.manifest_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+
+    def entries(self) -> Dict[str, Dict]:
+        with self._lock:
+            return dict(self._entries)
+
+    def entry(self, program_name: str) -> Optional[Dict]:
+        with self._lock:
+            return self._entries.get(program_name)
+
+    def file_path(self, entry: Dict) -> Path:
+        return self.root / entry['path']
+
+    def has(self, program_name: str, program_info: Optional[Dict] = None) -> bool:
+        """Fichier présent, de la bonne taille et à jour par rapport au catalogue"""
+        entry = self.entry(program_name)
+        if not entry:
+            return False
+        if program_info:
+            if program_info.get('download_url', '').strip() not in ('', entry.get('url')):
+                return False
+            expected = (program_info.get('sha256') or '').lower()
+            if expected and expected != entry.get('sha256'):
+                return False
+        path = self.file_path(entry)
+        return path.exists() and path.stat().st_size == entry.get('size', -1)
+
+    def add(self, program_name: str, program_info: Dict, source_path, sha256: str) -> Dict:
+        """Range un fichier téléchargé dans le miroir (déplacement) et l'inscrit au manifeste"""
+        source_path = Path(source_path)
+        relative = Path('files') / sha256 / source_path.name
+        target = self.root / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            source_path.unlink()
+        else:
+            os.replace(source_path, target)
+        entry = {
+            'url': program_info.get('download_url', '').strip(),
+            'filename': target.name,
+            'path': relative.as_posix(),
+            'sha256': sha256,
+            'size': target.stat().st_size,
+            'fetched': datetime.now().isoformat(timespec='seconds')
+        }
+        with self._lock:
+            self._entries[program_name] = entry
+        return entry
+
+    def fetch(self, program_name: str, dest_path, expected_sha256: Optional[str] = None) -> Optional[DownloadResult]:
+        """
+        Copie l'installateur du miroir vers dest_path, empreinte vérifiée
+
+        Returns:
+            DownloadResult ou None si absent ou corrompu
+        """
+        entry = self.entry(program_name)
+        if not entry:
+            return None
+        expected = (expected_sha256 or entry.get('sha256') or '').lower()
+        if expected_sha256 and entry.get('sha256') and expected_sha256.lower() != entry['sha256']:
+            return None
+        source = self.file_path(entry)
+        if not source.exists():
+            return None
+
+        dest_path = Path(dest_path)
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dest_path.with_name(dest_path.name + '.part')
+        try:
+            sha256 = copy_with_hash(source, tmp_path)
+        except OSError as e:
+            logger.warning(f"⚠️ Lecture impossible dans le miroir ({source}): {e}")
+            return None
+        if expected and sha256 != expected:
+            tmp_path.unlink()
+            logger.warning(f"⚠️ Fichier du miroir corrompu: {source}")
+            return None
+        os.replace(tmp_path, dest_path)
+        return DownloadResult(path=str(dest_path), sha256=sha256, size=dest_path.stat().st_size, from_cache=True)
+
+
+class RemoteMirror:
+    """Miroir servi en HTTP sur le réseau local (dossier miroir exposé par `serve`)"""
+
+    def __init__(self, base_url: str, session=None, timeout: float = 5):
+        self.base_url = base_url.rstrip('/')
+        self.session = session
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._failed_at = 0.0
+
+    def _get_entries(self) -> Dict[str, Dict]:
+        """Manifeste distant, chargé une fois (un échec est mémorisé quelques instants)"""
+        with self._lock:
+            if self._entries is not None:
+                return self._entries
+            if time.monotonic() - self._failed_at < REMOTE_RETRY_DELAY:
+                return {}
+            try:
+                getter = self.session.get if self.session else requests.get
+                response = getter(f"{self.base_url}/{MANIFEST_NAME}", timeout=self.timeout)
+                response.raise_for_status()
+                self._entries = response.json().get('programs', {})
+                return self._entries
+            except Exception as e:
+                logger.warning(f"⚠️ Miroir réseau injoignable ({self.base_url}): {e}")
+                self._failed_at = time.monotonic()
+                return {}
+
+    def entry(self, program_name: str) -> Optional[Dict]:
+        return self._get_entries().get(program_name)
+
+    def url_for(self, entry: Dict) -> str:
+        return f"{self.base_url}/{quote(entry['path'])}"
+
+
+class MirrorResolver:
+    """Résolution des téléchargements: miroir local -> miroir réseau -> origine"""
+
+    def __init__(self, downloader: ChunkedDownloader, local_dir=None, remote_url: str = '',
+                 log_callback: Optional[Callable[[str, str], None]] = None):
+        """
+        Args:
+            downloader: Téléchargeur utilisé pour le miroir réseau et l'origine
+            local_dir: Dossier miroir (None = dossier 'mirror' à côté de l'exe s'il existe)
+            remote_url: URL du miroir réseau (ex: http://serveur:8080), vide = désactivé
+        """
+        self.downloader = downloader
+        self.log_callback = log_callback or (lambda msg, level="info": logger.info(msg))
+        local = LocalMirror(local_dir or default_mirror_dir())
+        self.local = local if local.exists else None
+        self.remote = RemoteMirror(remote_url, session=getattr(downloader, 'session', None)) if remote_url else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.local is not None or self.remote is not None
+
+    def download(self, program_info: Dict, dest_path, max_retries: int = 3, timeout: int = 60,
+                 cancel_token=None) -> Optional[DownloadResult]:
+        """
+        Télécharge l'installateur d'un programme depuis la meilleure source
+
+        Args:
+            cancel_token: Jeton d'annulation transmis au téléchargeur
+
+        Returns:
+            DownloadResult ou None si toutes les sources ont échoué
+        """
+        program_name = program_info.get('name', '')
+        expected = (program_info.get('sha256') or '').lower() or None
+
+        if self.local is not None and program_name:
+            result = self.local.fetch(program_name, dest_path, expected)
+            if result:
+                self.log_callback(f"💽 {program_name}: installateur copié depuis le miroir local", "info")
+                return result
+
+        if self.remote is not None and program_name:
+            entry = self.remote.entry(program_name)
+            if entry and (expected is None or entry.get('sha256') == expected):
+                self.log_callback(f"🌐 {program_name}: téléchargement depuis le miroir réseau", "info")
+                result = self.downloader.download(
+                    self.remote.url_for(entry), dest_path, max_retries=max_retries, timeout=timeout,
+                    expected_sha256=entry.get('sha256') or expected, cancel_token=cancel_token
+                )
+                if result or (cancel_token is not None and cancel_token.cancelled):
+                    return result
+                self.log_callback(f"⚠️ {program_name}: échec du miroir réseau, repli sur l'URL d'origine", "warning")
+
+        download_url = program_info.get('download_url', '').strip()
+        if not download_url:
+            return None
+        return self.downloader.download(download_url, dest_path, max_retries=max_retries, timeout=timeout,
+                                        expected_sha256=expected, cancel_token=cancel_token)
+
+
+def prefetch(program_names: List[str], programs_db: Dict[str, Dict], mirror_dir,
+             downloader: Optional[ChunkedDownloader] = None, max_workers: int = 3,
+             log_callback: Optional[Callable[[str, str], None]] = None) -> Dict[str, List[str]]:
+    """
+    Télécharge les installateurs d'une sélection dans un miroir
+
+    Les programmes déjà présents et à jour sont ignorés; le manifeste est
+    enregistré après chaque fichier (un arrêt n'oblige pas à tout refaire).
+
+    Returns:
+        dict: {'fetched': [...], 'skipped': [...], 'unsupported': [...], 'failed': [...]}
+    """
+    log = log_callback or (lambda msg, level="info": logger.info(msg))
+    mirror = LocalMirror(mirror_dir)
+    incoming = mirror.root / 'incoming'
+    incoming.mkdir(parents=True, exist_ok=True)
+    downloader = downloader or ChunkedDownloader(log_callback=log)
+    summary = {'fetched': [], 'skipped': [], 'unsupported': [], 'failed': []}
+    summary_lock = threading.Lock()
+
+    def fetch_one(name):
+        info = programs_db.get(name)
+        download_url = (info or {}).get('download_url', '').strip()
+        if not download_url:
+            # Inconnu ou installation winget uniquement: rien à mettre en miroir
+            return 'unsupported'
+        if mirror.has(name, info):
+            return 'skipped'
+        filename = info.get('filename') or os.path.basename(urlparse(download_url).path) or 'installer.exe'
+        safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+        result = downloader.download(download_url, incoming / safe_name / filename,
+                                     timeout=info.get('download_timeout', 60),
+                                     expected_sha256=info.get('sha256') or None)
+        if result is None:
+            return 'failed'
+        mirror.add(name, info, result.path, result.sha256)
+        mirror.save()
+        return 'fetched'
+
+    names = list(dict.fromkeys(program_names))
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for name, status in zip(names, executor.map(fetch_one, names)):
+                with summary_lock:
+                    summary[status].append(name)
+                icon = {'fetched': '✅', 'skipped': '♻️', 'unsupported': 'ℹ️', 'failed': '❌'}[status]
+                log(f"{icon} {name}: {status}", "error" if status == 'failed' else "info")
+    finally:
+        shutil.rmtree(incoming, ignore_errors=True)
+        mirror.save()
+    return summary
+
+
+def _resolve_profile(name: str) -> Optional[List[str]]:
+    """Applications d'un profil (nom exact, ou sans l'emoji, insensible à la casse)"""
+    try:
+        from .profiles_manager import ProfilesManager
+    except ImportError:
+        from profiles_manager import ProfilesManager
+    profiles = ProfilesManager().get_all_profiles()
+    wanted = name.strip().lower()
+    for profile_name, profile in profiles.items():
+        if wanted in (profile_name.lower(), re.sub(r'^\W+', '', profile_name).lower()):
+            return profile.get('applications', [])
+    return None
+
+
+def serve(directory, port: int = 8080, bind: str = ''):
+    """Expose un miroir en HTTP sur le réseau local (bloquant)"""
+    from functools import partial
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+    handler = partial(SimpleHTTPRequestHandler, directory=str(directory))
+    with ThreadingHTTPServer((bind, port), handler) as server:
+        print(f"🌐 Miroir {directory} servi sur http://{bind or '0.0.0.0'}:{port}/")
+        server.serve_forever()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='mirror_repository', description="Miroir local des installateurs NiTrite")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    cmd_prefetch = commands.add_parser('prefetch', help="Télécharger une sélection dans un miroir")
+    cmd_prefetch.add_argument('--dest', default=None, help="Dossier miroir (défaut: mirror/ à côté de l'exe)")
+    selection = cmd_prefetch.add_mutually_exclusive_group(required=True)
+    selection.add_argument('--profile', help="Nom du profil d'installation")
+    selection.add_argument('--programs', nargs='+', help="Noms des programmes")
+    selection.add_argument('--all', action='store_true', help="Tout le catalogue")
+    cmd_prefetch.add_argument('--catalog', default=None, help="programs.json (défaut: data/programs.json)")
+    cmd_prefetch.add_argument('--jobs', type=int, default=3, help="Téléchargements simultanés")
+
+    cmd_serve = commands.add_parser('serve', help="Servir un miroir en HTTP")
+    cmd_serve.add_argument('--dir', default=None, help="Dossier miroir")
+    cmd_serve.add_argument('--port', type=int, default=8080)
+    cmd_serve.add_argument('--bind', default='')
+
+    cmd_list = commands.add_parser('list', help="Afficher le contenu d'un miroir")
+    cmd_list.add_argument('--dir', default=None, help="Dossier miroir")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    if args.command == 'serve':
+        serve(args.dir or default_mirror_dir(), args.port, args.bind)
+        return 0
+
+    if args.command == 'list':
+        mirror = LocalMirror(args.dir or default_mirror_dir())
+        for name, entry in sorted(mirror.entries().items()):
+            status = '✅' if mirror.has(name) else '❌'
+            print(f"{status} {name}: {entry['filename']} ({entry['size'] / (1024 * 1024):.1f} Mo)")
+        return 0
+
+    catalog_path = args.catalog or get_executable_dir() / 'data' / 'programs.json'
+    programs_db = load_catalog(catalog_path)
+    if args.profile:
+        program_names = _resolve_profile(args.profile)
+        if program_names is None:
+            print(f"❌ Profil introuvable: {args.profile}")
+            return 2
+    elif args.all:
+        program_names = list(programs_db)
+    else:
+        program_names = args.programs
+
+    def log(message, level="info"):
+        print(message)
+
+    summary = prefetch(program_names, programs_db, args.dest or default_mirror_dir(),
+                       downloader=ChunkedDownloader(log_callback=log), max_workers=args.jobs, log_callback=log)
+    print(f"📦 {len(summary['fetched'])} téléchargé(s), {len(summary['skipped'])} déjà présent(s), "
+          f"{len(summary['unsupported'])} sans URL directe, {len(summary['failed'])} en échec")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
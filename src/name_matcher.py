@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index de correspondance de noms de programmes
+Tokens normalisés + trigrammes de caractères pour retrouver rapidement un
+logiciel installé à partir d'un nom de catalogue, avec un score de confiance
+"""
+
+import re
+import time
+import random
+import string
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Tokens sans valeur discriminante (architecture, langue, mentions de version,
+# canal de publication, forme juridique de l'éditeur)
+STOPWORDS = {
+    'x64', 'x86', 'x32', 'amd64', 'arm64', 'bit', 'bits', 'win', 'win32', 'win64',
+    'windows', 'version', 'edition', 'setup', 'installer', 'portable',
+    'release', 'build', 'update', 'stable',
+    'inc', 'corp', 'corporation', 'llc', 'ltd', 'gmbh',
+    'the', 'for', 'and', 'de', 'du', 'la', 'le', 'fr', 'en', 'us',
+}
+
+# Score minimum par défaut pour considérer deux noms comme identiques
+DEFAULT_MIN_SCORE = 0.6
+# Longueur minimale d'une forme compacte pour la recherche par inclusion
+MIN_CONTAINMENT_LENGTH = 4
+
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+# Suffixe d'architecture collé au nom (« HWiNFO64 »)
+_ARCH_SUFFIX_RE = re.compile(r'^([a-z][a-z0-9]*[a-z])(?:32|64)$')
+
+# Couples (nom du catalogue, DisplayName du registre) qui doivent correspondre;
+# vérifiés par `python src/name_matcher.py`
+REGRESSION_PAIRS = (
+    ('Zoom', 'Zoom Workplace (64-bit)'),
+    ('HWiNFO', 'HWiNFO64 Version 7.66'),
+    ('Discord', 'Discord Inc. Discord'),
+    ('Malwarebytes', 'Malwarebytes Anti-Malware'),
+    ('PuTTY', 'PuTTY release 0.80 (64-bit)'),
+    ('Opera', 'Opera Stable 105.0'),
+    ('Adobe Acrobat Reader DC', 'Adobe Acrobat (64-bit)'),
+    ('7-Zip', '7-Zip 23.01 (x64)'),
+    ('Wise Disk Cleaner', 'WiseDiskCleaner'),
+)
+
+
+def normalize_text(name: str) -> str:
+    """Minuscules, sans accents, ponctuation remplacée par des espaces"""
+    name = unicodedata.normalize('NFKD', name or '')
+    name = ''.join(c for c in name if not unicodedata.combining(c)).lower()
+    return _NON_ALNUM_RE.sub(' ', name).strip()
+
+
+def tokenize(name: str) -> List[str]:
+    """
+    Tokens significatifs d'un nom (sans numéros de version ni mots vides)
+
+    Un nombre en tête fait partie du nom (« 7-Zip », « 360 Total Security »);
+    les suivants sont des versions ou des millésimes (« 23.01 », « 2019 »).
+    Un suffixe d'architecture collé est retiré (« HWiNFO64 » -> hwinfo).
+    """
+    return [
+        _ARCH_SUFFIX_RE.sub(r'\1', token) for position, token in enumerate(normalize_text(name).split())
+        if token not in STOPWORDS and (position == 0 or not token.isdigit())
+    ]
+
+
+def compact(name: str) -> str:
+    """Forme compacte d'un nom (tokens significatifs concaténés)"""
+    return ''.join(tokenize(name))
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrammes de caractères d'une forme compacte (avec bornes)"""
+    if not text:
+        return set()
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Index de noms avec recherche approximative
+
+    Chaque nom est indexé par ses tokens et ses trigrammes. Une requête ne
+    compare que les candidats partageant au moins un token ou suffisamment
+    de trigrammes, au lieu de parcourir toutes les entrées.
+    """
+
+    def __init__(self, items: Optional[Iterable[Tuple[str, Any]]] = None):
+        """
+        Args:
+            items: Couples (nom, valeur associée) à indexer
+        """
+        self._names: List[str] = []
+        self._payloads: List[Any] = []
+        self._tokens: List[Set[str]] = []
+        self._compacts: List[str] = []
+        self._grams: List[Set[str]] = []
+        self._token_postings: Dict[str, List[int]] = {}
+        self._gram_postings: Dict[str, List[int]] = {}
+        for name, payload in items or []:
+            self.add(name, payload)
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, name: str, payload: Any = None):
+        """Ajoute un nom à l'index"""
+        token_list = tokenize(name)
+        tokens = set(token_list)
+        compact_name = ''.join(token_list)
+        if not compact_name:
+            return
+        grams = trigrams(compact_name)
+
+        index = len(self._names)
+        self._names.append(name)
+        self._payloads.append(payload if payload is not None else name)
+        self._tokens.append(tokens)
+        self._compacts.append(compact_name)
+        self._grams.append(grams)
+        for token in tokens:
+            self._token_postings.setdefault(token, []).append(index)
+        for gram in grams:
+            self._gram_postings.setdefault(gram, []).append(index)
+
+    def _candidates(self, query_tokens: Set[str], query_grams: Set[str]) -> Set[int]:
+        """Entrées partageant un token, ou au moins la moitié des trigrammes"""
+        candidates = set()
+        for token in query_tokens:
+            candidates.update(self._token_postings.get(token, ()))
+
+        if query_grams:
+            hits: Dict[int, int] = {}
+            for gram in query_grams:
+                for index in self._gram_postings.get(gram, ()):
+                    hits[index] = hits.get(index, 0) + 1
+            threshold = max(2, len(query_grams) // 2)
+            candidates.update(index for index, count in hits.items() if count >= threshold)
+        return candidates
+
+    @staticmethod
+    def _score(query_tokens, query_compact, query_grams, tokens, compact_name, grams) -> float:
+        """
+        Score de similarité entre 0 et 1
+
+        - 1.0 si les formes compactes ou les ensembles de tokens sont identiques
+        - tokens communs rapportés à l'union des tokens (70 %) + coefficient
+          de Dice sur les trigrammes (30 %)
+        - au moins 0.9 si la forme compacte de la requête est incluse dans
+          celle du candidat et que chaque token du candidat figure dans la
+          requête (noms collés: "WiseDiskCleaner" / "Wise Disk Cleaners")
+        - au moins 0.8 si le candidat contient tous les tokens de la requête
+          ou commence par son nom (DisplayName plus long que le nom du
+          catalogue: "Zoom" / "Zoom Workplace")
+        - au moins 0.7 si un candidat d'au moins deux tokens est entièrement
+          contenu dans la requête (DisplayName abrégé: "Adobe Acrobat")
+
+        Les correspondances exactes restent devant les inclusions, ce qui
+        départage "Google" et "Google Chrome" quand les deux sont présents.
+        """
+        if query_compact == compact_name or query_tokens == tokens:
+            return 1.0
+        union = query_tokens | tokens
+        overlap = len(query_tokens & tokens) / len(union) if union else 0.0
+        dice = 2 * len(query_grams & grams) / (len(query_grams) + len(grams)) if grams else 0.0
+        score = 0.7 * overlap + 0.3 * dice
+        long_enough = len(query_compact) >= MIN_CONTAINMENT_LENGTH
+        if long_enough and query_compact in compact_name and all(token in query_compact for token in tokens):
+            score = max(score, 0.9)
+        elif query_tokens <= tokens or (long_enough and compact_name.startswith(query_compact)):
+            score = max(score, 0.8)
+        elif len(tokens) >= 2 and tokens <= query_tokens:
+            score = max(score, 0.7)
+        return score
+
+    def matches(self, query: str, min_score: float = DEFAULT_MIN_SCORE) -> List[Tuple[Any, float]]:
+        """
+        Toutes les entrées correspondant à la requête, triées par score décroissant
+
+        Returns:
+            Liste de (valeur associée, score)
+        """
+        query_token_list = tokenize(query)
+        query_tokens = set(query_token_list)
+        query_compact = ''.join(query_token_list)
+        if not query_compact:
+            return []
+        query_grams = trigrams(query_compact)
+
+        results = []
+        for index in self._candidates(query_tokens, query_grams):
+            score = self._score(
+                query_tokens, query_compact, query_grams,
+                self._tokens[index], self._compacts[index], self._grams[index]
+            )
+            if score >= min_score:
+                results.append((self._payloads[index], score))
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results
+
+    def best_match(self, query: str, min_score: float = DEFAULT_MIN_SCORE) -> Optional[Tuple[Any, float]]:
+        """Meilleure entrée pour la requête, ou None si aucun score suffisant"""
+        results = self.matches(query, min_score)
+        return results[0] if results else None
+
+
+def _nested_loop_match(query: str, installed_lower: List[str]) -> bool:
+    """Ancien algorithme: inclusion de sous-chaînes dans les deux sens"""
+    name = query.lower()
+    for installed_name in installed_lower:
+        if name in installed_name or installed_name in name:
+            return True
+    return False
+
+
+def benchmark_name_matching(inventory_size=5000, query_count=700, seed=42) -> Dict[str, float]:
+    """
+    Compare l'index aux boucles imbriquées sur un inventaire synthétique
+
+    Returns:
+        dict avec les temps (secondes) de construction et de requête
+    """
+    rng = random.Random(seed)
+
+    def random_word():
+        return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+
+    vendors = [random_word().capitalize() for _ in range(300)]
+    inventory = [
+        f"{rng.choice(vendors)} {random_word().capitalize()} {rng.randint(1, 20)}.{rng.randint(0, 9)} (x64)"
+        for _ in range(inventory_size)
+    ]
+    # Moitié des requêtes présentes (forme catalogue), moitié absentes
+    queries = [' '.join(name.split()[:2]) for name in rng.sample(inventory, query_count // 2)]
+    queries += [f"{random_word().capitalize()} {random_word().capitalize()}" for _ in range(query_count - len(queries))]
+
+    start = time.perf_counter()
+    installed_lower = [name.lower() for name in inventory]
+    nested_found = sum(_nested_loop_match(q, installed_lower) for q in queries)
+    nested_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = NameIndex((name, name) for name in inventory)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index_found = sum(index.best_match(q) is not None for q in queries)
+    query_time = time.perf_counter() - start
+
+    return {
+        'inventory_size': inventory_size,
+        'queries': query_count,
+        'nested_loops_s': nested_time,
+        'index_build_s': build_time,
+        'index_queries_s': query_time,
+        'nested_found': nested_found,
+        'index_found': index_found,
+    }
+
+
+def check_regression_pairs() -> List[Tuple[str, str]]:
+    """Couples de REGRESSION_PAIRS non reconnus (liste vide si tout correspond)"""
+    return [
+        (query, installed) for query, installed in REGRESSION_PAIRS
+        if NameIndex([(installed, installed)]).best_match(query) is None
+    ]
+
+
+def main():
+    """Benchmark index vs boucles imbriquées"""
+    failures = check_regression_pairs()
+    for query, installed in failures:
+        print(f"❌ Non reconnu: {query!r} / {installed!r}")
+    if not failures:
+        print(f"✅ {len(REGRESSION_PAIRS)} couples de référence reconnus")
+    results = benchmark_name_matching()
+    print("\n" + "="*60)
+    print("BENCHMARK CORRESPONDANCE DE NOMS")
+    print("="*60)
+    print(f"Inventaire synthétique : {results['inventory_size']} entrées, {results['queries']} requêtes")
+    print(f"Boucles imbriquées     : {results['nested_loops_s'] * 1000:.1f} ms ({results['nested_found']} trouvés)")
+    print(f"Index (construction)   : {results['index_build_s'] * 1000:.1f} ms")
+    print(f"Index (requêtes)       : {results['index_queries_s'] * 1000:.1f} ms ({results['index_found']} trouvés)")
+
+
+if __name__ == "__main__":
+    main()
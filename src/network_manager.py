@@ -15,6 +15,11 @@ from ipaddress import ip_network, IPv4Network
 from datetime import datetime
 import json
 
+try:
+    from .http_client import get_http_client
+except ImportError:
+    from http_client import get_http_client
+
 
 class NetworkManager:
     """Gestionnaire complet pour opérations réseau avancées"""
@@ -417,7 +422,7 @@ class NetworkManager:
 
             for url in test_urls:
                 try:
-                    response = requests.get(url, timeout=15, stream=True)
+                    response = get_http_client().get(url, timeout=15, stream=True)
                     if response.status_code == 200:
                         for chunk in response.iter_content(chunk_size=8192):
                             downloaded += len(chunk)
@@ -446,7 +451,7 @@ class NetworkManager:
             test_url = 'http://httpbin.org/post'
 
             start_time = time.time()
-            response = requests.post(test_url, data=data, timeout=15)
+            response = get_http_client().post(test_url, data=data, timeout=15)
 
             if response.status_code == 200:
                 duration = time.time() - start_time
@@ -462,7 +467,7 @@ class NetworkManager:
     def get_public_ip(self) -> Dict:
         """Récupère l'IP publique et informations géographiques"""
         try:
-            response = requests.get('https://ipapi.co/json/', timeout=5)
+            response = get_http_client().get('https://ipapi.co/json/', timeout=5)
             if response.status_code == 200:
                 return response.json()
         except Exception as e:
@@ -1,16 +1,148 @@
 """
 Gestionnaire de base de données locale pour les exécutables portables
 Crée et maintient une base de données SQLite avec tous les programmes téléchargés
+
+Chaque thread réutilise sa propre connexion (journal WAL: les lectures de
+l'interface ne sont pas bloquées par les écritures de l'installateur), les
+requêtes préparées sont conservées par connexion, et les écritures passent
+par transaction().
+
+Les lancements d'applications sont enregistrés dans execution_history par un
+thread d'écriture différée; la table app_usage (tenue à jour par trigger)
+fournit les agrégats d'utilisation sans parcourir l'historique.
+
+La recherche utilise un index plein texte FTS5 (insensible aux accents,
+recherche par préfixe, résultats classés) tenu à jour par des triggers, avec
+repli sur LIKE si SQLite a été compilé sans FTS5.
 """
 
 import sqlite3
 import os
+import re
+import sys
+import unicodedata
 import json
+import time
+import queue
 import hashlib
+import argparse
+import tempfile
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import logging
 
+# Taille des blocs de lecture pour le calcul des empreintes
+HASH_BLOCK_SIZE = 1024 * 1024
+# Réglages des connexions
+BUSY_TIMEOUT = 10.0             # Attente d'un verrou d'écriture (secondes)
+CACHE_SIZE_KB = 8 * 1024        # Cache de pages par connexion
+CACHED_STATEMENTS = 256         # Requêtes préparées conservées par connexion
+
+# Index plein texte: accents ignorés (é == e), casse ignorée
+FTS_TOKENIZER = "unicode61 remove_diacritics 2"
+# Poids bm25 des colonnes indexées (name, display_name, description, category)
+FTS_WEIGHTS = (10.0, 8.0, 1.0, 2.0)
+# Résultats au plus d'une recherche à la frappe
+SEARCH_LIMIT = 200
+# Threads de calcul des empreintes (import groupé, vérification d'intégrité)
+HASH_WORKERS = min(8, (os.cpu_count() or 2))
+# Applications vérifiées entre deux sauvegardes du curseur de vérification
+VERIFY_CHUNK = 32
+# Lancements écrits au plus par transaction de l'historique
+HISTORY_BATCH = 100
+
+# Colonnes de la table applications renseignées à l'ajout
+_APPLICATION_COLUMNS = (
+    'name', 'display_name', 'category', 'description', 'version',
+    'executable_path', 'file_size', 'file_hash', 'download_url',
+    'download_date', 'last_updated', 'is_portable', 'install_args',
+    'notes', 'icon_path', 'official_website', 'admin_required', 'file_mtime_ns'
+)
+# Mise à jour en place si le nom existe déjà: l'id (et donc l'historique
+# d'exécution et les statistiques d'usage qui le référencent) est conservé
+_INSERT_APPLICATION = (
+    f"INSERT INTO applications ({', '.join(_APPLICATION_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _APPLICATION_COLUMNS)}) "
+    f"ON CONFLICT(name) DO UPDATE SET "
+    f"{', '.join(f'{c} = excluded.{c}' for c in _APPLICATION_COLUMNS if c != 'name')}"
+)
+_INSERT_METADATA = 'INSERT OR REPLACE INTO metadata (app_id, key, value) VALUES (?, ?, ?)'
+# Attributs stockés dans applications (les autres vont dans metadata)
+_APPLICATION_KWARGS = {
+    'display_name', 'category', 'description', 'version', 'download_url', 'is_portable',
+    'install_args', 'notes', 'icon_path', 'official_website', 'admin_required'
+}
+
+_FTS_SCHEMA = (
+    f'''
+    CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts USING fts5(
+        name, display_name, description, category,
+        content='applications', content_rowid='id',
+        tokenize='{FTS_TOKENIZER}'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS applications_fts_insert AFTER INSERT ON applications BEGIN
+        INSERT INTO applications_fts(rowid, name, display_name, description, category)
+        VALUES (new.id, new.name, new.display_name, new.description, new.category);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS applications_fts_delete AFTER DELETE ON applications BEGIN
+        INSERT INTO applications_fts(applications_fts, rowid, name, display_name, description, category)
+        VALUES ('delete', old.id, old.name, old.display_name, old.description, old.category);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS applications_fts_update AFTER UPDATE OF name, display_name, description, category
+        ON applications BEGIN
+        INSERT INTO applications_fts(applications_fts, rowid, name, display_name, description, category)
+        VALUES ('delete', old.id, old.name, old.display_name, old.description, old.category);
+        INSERT INTO applications_fts(rowid, name, display_name, description, category)
+        VALUES (new.id, new.name, new.display_name, new.description, new.category);
+    END
+    ''',
+)
+
+
+def fts5_available(conn):
+    """Indique si SQLite a été compilé avec FTS5"""
+    try:
+        conn.execute('CREATE VIRTUAL TABLE IF NOT EXISTS temp._fts5_probe USING fts5(x)')
+        conn.execute('DROP TABLE temp._fts5_probe')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def fts_query(text):
+    """
+    Requête FTS5 « tous les mots, par préfixe » pour une saisie utilisateur
+    
+    « note pad » -> '"note"* "pad"*' (les guillemets neutralisent la syntaxe FTS5)
+    """
+    return ' '.join(f'"{token}"*' for token in re.findall(r'\w+', text.lower()))
+
+
+def fold_text(text):
+    """Minuscules sans accents, pour les recherches sans FTS5"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _contains_in_order(text, parts):
+    """Les fragments apparaissent-ils dans cet ordre (motif glob « *a*b* »)"""
+    position = 0
+    for part in parts:
+        position = text.find(part, position)
+        if position < 0:
+            return False
+        position += len(part)
+    return True
+
 
 class PortableDatabase:
     """Gestionnaire de base de données pour les applications portables"""
@@ -40,83 +172,236 @@ class PortableDatabase:
         # Créer le dossier s'il n'existe pas
         self.apps_folder.mkdir(parents=True, exist_ok=True)
         
+        # Une connexion par thread, refermée quand son thread s'est terminé
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        
+        # Écriture différée de l'historique des lancements
+        self._history_queue = queue.Queue()
+        self._history_thread = None
+        self._history_lock = threading.Lock()
+        # Incrémenté à chaque écriture d'historique (agrégats d'utilisation à relire)
+        self.usage_version = 0
+        
         # Initialiser la base de données
         self._init_database()
     
+    def _open_connection(self):
+        """Ouvre une connexion réglée (WAL, synchronous NORMAL, cache)"""
+        # isolation_level=None: les transactions sont ouvertes explicitement par transaction()
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS
+        )
+        conn.row_factory = sqlite3.Row
+        mode = conn.execute('PRAGMA journal_mode=WAL').fetchone()[0]
+        if mode.lower() != 'wal':
+            # Système de fichiers sans mémoire partagée (partage réseau): journal classique
+            self.logger.debug(f"Mode WAL indisponible pour {self.db_path} (mode {mode})")
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{CACHE_SIZE_KB}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        # Un REPLACE déclenche alors le trigger de suppression (index FTS exact)
+        conn.execute('PRAGMA recursive_triggers=ON')
+        return conn
+    
+    def _connect(self):
+        """Connexion du thread courant (créée au premier appel)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._open_connection()
+            self._local.depth = 0
+            with self._connections_lock:
+                # Fermer les connexions des threads terminés (installations, analyses...)
+                alive = []
+                for thread, other in self._connections:
+                    if thread.is_alive():
+                        alive.append((thread, other))
+                    else:
+                        other.close()
+                alive.append((threading.current_thread(), conn))
+                self._connections = alive
+        return conn
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Transaction explicite sur la connexion du thread courant
+        
+        Validée à la sortie du bloc, annulée si une exception le traverse.
+        Les transactions imbriquées rejoignent la transaction englobante.
+        
+        Usage:
+            with db.transaction() as conn:
+                conn.execute(...)
+        """
+        conn = self._connect()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+        
+        # IMMEDIATE: le verrou d'écriture est pris dès le début (pas d'échec en cours de route)
+        conn.execute('BEGIN IMMEDIATE')
+        self._local.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+        finally:
+            self._local.depth = 0
+    
+    def close(self):
+        """Ferme toutes les connexions (à appeler à la fermeture de l'application)"""
+        self.flush_history()
+        with self._connections_lock:
+            for _, conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections = []
+        self._local = threading.local()
+    
     def _init_database(self):
         """Crée la structure de la base de données"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Table principale des applications
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS applications (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE,
-                    display_name TEXT,
-                    category TEXT,
-                    description TEXT,
-                    version TEXT,
-                    executable_path TEXT NOT NULL,
-                    file_size INTEGER,
-                    file_hash TEXT,
-                    download_url TEXT,
-                    download_date TEXT,
-                    last_updated TEXT,
-                    is_portable BOOLEAN DEFAULT 1,
-                    install_args TEXT,
-                    notes TEXT,
-                    icon_path TEXT,
-                    official_website TEXT,
-                    admin_required BOOLEAN DEFAULT 0
-                )
-            ''')
-            
-            # Table des métadonnées
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS metadata (
-                    app_id INTEGER,
-                    key TEXT,
-                    value TEXT,
-                    FOREIGN KEY (app_id) REFERENCES applications(id),
-                    PRIMARY KEY (app_id, key)
-                )
-            ''')
-            
-            # Table des catégories
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS categories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE,
-                    description TEXT,
-                    icon TEXT
-                )
-            ''')
-            
-            # Table d'historique des exécutions
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS execution_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    app_id INTEGER,
-                    execution_date TEXT,
-                    duration INTEGER,
-                    success BOOLEAN,
-                    notes TEXT,
-                    FOREIGN KEY (app_id) REFERENCES applications(id)
-                )
-            ''')
-            
-            # Index pour améliorer les performances
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_app_name ON applications(name)
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_category ON applications(category)
-            ''')
-            
-            conn.commit()
-            conn.close()
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+            
+                # Table principale des applications
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS applications (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name TEXT NOT NULL UNIQUE,
+                        display_name TEXT,
+                        category TEXT,
+                        description TEXT,
+                        version TEXT,
+                        executable_path TEXT NOT NULL,
+                        file_size INTEGER,
+                        file_hash TEXT,
+                        download_url TEXT,
+                        download_date TEXT,
+                        last_updated TEXT,
+                        is_portable BOOLEAN DEFAULT 1,
+                        install_args TEXT,
+                        notes TEXT,
+                        icon_path TEXT,
+                        official_website TEXT,
+                        admin_required BOOLEAN DEFAULT 0
+                    )
+                ''')
+            
+                # Table des métadonnées
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS metadata (
+                        app_id INTEGER,
+                        key TEXT,
+                        value TEXT,
+                        FOREIGN KEY (app_id) REFERENCES applications(id),
+                        PRIMARY KEY (app_id, key)
+                    )
+                ''')
+            
+                # Table des catégories
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS categories (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name TEXT NOT NULL UNIQUE,
+                        description TEXT,
+                        icon TEXT
+                    )
+                ''')
+            
+                # Table d'historique des exécutions
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS execution_history (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        app_id INTEGER,
+                        execution_date TEXT,
+                        duration INTEGER,
+                        success BOOLEAN,
+                        notes TEXT,
+                        FOREIGN KEY (app_id) REFERENCES applications(id)
+                    )
+                ''')
+            
+                # Agrégats d'utilisation, tenus à jour à chaque lancement enregistré
+                usage_exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'app_usage'"
+                ).fetchone()
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS app_usage (
+                        app_id INTEGER PRIMARY KEY,
+                        launches INTEGER NOT NULL DEFAULT 0,
+                        failures INTEGER NOT NULL DEFAULT 0,
+                        total_duration INTEGER NOT NULL DEFAULT 0,
+                        last_launch TEXT,
+                        FOREIGN KEY (app_id) REFERENCES applications(id)
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS execution_history_usage AFTER INSERT ON execution_history BEGIN
+                        INSERT INTO app_usage (app_id, launches, failures, total_duration, last_launch)
+                        VALUES (new.app_id, 1, NOT new.success, COALESCE(new.duration, 0), new.execution_date)
+                        ON CONFLICT(app_id) DO UPDATE SET
+                            launches = launches + 1,
+                            failures = failures + excluded.failures,
+                            total_duration = total_duration + excluded.total_duration,
+                            last_launch = MAX(COALESCE(last_launch, ''), excluded.last_launch);
+                    END
+                ''')
+                if not usage_exists:
+                    cursor.execute('''
+                        INSERT INTO app_usage (app_id, launches, failures, total_duration, last_launch)
+                        SELECT app_id, COUNT(*), SUM(NOT success), SUM(COALESCE(duration, 0)), MAX(execution_date)
+                        FROM execution_history GROUP BY app_id
+                    ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_history_app_date ON execution_history(app_id, execution_date)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_usage_launches ON app_usage(launches DESC)
+                ''')
+            
+                # Empreinte rapide (taille + date de modification) des bases existantes
+                columns = {row['name'] for row in conn.execute('PRAGMA table_info(applications)')}
+                if 'file_mtime_ns' not in columns:
+                    cursor.execute('ALTER TABLE applications ADD COLUMN file_mtime_ns INTEGER')
+            
+                # Reprise de la vérification d'intégrité interrompue
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS verification_state (
+                        key TEXT PRIMARY KEY,
+                        value TEXT
+                    )
+                ''')
+            
+                # Index pour améliorer les performances
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_app_name ON applications(name)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_category ON applications(category)
+                ''')
+            
+                # Index plein texte tenu à jour par triggers
+                self.fts_enabled = fts5_available(conn)
+                if self.fts_enabled:
+                    self._init_fts(conn)
+                else:
+                    self.logger.warning("⚠️ FTS5 indisponible: recherche par LIKE")
             
             self.logger.info(f"✅ Base de données initialisée: {self.db_path}")
             
@@ -124,18 +409,58 @@ class PortableDatabase:
             self.logger.error(f"❌ Erreur lors de l'initialisation de la base de données: {e}")
             raise
     
+    def _init_fts(self, conn):
+        """Crée l'index plein texte (et l'alimente pour une base existante)"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'applications_fts'"
+        ).fetchone()
+        for statement in _FTS_SCHEMA:
+            conn.execute(statement)
+        if not exists:
+            conn.execute("INSERT INTO applications_fts(applications_fts) VALUES ('rebuild')")
+    
     def _calculate_file_hash(self, file_path):
         """Calcule le hash SHA256 d'un fichier"""
         try:
             sha256_hash = hashlib.sha256()
             with open(file_path, "rb") as f:
-                for byte_block in iter(lambda: f.read(4096), b""):
+                for byte_block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
                     sha256_hash.update(byte_block)
             return sha256_hash.hexdigest()
         except Exception as e:
             self.logger.error(f"Erreur lors du calcul du hash: {e}")
             return None
     
+    @staticmethod
+    def _application_row(name, exe_path, file_stat, file_hash, kwargs, current_time=None):
+        """Valeurs d'une ligne applications (ordre de _APPLICATION_COLUMNS)"""
+        current_time = current_time or datetime.now().isoformat()
+        return (
+            name,
+            kwargs.get('display_name', name),
+            kwargs.get('category', 'Non classé'),
+            kwargs.get('description', ''),
+            kwargs.get('version', 'Unknown'),
+            str(Path(exe_path).absolute()),
+            file_stat.st_size,
+            file_hash,
+            kwargs.get('download_url', ''),
+            kwargs.get('download_date', current_time),
+            current_time,
+            kwargs.get('is_portable', True),
+            kwargs.get('install_args', ''),
+            kwargs.get('notes', ''),
+            kwargs.get('icon_path', ''),
+            kwargs.get('official_website', ''),
+            kwargs.get('admin_required', False),
+            file_stat.st_mtime_ns
+        )
+    
+    @staticmethod
+    def _metadata_rows(app_id, kwargs):
+        """Attributs supplémentaires (hors colonnes d'applications) pour metadata"""
+        return [(app_id, key, str(value)) for key, value in kwargs.items() if key not in _APPLICATION_KWARGS]
+    
     def add_application(self, name, executable_path, **kwargs):
         """
         Ajoute une application à la base de données
@@ -144,6 +469,8 @@ class PortableDatabase:
             name: Nom unique de l'application
             executable_path: Chemin vers l'exécutable
             **kwargs: Autres attributs (display_name, category, description, etc.)
+                      file_hash: SHA-256 déjà connu (calculé au téléchargement),
+                      évite de relire le fichier
         
         Returns:
             ID de l'application ajoutée ou None en cas d'erreur
@@ -157,56 +484,16 @@ class PortableDatabase:
                 return None
             
             # Calculer les métadonnées du fichier
-            file_size = exe_path.stat().st_size
-            file_hash = self._calculate_file_hash(exe_path)
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            file_stat = exe_path.stat()
+            file_hash = kwargs.pop('file_hash', None) or self._calculate_file_hash(exe_path)
             
-            # Préparer les données
-            current_time = datetime.now().isoformat()
+            with self.transaction() as conn:
+                conn.execute(_INSERT_APPLICATION, self._application_row(name, exe_path, file_stat, file_hash, kwargs))
+                # lastrowid n'est pas renseigné quand le conflit devient une mise à jour
+                app_id = conn.execute('SELECT id FROM applications WHERE name = ?', (name,)).fetchone()['id']
             
-            cursor.execute('''
-                INSERT OR REPLACE INTO applications 
-                (name, display_name, category, description, version, 
-                 executable_path, file_size, file_hash, download_url, 
-                 download_date, last_updated, is_portable, install_args, 
-                 notes, icon_path, official_website, admin_required)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                name,
-                kwargs.get('display_name', name),
-                kwargs.get('category', 'Non classé'),
-                kwargs.get('description', ''),
-                kwargs.get('version', 'Unknown'),
-                str(exe_path.absolute()),
-                file_size,
-                file_hash,
-                kwargs.get('download_url', ''),
-                kwargs.get('download_date', current_time),
-                current_time,
-                kwargs.get('is_portable', True),
-                kwargs.get('install_args', ''),
-                kwargs.get('notes', ''),
-                kwargs.get('icon_path', ''),
-                kwargs.get('official_website', ''),
-                kwargs.get('admin_required', False)
-            ))
-            
-            app_id = cursor.lastrowid
-            
-            # Ajouter les métadonnées supplémentaires
-            for key, value in kwargs.items():
-                if key not in ['display_name', 'category', 'description', 'version', 
-                               'download_url', 'is_portable', 'install_args', 'notes',
-                               'icon_path', 'official_website', 'admin_required']:
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO metadata (app_id, key, value)
-                        VALUES (?, ?, ?)
-                    ''', (app_id, key, str(value)))
-            
-            conn.commit()
-            conn.close()
+                # Ajouter les métadonnées supplémentaires
+                conn.executemany(_INSERT_METADATA, self._metadata_rows(app_id, kwargs))
             
             self.logger.info(f"✅ Application ajoutée: {name} (ID: {app_id})")
             return app_id
@@ -221,8 +508,7 @@ class PortableDatabase:
     def get_application(self, name=None, app_id=None):
         """Récupère les informations d'une application"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = self._connect()
             cursor = conn.cursor()
             
             if app_id:
@@ -233,8 +519,6 @@ class PortableDatabase:
                 return None
             
             result = cursor.fetchone()
-            conn.close()
-            
             if result:
                 return dict(result)
             return None
@@ -255,8 +539,7 @@ class PortableDatabase:
             Liste de dictionnaires contenant les informations des applications
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = self._connect()
             cursor = conn.cursor()
             
             query = 'SELECT * FROM applications WHERE 1=1'
@@ -273,32 +556,46 @@ class PortableDatabase:
             
             cursor.execute(query, params)
             results = cursor.fetchall()
-            conn.close()
-            
             return [dict(row) for row in results]
             
         except Exception as e:
             self.logger.error(f"❌ Erreur lors du listing: {e}")
             return []
     
-    def search_applications(self, search_term):
-        """Recherche des applications par nom ou description"""
+    def search_applications(self, search_term, limit=None):
+        """
+        Recherche des applications par nom ou description
+        
+        Index FTS5: tous les mots saisis, par préfixe et sans tenir compte des
+        accents, résultats classés par pertinence (nom avant description).
+        Sans résultat FTS5 (fragment au milieu d'un mot) ou sans FTS5: LIKE.
+        
+        Args:
+            search_term: Texte recherché
+            limit: Nombre maximum de résultats (tous par défaut)
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+            conn = self._connect()
+            query = fts_query(search_term)
+            if self.fts_enabled and query:
+                rows = conn.execute(f'''
+                    SELECT a.* FROM applications_fts
+                    JOIN applications a ON a.id = applications_fts.rowid
+                    WHERE applications_fts MATCH ?
+                    ORDER BY bm25(applications_fts, {', '.join(map(str, FTS_WEIGHTS))}), a.name
+                    LIMIT ?
+                ''', (query, -1 if limit is None else limit)).fetchall()
+                if rows:
+                    return [dict(row) for row in rows]
             
             search_pattern = f'%{search_term}%'
-            cursor.execute('''
+            rows = conn.execute('''
                 SELECT * FROM applications 
                 WHERE name LIKE ? OR display_name LIKE ? OR description LIKE ?
                 ORDER BY name
-            ''', (search_pattern, search_pattern, search_pattern))
-            
-            results = cursor.fetchall()
-            conn.close()
-            
-            return [dict(row) for row in results]
+                LIMIT ?
+            ''', (search_pattern, search_pattern, search_pattern, -1 if limit is None else limit)).fetchall()
+            return [dict(row) for row in rows]
             
         except Exception as e:
             self.logger.error(f"❌ Erreur lors de la recherche: {e}")
@@ -307,9 +604,6 @@ class PortableDatabase:
     def update_application(self, name, **kwargs):
         """Met à jour les informations d'une application"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Construire la requête dynamiquement
             fields = []
             values = []
@@ -324,11 +618,8 @@ class PortableDatabase:
             values.append(name)
             
             query = f"UPDATE applications SET {', '.join(fields)} WHERE name = ?"
-            cursor.execute(query, values)
-            
-            conn.commit()
-            affected_rows = cursor.rowcount
-            conn.close()
+            with self.transaction() as conn:
+                affected_rows = conn.execute(query, values).rowcount
             
             if affected_rows > 0:
                 self.logger.info(f"✅ Application mise à jour: {name}")
@@ -344,19 +635,15 @@ class PortableDatabase:
     def delete_application(self, name=None, app_id=None):
         """Supprime une application de la base de données"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             if app_id:
-                cursor.execute('DELETE FROM applications WHERE id = ?', (app_id,))
+                query, key = 'DELETE FROM applications WHERE id = ?', app_id
             elif name:
-                cursor.execute('DELETE FROM applications WHERE name = ?', (name,))
+                query, key = 'DELETE FROM applications WHERE name = ?', name
             else:
                 return False
             
-            conn.commit()
-            affected_rows = cursor.rowcount
-            conn.close()
+            with self.transaction() as conn:
+                affected_rows = conn.execute(query, (key,)).rowcount
             
             if affected_rows > 0:
                 self.logger.info(f"✅ Application supprimée: {name or app_id}")
@@ -370,7 +657,7 @@ class PortableDatabase:
     def get_categories(self):
         """Récupère la liste de toutes les catégories"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -380,8 +667,6 @@ class PortableDatabase:
             ''')
             
             categories = [row[0] for row in cursor.fetchall()]
-            conn.close()
-            
             return categories
             
         except Exception as e:
@@ -391,7 +676,7 @@ class PortableDatabase:
     def get_statistics(self):
         """Retourne des statistiques sur la base de données"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             stats = {}
@@ -422,18 +707,52 @@ class PortableDatabase:
             stats['portable_apps'] = portable_stats.get(1, 0)
             stats['installed_apps'] = portable_stats.get(0, 0)
             
-            conn.close()
-            
             return stats
             
         except Exception as e:
             self.logger.error(f"❌ Erreur lors du calcul des statistiques: {e}")
             return {}
     
+    @staticmethod
+    def _list_executables(downloads_path):
+        """Exécutables du dossier (une seule lecture): [(nom en minuscules, chemin)] triés"""
+        try:
+            with os.scandir(downloads_path) as entries:
+                files = [
+                    (entry.name.lower(), Path(entry.path)) for entry in entries
+                    if entry.name.lower().endswith('.exe') and entry.is_file()
+                ]
+        except OSError:
+            return []
+        return sorted(files, key=lambda item: item[0])
+    
+    @staticmethod
+    def _match_executable(program_name, executables):
+        """
+        Premier exécutable correspondant à un programme, dans l'index du dossier
+        
+        Mêmes règles que les motifs « *Nom*Programme*.exe » puis « *NomProgramme*.exe »
+        (sans distinction de casse, comme sous Windows)
+        """
+        name = program_name.lower()
+        parts = [part for part in name.split(' ') if part]
+        for file_name, path in executables:
+            if _contains_in_order(file_name[:-4], parts):
+                return path
+        compact = name.replace(' ', '')
+        for file_name, path in executables:
+            if compact in file_name[:-4]:
+                return path
+        return None
+    
     def import_from_json(self, json_path, downloads_folder):
         """
         Importe les applications depuis un fichier programs.json
         
+        Le dossier des téléchargements est lu une seule fois, les empreintes
+        sont calculées en parallèle et toutes les lignes sont insérées dans
+        une seule transaction.
+        
         Args:
             json_path: Chemin vers le fichier programs.json
             downloads_folder: Dossier contenant les fichiers téléchargés
@@ -445,47 +764,71 @@ class PortableDatabase:
             with open(json_path, 'r', encoding='utf-8') as f:
                 programs_data = json.load(f)
             
-            downloads_path = Path(downloads_folder)
-            imported_count = 0
+            executables = self._list_executables(Path(downloads_folder))
             
+            # Correspondance programme -> exécutable dans l'index du dossier
+            matches = []
             for category, programs in programs_data.items():
                 if not isinstance(programs, dict):
                     continue
                 
                 for program_name, program_info in programs.items():
-                    # Chercher l'exécutable dans le dossier downloads
-                    is_portable = program_info.get('portable', False)
-                    
-                    if is_portable:
-                        # Rechercher le fichier .exe correspondant
-                        exe_files = list(downloads_path.glob(f"*{program_name.replace(' ', '*')}*.exe"))
-                        
-                        if not exe_files:
-                            # Essayer sans espace
-                            exe_files = list(downloads_path.glob(f"*{program_name.replace(' ', '')}*.exe"))
-                        
-                        if exe_files:
-                            exe_path = exe_files[0]
-                            
-                            # Ajouter à la base de données
-                            app_id = self.add_application(
-                                name=program_name,
-                                executable_path=str(exe_path),
-                                display_name=program_name,
-                                category=category,
-                                description=program_info.get('description', ''),
-                                download_url=program_info.get('download_url', ''),
-                                is_portable=True,
-                                install_args=program_info.get('install_args', ''),
-                                admin_required=program_info.get('admin_required', False),
-                                notes=program_info.get('note', ''),
-                                essential=program_info.get('essential', False),
-                                winget_id=program_info.get('winget_id', '')
-                            )
-                            
-                            if app_id:
-                                imported_count += 1
+                    if not program_info.get('portable', False):
+                        continue
+                    exe_path = self._match_executable(program_name, executables)
+                    if exe_path is not None:
+                        matches.append((category, program_name, program_info, exe_path))
+            
+            if not matches:
+                self.logger.info("✅ Importation terminée: 0 applications ajoutées")
+                return 0
+            
+            # Empreintes en parallèle (un même fichier n'est lu qu'une fois)
+            paths = list(dict.fromkeys(exe_path for _, _, _, exe_path in matches))
+            with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+                hashes = dict(zip(paths, pool.map(self._calculate_file_hash, paths)))
+            stats = {}
+            for path in paths:
+                try:
+                    stats[path] = path.stat()
+                except OSError:
+                    pass    # Fichier supprimé entre la lecture du dossier et l'import
             
+            current_time = datetime.now().isoformat()
+            rows = []
+            metadata = {}
+            for category, program_name, program_info, exe_path in matches:
+                if exe_path not in stats:
+                    continue
+                kwargs = {
+                    'display_name': program_name,
+                    'category': category,
+                    'description': program_info.get('description', ''),
+                    'download_url': program_info.get('download_url', ''),
+                    'is_portable': True,
+                    'install_args': program_info.get('install_args', ''),
+                    'admin_required': program_info.get('admin_required', False),
+                    'notes': program_info.get('note', ''),
+                    'essential': program_info.get('essential', False),
+                    'winget_id': program_info.get('winget_id', '')
+                }
+                rows.append(self._application_row(
+                    program_name, exe_path, stats[exe_path], hashes[exe_path], kwargs, current_time
+                ))
+                metadata[program_name] = kwargs
+            
+            with self.transaction() as conn:
+                conn.executemany(_INSERT_APPLICATION, rows)
+                ids = {}
+                for row in conn.execute('SELECT id, name FROM applications'):
+                    if row['name'] in metadata:
+                        ids[row['name']] = row['id']
+                conn.executemany(_INSERT_METADATA, [
+                    item for name, kwargs in metadata.items()
+                    for item in self._metadata_rows(ids[name], kwargs)
+                ])
+            
+            imported_count = len(metadata)
             self.logger.info(f"✅ Importation terminée: {imported_count} applications ajoutées")
             return imported_count
             
@@ -526,33 +869,258 @@ class PortableDatabase:
             self.logger.error(f"❌ Erreur lors de l'export: {e}")
             return False
     
-    def verify_integrity(self):
-        """Vérifie l'intégrité de la base de données"""
+    def record_execution(self, name, executable_path=None, started_at=None, duration=0,
+                         success=True, notes=''):
+        """
+        Enregistre un lancement (écriture différée, ne bloque jamais l'appelant)
+        
+        Args:
+            name: Nom de l'application
+            executable_path: Exécutable lancé, pour ajouter l'application si elle
+                             n'est pas encore dans la base
+            started_at: Date de lancement (datetime, maintenant par défaut)
+            duration: Durée d'exécution en secondes
+            success: Lancement réussi et code de sortie nul
+            notes: Détail (code de sortie, erreur...)
+        """
+        started_at = started_at or datetime.now()
+        self._history_queue.put((name, executable_path, started_at.isoformat(),
+                                 int(round(duration)), bool(success), notes))
+        with self._history_lock:
+            if self._history_thread is None:
+                self._history_thread = threading.Thread(
+                    target=self._history_writer, daemon=True, name="nitrite-portable-history"
+                )
+                self._history_thread.start()
+    
+    def track_process(self, name, process, executable_path=None):
+        """
+        Suit un processus lancé jusqu'à sa fin puis enregistre le lancement
+        (durée, succès selon le code de sortie)
+        
+        Returns:
+            Thread de suivi
+        """
+        started_at = datetime.now()
+        start = time.monotonic()
+        
+        def wait():
+            try:
+                returncode = process.wait()
+            except Exception as e:
+                self.record_execution(name, executable_path, started_at, time.monotonic() - start, False, str(e))
+                return
+            self.record_execution(name, executable_path, started_at, time.monotonic() - start,
+                                  returncode == 0, f"Code de sortie {returncode}")
+        
+        thread = threading.Thread(target=wait, daemon=True, name=f"nitrite-track-{name}")
+        thread.start()
+        return thread
+    
+    def _history_writer(self):
+        """Thread d'écriture: vide la file par lots, une transaction par lot"""
+        while True:
+            try:
+                batch = [self._history_queue.get(timeout=5)]
+            except queue.Empty:
+                with self._history_lock:
+                    if self._history_queue.empty():
+                        # Relancé par record_execution au prochain lancement
+                        self._history_thread = None
+                        return
+                continue
+            while len(batch) < HISTORY_BATCH:
+                try:
+                    batch.append(self._history_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_history(batch)
+            except Exception as e:
+                self.logger.error(f"❌ Historique des lancements non enregistré: {e}")
+            finally:
+                for _ in batch:
+                    self._history_queue.task_done()
+    
+    def _write_history(self, batch):
+        ids = {}
+        for name, executable_path, *_ in batch:
+            if name in ids:
+                continue
+            app = self.get_application(name=name)
+            if app is None and executable_path:
+                # Première utilisation d'une application absente de la base
+                self.add_application(name, executable_path, category='Portables')
+                app = self.get_application(name=name)
+            ids[name] = app['id'] if app else None
+        
+        rows = [
+            (ids[name], started, duration, success, notes)
+            for name, _, started, duration, success, notes in batch
+            if ids[name] is not None
+        ]
+        with self.transaction() as conn:
+            conn.executemany(
+                'INSERT INTO execution_history (app_id, execution_date, duration, success, notes) '
+                'VALUES (?, ?, ?, ?, ?)', rows
+            )
+        self.usage_version += 1
+    
+    def flush_history(self):
+        """Attend l'écriture des lancements en file (tests, fermeture)"""
+        if self._history_thread is not None:
+            self._history_queue.join()
+    
+    def get_usage_stats(self, order_by='launches', limit=None):
+        """
+        Statistiques d'utilisation par application (table app_usage, indexée)
+        
+        Args:
+            order_by: 'launches' (plus utilisées), 'avg_duration' (durée moyenne),
+                      'failure_rate' (taux d'échec) ou 'last_launch'
+            limit: Nombre maximum d'applications
+        
+        Returns:
+            Liste de dictionnaires (name, launches, failures, failure_rate,
+            avg_duration en secondes, last_launch)
+        """
+        orders = {
+            'launches': 'u.launches DESC',
+            'avg_duration': 'avg_duration DESC',
+            'failure_rate': 'failure_rate DESC',
+            'last_launch': 'u.last_launch DESC',
+        }
         try:
-            apps = self.list_applications(portable_only=False)
-            issues = []
-            
-            for app in apps:
-                exe_path = Path(app['executable_path'])
-                
-                # Vérifier l'existence du fichier
-                if not exe_path.exists():
-                    issues.append({
-                        'app': app['name'],
-                        'issue': 'Fichier non trouvé',
-                        'path': str(exe_path)
-                    })
-                    continue
-                
-                # Vérifier le hash
-                current_hash = self._calculate_file_hash(exe_path)
-                if current_hash != app.get('file_hash'):
-                    issues.append({
-                        'app': app['name'],
-                        'issue': 'Hash modifié (fichier potentiellement modifié)',
-                        'path': str(exe_path)
-                    })
+            rows = self._connect().execute(f'''
+                SELECT a.name, u.launches, u.failures, u.last_launch,
+                       CAST(u.failures AS REAL) / u.launches AS failure_rate,
+                       CAST(u.total_duration AS REAL) / u.launches AS avg_duration
+                FROM app_usage u JOIN applications a ON a.id = u.app_id
+                WHERE u.launches > 0
+                ORDER BY {orders.get(order_by, orders['launches'])}, a.name
+                LIMIT ?
+            ''', (-1 if limit is None else limit,)).fetchall()
+            return [dict(row) for row in rows]
+        except Exception as e:
+            self.logger.error(f"❌ Erreur lors du calcul des statistiques d'utilisation: {e}")
+            return []
+    
+    def most_used(self, limit=10):
+        """Applications les plus lancées"""
+        return self.get_usage_stats('launches', limit)
+    
+    def get_usage_ranks(self):
+        """Nombre de lancements par nom d'application (tri des cartes)"""
+        try:
+            return {
+                row['name']: row['launches'] for row in self._connect().execute(
+                    'SELECT a.name, u.launches FROM app_usage u JOIN applications a ON a.id = u.app_id'
+                )
+            }
+        except Exception as e:
+            self.logger.error(f"❌ Erreur lors de la lecture des lancements: {e}")
+            return {}
+    
+    def get_verification_cursor(self):
+        """Dernier identifiant vérifié d'une vérification interrompue (None si aucune)"""
+        row = self._connect().execute(
+            "SELECT value FROM verification_state WHERE key = 'cursor'"
+        ).fetchone()
+        return int(row['value']) if row else None
+    
+    def _save_verification_cursor(self, conn, cursor):
+        if cursor is None:
+            conn.execute("DELETE FROM verification_state WHERE key = 'cursor'")
+        else:
+            conn.execute(
+                "INSERT OR REPLACE INTO verification_state (key, value) VALUES ('cursor', ?)", (str(cursor),)
+            )
+    
+    def verify_integrity(self, deep=False, progress_callback=None, stop_event=None, resume=True):
+        """
+        Vérifie l'intégrité de la base de données
+        
+        Seuls les fichiers dont l'empreinte rapide (taille, date de
+        modification en ns) a changé sont rehachés, en parallèle. Le curseur
+        (dernier identifiant vérifié) est enregistré régulièrement: une
+        vérification interrompue reprend là où elle s'était arrêtée.
+        
+        Args:
+            deep: Rehacher tous les fichiers, même inchangés
+            progress_callback: Fonction (vérifiées, total, curseur)
+            stop_event: threading.Event interrompant la vérification entre deux lots
+            resume: Reprendre au curseur enregistré (sinon repartir du début)
+        
+        Returns:
+            Liste des problèmes détectés parmi les applications vérifiées
+        """
+        try:
+            conn = self._connect()
+            start_after = (self.get_verification_cursor() if resume else None) or 0
+            apps = [dict(row) for row in conn.execute(
+                'SELECT id, name, executable_path, file_size, file_hash, file_mtime_ns '
+                'FROM applications WHERE id > ? ORDER BY id', (start_after,)
+            )]
+            if start_after:
+                self.logger.info(f"🔁 Reprise de la vérification après l'application #{start_after}")
             
+            issues = []
+            hashed = 0
+            total = len(apps)
+            if not total and start_after:
+                with self.transaction() as conn:
+                    self._save_verification_cursor(conn, None)
+            with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+                for offset in range(0, total, VERIFY_CHUNK):
+                    if stop_event is not None and stop_event.is_set():
+                        self.logger.info(f"⏹️ Vérification interrompue ({offset}/{total})")
+                        return issues
+                    
+                    chunk = apps[offset:offset + VERIFY_CHUNK]
+                    to_hash = []
+                    for app in chunk:
+                        exe_path = Path(app['executable_path'])
+                        try:
+                            file_stat = exe_path.stat()
+                        except OSError:
+                            # Vérifier l'existence du fichier
+                            issues.append({
+                                'app': app['name'],
+                                'issue': 'Fichier non trouvé',
+                                'path': str(exe_path)
+                            })
+                            continue
+                        unchanged = (file_stat.st_size == app['file_size']
+                                     and file_stat.st_mtime_ns == app['file_mtime_ns'])
+                        if deep or not unchanged:
+                            to_hash.append((app, exe_path, file_stat))
+                    
+                    # Vérifier le hash des fichiers modifiés (ou de tous en mode approfondi)
+                    digests = pool.map(self._calculate_file_hash, [exe_path for _, exe_path, _ in to_hash])
+                    fingerprints = []
+                    for (app, exe_path, file_stat), current_hash in zip(to_hash, digests):
+                        hashed += 1
+                        if current_hash is not None and current_hash == app['file_hash']:
+                            # Contenu identique (fichier copié ou touché): nouvelle empreinte rapide
+                            fingerprints.append((file_stat.st_size, file_stat.st_mtime_ns, app['id']))
+                        else:
+                            issues.append({
+                                'app': app['name'],
+                                'issue': 'Hash modifié (fichier potentiellement modifié)',
+                                'path': str(exe_path)
+                            })
+                    
+                    cursor = chunk[-1]['id']
+                    done = offset + len(chunk)
+                    with self.transaction() as conn:
+                        conn.executemany(
+                            'UPDATE applications SET file_size = ?, file_mtime_ns = ? WHERE id = ?', fingerprints
+                        )
+                        self._save_verification_cursor(conn, None if done == total else cursor)
+                    if progress_callback:
+                        progress_callback(done, total, cursor)
+            
+            self.logger.info(f"🔍 {total} application(s) vérifiée(s), {hashed} fichier(s) rehaché(s)")
             if issues:
                 self.logger.warning(f"⚠️ {len(issues)} problèmes détectés")
                 for issue in issues:
@@ -567,8 +1135,257 @@ class PortableDatabase:
             return []
 
 
-def main():
+class PortableSearchIndex:
+    """
+    Index de recherche en mémoire pour la recherche à la frappe
+    
+    Même recherche que PortableDatabase.search_applications (FTS5 par
+    préfixe, sans accents, repli sur la sous-chaîne) pour une liste
+    d'applications qui n'est pas dans la base (catalogue d'une page).
+    Pour rester sous la milliseconde quand une ou deux lettres correspondent
+    à des milliers d'entrées, le classement se fait par paliers bornés (nom,
+    puis autres colonnes) plutôt que par bm25 sur toutes les correspondances.
+    """
+    
+    FIELDS = ('name', 'description', 'category')
+    
+    def __init__(self, items):
+        """
+        Args:
+            items: Dictionnaires d'applications (clés name, description, category)
+        """
+        self.items = list(items)
+        self._folded = [
+            fold_text(' '.join(str(item.get(field) or '') for field in self.FIELDS))
+            for item in self.items
+        ]
+        self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self.fts_enabled = fts5_available(self._conn)
+        if self.fts_enabled:
+            # prefix: index des préfixes courts (saisie des premières lettres)
+            self._conn.execute(
+                f"CREATE VIRTUAL TABLE search USING fts5({', '.join(self.FIELDS)}, "
+                f"tokenize='{FTS_TOKENIZER}', prefix='1 2 3')"
+            )
+            self._conn.executemany(
+                f"INSERT INTO search(rowid, {', '.join(self.FIELDS)}) VALUES (?, ?, ?, ?)",
+                ((position, *(str(item.get(field) or '') for field in self.FIELDS))
+                 for position, item in enumerate(self.items))
+            )
+        # Fragments au milieu d'un mot (« pad » dans Notepad++): index de trigrammes
+        self._trigrams = False
+        if self.fts_enabled:
+            try:
+                self._conn.execute("CREATE VIRTUAL TABLE grams USING fts5(text, tokenize='trigram')")
+                self._conn.executemany('INSERT INTO grams(rowid, text) VALUES (?, ?)', enumerate(self._folded))
+                self._trigrams = True
+            except sqlite3.OperationalError:
+                pass    # SQLite antérieur à 3.34
+    
+    def _match(self, query, limit):
+        return [row[0] for row in self._conn.execute(
+            'SELECT rowid FROM search WHERE search MATCH ? LIMIT ?', (query, limit)
+        )]
+    
+    def search(self, text, limit=SEARCH_LIMIT):
+        """
+        Positions (dans items) des applications correspondantes: celles dont
+        le nom correspond d'abord; toutes les positions si le texte est vide
+        
+        Args:
+            text: Saisie de l'utilisateur
+            limit: Nombre maximum de résultats (None: tous)
+        """
+        query = fts_query(text)
+        if not query:
+            return list(range(len(self.items)))[:limit]
+        if self.fts_enabled:
+            bound = -1 if limit is None else limit
+            positions = self._match(f'name : ({query})', bound)
+            if limit is None or len(positions) < limit:
+                seen = set(positions)
+                extra_bound = -1 if limit is None else limit + len(positions)
+                positions += [p for p in self._match(query, extra_bound) if p not in seen]
+            if positions:
+                return positions[:limit]
+        needle = fold_text(text.strip())
+        if self._trigrams and len(needle) >= 3:
+            return [row[0] for row in self._conn.execute(
+                'SELECT rowid FROM grams WHERE grams MATCH ? LIMIT ?',
+                ('"' + needle.replace('"', '""') + '"', -1 if limit is None else limit)
+            )]
+        return [position for position, folded in enumerate(self._folded) if needle in folded][:limit]
+
+
+def _timed_calls(func, calls, latencies, errors):
+    """Exécute func(i) `calls` fois et note la durée de chaque appel (ms)"""
+    for i in range(calls):
+        start = time.perf_counter()
+        try:
+            func(i)
+        except sqlite3.Error:
+            errors.append(i)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+def _run_concurrently(read, write, readers, writers, calls):
+    """Lecteurs et écrivains simultanés; retourne {'lecture': [...], 'ecriture': [...], 'erreurs': n}"""
+    reads, writes, errors = [], [], []
+    threads = [threading.Thread(target=_timed_calls, args=(read, calls, reads, errors)) for _ in range(readers)]
+    threads += [threading.Thread(target=_timed_calls, args=(write, calls, writes, errors)) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {'lecture': reads, 'ecriture': writes, 'erreurs': len(errors)}
+
+
+def benchmark(rows=500, calls=300, readers=4, writers=1):
+    """
+    Latence par appel avant (une connexion par appel, journal classique) et
+    après (connexion par thread, WAL), lecteurs et écrivains simultanés
+
+    Returns:
+        dict {'avant': {...}, 'apres': {...}} avec moyenne et p95 en ms
+    """
+    def summarize(result):
+        summary = {'erreurs': result['erreurs']}
+        for kind in ('lecture', 'ecriture'):
+            values = sorted(result[kind]) or [0.0]
+            summary[kind] = {
+                'moyenne': sum(values) / len(values),
+                'p95': values[min(len(values) - 1, int(len(values) * 0.95))]
+            }
+        return summary
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        exe = tmp / 'app.exe'
+        exe.write_bytes(b'MZ' + b'\0' * 1024)
+        names = [f"App {i}" for i in range(rows)]
+
+        db = PortableDatabase(db_path=tmp / 'apres.db', apps_folder=tmp)
+        with db.transaction():
+            for name in names:
+                db.add_application(name, exe, file_hash='0' * 64, category='Test')
+        db.close()
+
+        # Base de référence: même contenu, journal classique, connexion ouverte à chaque appel
+        legacy_path = tmp / 'avant.db'
+        source = sqlite3.connect(tmp / 'apres.db')
+        target = sqlite3.connect(legacy_path)
+        source.backup(target)
+        target.execute('PRAGMA journal_mode=DELETE')
+        source.close()
+        target.close()
+
+        def legacy_read(i):
+            conn = sqlite3.connect(legacy_path)
+            conn.row_factory = sqlite3.Row
+            row = conn.execute('SELECT * FROM applications WHERE name = ?', (names[i % rows],)).fetchone()
+            conn.close()
+            return dict(row)
+
+        def legacy_write(i):
+            conn = sqlite3.connect(legacy_path)
+            conn.execute('UPDATE applications SET notes = ?, last_updated = ? WHERE name = ?',
+                         (str(i), datetime.now().isoformat(), names[i % rows]))
+            conn.commit()
+            conn.close()
+
+        before = _run_concurrently(legacy_read, legacy_write, readers, writers, calls)
+
+        db = PortableDatabase(db_path=tmp / 'apres.db', apps_folder=tmp)
+        after = _run_concurrently(
+            lambda i: db.get_application(name=names[i % rows]),
+            lambda i: db.update_application(names[i % rows], notes=str(i)),
+            readers, writers, calls
+        )
+        db.close()
+
+    return {'avant': summarize(before), 'apres': summarize(after)}
+
+
+def benchmark_import(entries=700, file_size=256 * 1024):
+    """
+    Durée de import_from_json sur un catalogue de `entries` programmes
+    portables, avant (glob et add_application par programme) et après
+    (import groupé)
+
+    Returns:
+        dict {'avant': s, 'apres': s, 'importees': n}
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        downloads = tmp / 'downloads'
+        downloads.mkdir()
+        catalog = {}
+        for i in range(entries):
+            name = f"Outil Portable {i}"
+            catalog.setdefault(f"Catégorie {i % 40}", {})[name] = {
+                'description': f"Programme {i}", 'portable': True, 'winget_id': f"Test.Outil{i}"
+            }
+            (downloads / f"Outil_Portable_{i}_x64.exe").write_bytes(os.urandom(file_size))
+        json_path = tmp / 'programs.json'
+        json_path.write_text(json.dumps(catalog), encoding='utf-8')
+
+        db = PortableDatabase(db_path=tmp / 'avant.db', apps_folder=downloads)
+        start = time.perf_counter()
+        for category, programs in catalog.items():
+            for program_name, program_info in programs.items():
+                exe_files = list(downloads.glob(f"*{program_name.replace(' ', '*')}*.exe"))
+                if not exe_files:
+                    exe_files = list(downloads.glob(f"*{program_name.replace(' ', '')}*.exe"))
+                if exe_files:
+                    db.add_application(
+                        name=program_name, executable_path=str(exe_files[0]), display_name=program_name,
+                        category=category, description=program_info.get('description', ''),
+                        is_portable=True, winget_id=program_info.get('winget_id', '')
+                    )
+        before = time.perf_counter() - start
+        db.close()
+
+        db = PortableDatabase(db_path=tmp / 'apres.db', apps_folder=downloads)
+        start = time.perf_counter()
+        imported = db.import_from_json(json_path, downloads)
+        after = time.perf_counter() - start
+        db.close()
+
+    return {'avant': before, 'apres': after, 'importees': imported}
+
+
+def main(argv=None):
     """Fonction de test et démonstration"""
+    parser = argparse.ArgumentParser(prog='portable_database', description="Base des applications portables")
+    parser.add_argument('--bench', action='store_true', help="Mesurer la latence par appel")
+    parser.add_argument('--bench-import', type=int, nargs='?', const=700, metavar='ENTREES',
+                        help="Mesurer import_from_json sur un catalogue de test")
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--calls', type=int, default=300)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=1)
+    args = parser.parse_args(argv)
+    
+    if args.bench_import:
+        logging.basicConfig(level=logging.WARNING)
+        result = benchmark_import(args.bench_import)
+        print(f"Import de {args.bench_import} programmes portables ({result['importees']} importés)")
+        print(f"  Avant (glob + add_application): {result['avant']:.2f} s")
+        print(f"  Après (import groupé)         : {result['apres']:.2f} s")
+        return 0
+    
+    if args.bench:
+        logging.basicConfig(level=logging.WARNING)
+        result = benchmark(args.rows, args.calls, args.readers, args.writers)
+        print(f"{args.readers} lecteur(s), {args.writers} écrivain(s), {args.calls} appels chacun")
+        for label, key in (("Avant (connexion par appel)", 'avant'), ("Après (connexion par thread, WAL)", 'apres')):
+            data = result[key]
+            print(f"{label}:")
+            for kind in ('lecture', 'ecriture'):
+                print(f"  {kind:9}: moyenne {data[kind]['moyenne']:.3f} ms, p95 {data[kind]['p95']:.3f} ms")
+            print(f"  erreurs  : {data['erreurs']}")
+        return 0
+    
     logging.basicConfig(level=logging.INFO, 
                        format='%(asctime)s - %(levelname)s - %(message)s')
     
@@ -604,7 +1421,8 @@ def main():
         print(f"  Catégorie: {app['category']}")
         print(f"  Chemin: {app['executable_path']}")
         print(f"  Taille: {app['file_size'] / 1024 / 1024:.2f} MB")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
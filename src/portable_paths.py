@@ -137,6 +137,37 @@ def get_portable_logs_dir() -> Path:
     return logs_dir
 
 
+def get_portable_cache_dir(name: str = '') -> Path:
+    """
+    Obtenir le dossier de cache portable
+
+    Crée un dossier 'cache' à côté de l'exe (ex: installateurs téléchargés)
+    pour qu'une clé USB réutilise les fichiers d'un poste à l'autre
+
+    Args:
+        name: Sous-dossier optionnel (ex: 'downloads')
+
+    Returns:
+        Path: Chemin absolu du dossier de cache
+    """
+    cache_dir = get_executable_dir() / 'cache'
+    if name:
+        cache_dir = cache_dir / name
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        logger.debug(f"Dossier cache: {cache_dir}")
+    except Exception as e:
+        logger.warning(f"Impossible de créer {cache_dir}: {e}")
+        # Fallback: utiliser le dossier temp
+        import tempfile
+        cache_dir = Path(tempfile.gettempdir()) / 'nitrite_cache' / name
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        logger.warning(f"Utilisation du fallback: {cache_dir}")
+
+    return cache_dir
+
+
 def is_portable_mode() -> bool:
     """
     Vérifier si on est en mode portable (exe PyInstaller)
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Exécution des installateurs avec progression structurée
+Lit stdout et stderr en parallèle (sans interblocage), découpe les lignes sur
+\\n et \\r (barres de progression de winget), convertit pourcentages et
+compteurs d'octets en événements typés, publiés par callback et/ou file
+avec une limitation de fréquence.
+"""
+
+import os
+import re
+import time
+import queue
+import signal
+import threading
+import subprocess
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, Tuple
+
+# Intervalle minimum entre deux événements de progression (secondes)
+DEFAULT_MIN_INTERVAL = 0.2
+# Après un arrêt forcé: délai de lecture de la sortie restante, puis abandon
+# (un descendant qui a hérité des pipes peut les garder ouverts)
+KILL_GRACE = 2.0
+
+_ANSI_RE = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+_PERCENT_RE = re.compile(r'(\d{1,3}(?:[.,]\d+)?)\s*%')
+_BYTES_RE = re.compile(
+    r'(\d+(?:[.,]\d+)?)\s*([KMGT]?B|[KMGT]?o|octets)\s*/\s*(\d+(?:[.,]\d+)?)\s*([KMGT]?B|[KMGT]?o|octets)',
+    re.IGNORECASE
+)
+_SPINNER_RE = re.compile(r'^[\s\-\\|/]*$')
+
+_UNIT_FACTORS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+# Mots-clés de phase (winget/choco, anglais et français), en minuscules
+PHASE_KEYWORDS = [
+    ('done', ('successfully installed', 'installé correctement', 'correctement installé',
+              'installation réussie', 'has been installed', 'the install of')),
+    ('install', ('starting package install', 'démarrage de l\'installation',
+                 'installing', 'installation du package')),
+    ('verify', ('verified installer hash', 'hachage du programme d\'installation vérifié')),
+    ('download', ('downloading', 'téléchargement')),
+]
+
+
+@dataclass
+class ProgressEvent:
+    """Événement de progression d'un installateur"""
+    kind: str                       # 'progress' ou 'phase'
+    percent: Optional[float] = None
+    downloaded: Optional[int] = None
+    total: Optional[int] = None
+    phase: str = ''                 # 'download', 'verify', 'install', 'done'
+    line: str = ''
+    stream: str = 'stdout'
+
+
+@dataclass
+class ProcessResult:
+    """Résultat d'une exécution"""
+    returncode: int
+    stdout: str = ''
+    stderr: str = ''
+    timed_out: bool = False
+    cancelled: bool = False
+
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0 and not self.timed_out and not self.cancelled
+
+
+def _to_bytes(value: str, unit: str) -> int:
+    unit = unit.upper()
+    prefix = '' if unit in ('B', 'O', 'OCTETS') else unit[0]
+    return int(float(value.replace(',', '.')) * _UNIT_FACTORS.get(prefix, 1))
+
+
+def clean_line(line: str) -> str:
+    """Retire les séquences ANSI et les espaces de fin"""
+    return _ANSI_RE.sub('', line).rstrip()
+
+
+def parse_progress_line(line: str, stream: str = 'stdout') -> Optional[ProgressEvent]:
+    """
+    Convertit une ligne de sortie en événement de progression
+
+    Reconnaît "12.5 MB / 48.0 MB", "45%" et les phases winget/choco.
+
+    Returns:
+        ProgressEvent ou None si la ligne ne contient pas d'information de progression
+    """
+    text = clean_line(line)
+    if not text.strip():
+        return None
+
+    match = _BYTES_RE.search(text)
+    if match:
+        downloaded = _to_bytes(match.group(1), match.group(2))
+        total = _to_bytes(match.group(3), match.group(4))
+        percent = min(100.0, downloaded * 100.0 / total) if total else None
+        return ProgressEvent('progress', percent=percent, downloaded=downloaded,
+                             total=total, phase='download', line=text, stream=stream)
+
+    match = _PERCENT_RE.search(text)
+    if match:
+        percent = float(match.group(1).replace(',', '.'))
+        if 0 <= percent <= 100:
+            return ProgressEvent('progress', percent=percent, line=text, stream=stream)
+
+    lowered = text.lower()
+    for phase, keywords in PHASE_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return ProgressEvent('phase', phase=phase, line=text, stream=stream)
+    return None
+
+
+def iter_stream_lines(pipe, encoding: str = 'utf-8') -> Iterator[Tuple[str, bool]]:
+    """
+    Lit un flux binaire et produit (ligne, est_une_trame)
+
+    Une trame est une ligne terminée par \\r seul (barre de progression
+    réécrite sur place); \\r\\n et \\n terminent des lignes normales.
+    """
+    read = pipe.read1 if hasattr(pipe, 'read1') else pipe.read
+    buffer = b''
+    while True:
+        chunk = read(8192)
+        if not chunk:
+            break
+        buffer += chunk
+        while buffer:
+            positions = [p for p in (buffer.find(b'\r'), buffer.find(b'\n')) if p >= 0]
+            if not positions:
+                break
+            end = min(positions)
+            if buffer[end:end + 1] == b'\r':
+                if end + 1 == len(buffer):
+                    break  # Attendre de savoir si un \n suit
+                if buffer[end + 1:end + 2] == b'\n':
+                    yield buffer[:end].decode(encoding, errors='replace'), False
+                    buffer = buffer[end + 2:]
+                    continue
+                yield buffer[:end].decode(encoding, errors='replace'), True
+            else:
+                yield buffer[:end].decode(encoding, errors='replace'), False
+            buffer = buffer[end + 1:]
+    if buffer:
+        is_frame = buffer.endswith(b'\r')
+        yield buffer.rstrip(b'\r').decode(encoding, errors='replace'), is_frame
+
+
+def kill_process_tree(process):
+    """
+    Tue un processus et ses descendants (msiexec, sous-installateurs...)
+
+    Windows: taskkill /T /F sur l'arbre du processus. Ailleurs: le groupe du
+    processus s'il en est le chef (lancé avec start_new_session).
+    """
+    if process is None or process.poll() is not None:
+        return
+    try:
+        if os.name == 'nt':
+            subprocess.run(
+                ['taskkill', '/PID', str(process.pid), '/T', '/F'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                timeout=10, creationflags=subprocess.CREATE_NO_WINDOW
+            )
+        elif os.getpgid(process.pid) == process.pid:
+            os.killpg(process.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        pass
+    try:
+        if process.poll() is None:
+            process.kill()
+    except OSError:
+        pass
+
+
+class ProcessRunner:
+    """
+    Exécuteur de sous-processus partagé par les installateurs
+
+    Les lecteurs stdout/stderr tournent dans des threads; les callbacks sont
+    appelés depuis le thread qui exécute `run()`.
+    """
+
+    def __init__(
+        self,
+        progress_callback: Optional[Callable[[ProgressEvent], None]] = None,
+        line_callback: Optional[Callable[[str, str], None]] = None,
+        event_queue: Optional[queue.Queue] = None,
+        min_interval: float = DEFAULT_MIN_INTERVAL
+    ):
+        """
+        Args:
+            progress_callback: Fonction (ProgressEvent) appelée à chaque événement retenu
+            line_callback: Fonction (stream, ligne) appelée pour chaque ligne complète
+            event_queue: File recevant aussi les ProgressEvent (consommateur externe)
+            min_interval: Intervalle minimum entre deux événements 'progress'
+        """
+        self.progress_callback = progress_callback
+        self.line_callback = line_callback
+        self.event_queue = event_queue
+        self.min_interval = min_interval
+        self.process = None
+        self._cancelled = False
+        self._last_emit = 0.0
+        self._last_percent = None
+
+    def _publish(self, event: ProgressEvent):
+        """Publie un événement en limitant la fréquence des mises à jour de pourcentage"""
+        if event.kind == 'progress':
+            now = time.monotonic()
+            final = event.percent is not None and event.percent >= 100
+            if not final and (now - self._last_emit) < self.min_interval:
+                return
+            if event.percent is not None and event.percent == self._last_percent:
+                return
+            self._last_emit = now
+            self._last_percent = event.percent
+        if self.progress_callback:
+            self.progress_callback(event)
+        if self.event_queue is not None:
+            self.event_queue.put(event)
+
+    def feed(self, stream: str, line: str, is_frame: bool = False):
+        """Traite une ligne (utilisable aussi pour une sortie relayée, ex. courtier d'élévation)"""
+        event = parse_progress_line(line, stream)
+        if event is not None:
+            self._publish(event)
+        text = clean_line(line)
+        if not is_frame and self.line_callback and text and not _SPINNER_RE.match(text):
+            self.line_callback(stream, text)
+
+    def _reader(self, pipe, stream: str, lines: queue.Queue):
+        try:
+            for line, is_frame in iter_stream_lines(pipe):
+                lines.put((stream, line, is_frame))
+        finally:
+            pipe.close()
+            lines.put((stream, None, False))
+
+    def run(self, cmd, timeout: Optional[float] = None, cwd=None, env=None,
+            creationflags: Optional[int] = None, startupinfo=None,
+            on_start: Optional[Callable] = None) -> ProcessResult:
+        """
+        Exécute une commande jusqu'à sa fin, son timeout ou son annulation
+
+        Args:
+            cmd: Commande (liste)
+            timeout: Timeout global en secondes
+            cwd, env, startupinfo: Transmis à Popen
+            creationflags: Par défaut CREATE_NO_WINDOW sous Windows
+            on_start: Fonction (Popen) appelée dès le lancement du processus
+
+        Raises:
+            OSError: si l'exécutable ne peut pas être lancé
+        """
+        if creationflags is None:
+            creationflags = subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        self._cancelled = False
+        self._last_emit = 0.0
+        self._last_percent = None
+
+        self.process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.DEVNULL,
+            cwd=cwd,
+            env=env,
+            startupinfo=startupinfo,
+            creationflags=creationflags,
+            # Groupe propre hors Windows: l'arbre entier peut être tué
+            start_new_session=os.name != 'nt'
+        )
+        if on_start:
+            on_start(self.process)
+
+        lines: queue.Queue = queue.Queue()
+        readers = [
+            threading.Thread(target=self._reader, args=(self.process.stdout, 'stdout', lines), daemon=True),
+            threading.Thread(target=self._reader, args=(self.process.stderr, 'stderr', lines), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        output = {'stdout': [], 'stderr': []}
+        deadline = time.monotonic() + timeout if timeout else None
+        open_streams = 2
+        timed_out = False
+        killed_at = None
+        while open_streams:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline and not timed_out:
+                timed_out = True
+                self._kill()
+            if killed_at is None and (timed_out or self._cancelled):
+                killed_at = now
+            if killed_at is not None and now - killed_at >= KILL_GRACE:
+                break  # Pipes gardés ouverts par un descendant: ne plus attendre
+            try:
+                stream, line, is_frame = lines.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if line is None:
+                open_streams -= 1
+                continue
+            if not is_frame:
+                output[stream].append(line)
+            self.feed(stream, line, is_frame)
+
+        try:
+            if killed_at is not None:
+                self.process.wait(timeout=KILL_GRACE)
+            else:
+                remaining = max(0.1, deadline - time.monotonic()) if deadline else None
+                self.process.wait(timeout=remaining)
+        except subprocess.TimeoutExpired:
+            if killed_at is None:
+                timed_out = True
+                self._kill()
+                try:
+                    self.process.wait(timeout=KILL_GRACE)
+                except subprocess.TimeoutExpired:
+                    pass
+
+        returncode = self.process.returncode
+        return ProcessResult(
+            returncode=-1 if timed_out or returncode is None else returncode,
+            stdout='\n'.join(output['stdout']),
+            stderr='\n'.join(output['stderr']),
+            timed_out=timed_out,
+            cancelled=self._cancelled
+        )
+
+    def _kill(self):
+        kill_process_tree(self.process)
+
+    def cancel(self):
+        """Interrompt le processus en cours"""
+        self._cancelled = True
+        self._kill()
@@ -17,6 +17,12 @@ try:
 except ImportError:
     from portable_paths import get_portable_config_dir
 
+# Inventaire partagé des logiciels installés
+try:
+    from .installed_inventory import get_inventory
+except ImportError:
+    from installed_inventory import get_inventory
+
 logger = logging.getLogger(__name__)
 
 
@@ -350,125 +356,26 @@ class SystemScanner:
         installed = set()
 
         try:
-            # Scanner le registre Windows (méthode 1)
-            installed.update(self._scan_registry())
-
-            # Scanner Program Files (méthode 2)
-            installed.update(self._scan_program_files())
-
-            # Scanner avec WinGet (méthode 3)
-            installed.update(self._scan_winget())
+            # Instantané partagé: registre, Program Files et WinGet en une passe
+            inventory = get_inventory()
+            installed.update(inventory.names())
+            installed.update(entry.winget_id for entry in inventory.entries if entry.winget_id)
 
         except Exception as e:
             self.logger.error(f"Erreur lors du scan des applications : {e}")
 
         return installed
 
-    def _scan_registry(self) -> Set[str]:
-        """Scanner le registre Windows pour les applications installées"""
-        installed = set()
-
-        if not hasattr(os, 'name') or os.name != 'nt':
-            return installed
-
-        try:
-            import winreg
-
-            registry_paths = [
-                (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-                (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
-                (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-            ]
-
-            for hkey, path in registry_paths:
-                try:
-                    key = winreg.OpenKey(hkey, path)
-                    for i in range(winreg.QueryInfoKey(key)[0]):
-                        try:
-                            subkey_name = winreg.EnumKey(key, i)
-                            subkey = winreg.OpenKey(key, subkey_name)
-                            try:
-                                name = winreg.QueryValueEx(subkey, "DisplayName")[0]
-                                installed.add(name)
-                            except:
-                                pass
-                            winreg.CloseKey(subkey)
-                        except:
-                            pass
-                    winreg.CloseKey(key)
-                except:
-                    pass
-
-        except Exception as e:
-            self.logger.warning(f"Erreur lors du scan du registre : {e}")
-
-        return installed
-
-    def _scan_program_files(self) -> Set[str]:
-        """Scanner les dossiers Program Files"""
-        installed = set()
-
-        program_paths = [
-            Path(os.environ.get('ProgramFiles', 'C:\\Program Files')),
-            Path(os.environ.get('ProgramFiles(x86)', 'C:\\Program Files (x86)')),
-            Path(os.environ.get('LocalAppData', '')) / 'Programs'
-        ]
-
-        for path in program_paths:
-            if path.exists():
-                try:
-                    for item in path.iterdir():
-                        if item.is_dir():
-                            installed.add(item.name)
-                except Exception as e:
-                    self.logger.warning(f"Erreur lors du scan de {path} : {e}")
-
-        return installed
-
-    def _scan_winget(self) -> Set[str]:
-        """Scanner avec WinGet list"""
-        installed = set()
-
-        try:
-            import subprocess
-            result = subprocess.run(
-                ['winget', 'list'],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode == 0:
-                lines = result.stdout.split('\n')
-                for line in lines[2:]:  # Skip header
-                    if line.strip():
-                        parts = line.split()
-                        if parts:
-                            installed.add(parts[0])
-
-        except Exception as e:
-            self.logger.warning(f"Erreur lors du scan WinGet : {e}")
-
-        return installed
-
     def find_missing_apps(self, desired_apps: List[str], programs_data: Dict) -> List[str]:
         """Trouver les applications manquantes par rapport à une liste désirée"""
-        installed = self.get_installed_apps()
-        installed_lower = {app.lower() for app in installed}
+        # Index de noms prébâti par l'inventaire (tokens + trigrammes)
+        inventory = get_inventory()
 
         missing = []
         for app_name in desired_apps:
-            # Vérifier si l'app est installée (recherche insensible à la casse)
-            if app_name.lower() not in installed_lower:
-                # Vérifier aussi les variantes du nom
-                found = False
-                for installed_name in installed_lower:
-                    if app_name.lower() in installed_name or installed_name in app_name.lower():
-                        found = True
-                        break
-
-                if not found:
-                    missing.append(app_name)
+            # Vérifier si l'app est installée (nom exact ou variante proche)
+            if inventory.best_match(app_name) is None:
+                missing.append(app_name)
 
         return missing
 
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Journal d'écriture anticipée de la base des programmes
+Les modifications de programs.json (ajout, mise à jour, suppression d'une
+entrée) sont ajoutées à un petit journal JSON Lines au lieu de réécrire tout
+le fichier; la vue courante est programs.json + les opérations du journal.
+Le journal est compacté dans programs.json par lots, par remplacement
+atomique d'un fichier temporaire.
+
+Chaque ligne du journal est une transaction complète ({"ops": [...]}): une
+ligne tronquée par un arrêt brutal est ignorée en entier à la relecture.
+"""
+
+import os
+import json
+import atexit
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from .catalog_service import get_catalog_service
+except ImportError:
+    from catalog_service import get_catalog_service
+
+logger = logging.getLogger(__name__)
+
+# Opérations journalisées avant compaction automatique
+COMPACT_THRESHOLD = 64
+
+OP_SET = 'set'
+OP_UPDATE = 'update'
+OP_DELETE = 'delete'
+
+
+def write_json_atomic(path: Path, data, indent: int = 4):
+    """Écrit un fichier JSON via un fichier temporaire (jamais de fichier à moitié écrit)"""
+    path = Path(path)
+    tmp_file = path.with_name(path.name + '.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+def apply_ops(programs_db: Dict, ops: List[Dict]) -> Dict:
+    """
+    Applique des opérations sur une copie superficielle de la base
+
+    Les entrées non modifiées restent partagées avec programs_db.
+    """
+    view = dict(programs_db)
+    for op in ops:
+        key = op.get('id')
+        kind = op.get('op')
+        if kind == OP_SET:
+            view[key] = op.get('info')
+        elif kind == OP_UPDATE and isinstance(view.get(key), dict):
+            view[key] = dict(view[key], **op.get('info', {}))
+        elif kind == OP_DELETE:
+            view.pop(key, None)
+    return view
+
+
+class ProgramsJournal:
+    """Vue journalisée d'un fichier programs.json (partagée par chemin)"""
+
+    def __init__(self, programs_file, compact_threshold: int = COMPACT_THRESHOLD):
+        self.programs_file = Path(programs_file).resolve()
+        self.journal_file = self.programs_file.with_name(self.programs_file.name + '.journal')
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._ops: Optional[List[Dict]] = None
+        self._view = None
+        self._view_base = None
+
+    def _load_ops(self) -> List[Dict]:
+        """Relit le journal (reprise après un arrêt avant compaction)"""
+        ops = []
+        if not self.journal_file.exists():
+            return ops
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    ops.extend(json.loads(line)['ops'])
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"⚠️ Transaction incomplète ignorée ({self.journal_file.name}:{line_number})")
+        if ops:
+            logger.info(f"📒 {len(ops)} modification(s) de programmes rejouée(s) depuis le journal")
+        return ops
+
+    @property
+    def ops(self) -> List[Dict]:
+        with self._lock:
+            if self._ops is None:
+                self._ops = self._load_ops()
+            return self._ops
+
+    @property
+    def pending(self) -> int:
+        """Opérations pas encore compactées dans programs.json"""
+        return len(self.ops)
+
+    def view(self, base: Dict) -> Dict:
+        """Base + journal (mise en cache tant que ni l'une ni l'autre ne change)"""
+        with self._lock:
+            ops = self.ops
+            if not ops:
+                return base
+            if self._view is None or self._view_base is not base:
+                self._view = apply_ops(base, ops)
+                self._view_base = base
+            return self._view
+
+    def append(self, ops: List[Dict], base_loader=None):
+        """
+        Ajoute une transaction au journal (écrite et synchronisée sur disque)
+
+        Args:
+            ops: Opérations de la transaction
+            base_loader: Fonction retournant la base, pour la compaction automatique
+        """
+        if not ops:
+            return
+        line = (json.dumps({'ops': ops}, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock:
+            current = self.ops
+            with open(self.journal_file, 'a+b') as f:
+                # Dernière ligne tronquée par un arrêt brutal: la terminer, sinon
+                # cette transaction lui serait accolée et ignorée avec elle
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        line = b'\n' + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            current.extend(ops)
+            self._view = None
+            if base_loader is not None and len(current) >= self.compact_threshold:
+                self.compact(base_loader())
+
+    def compact(self, base: Dict) -> bool:
+        """Intègre le journal dans programs.json puis le vide"""
+        with self._lock:
+            if not self.ops:
+                # Journal ne contenant que des transactions incomplètes
+                self.journal_file.unlink(missing_ok=True)
+                return False
+            self.replace(self.view(base))
+            return True
+
+    def replace(self, programs_db: Dict):
+        """Remplace tout programs.json (atomique) et vide le journal"""
+        with self._lock:
+            try:
+                write_json_atomic(self.programs_file, programs_db)
+                # Après le remplacement: un arrêt entre les deux rejoue un journal idempotent
+                self.journal_file.unlink(missing_ok=True)
+                self._ops = []
+                self._view = None
+                self._view_base = None
+            finally:
+                get_catalog_service(self.programs_file).invalidate()
+
+
+_journals: Dict[str, ProgramsJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_programs_journal(programs_file) -> ProgramsJournal:
+    """Journal partagé d'un fichier programs.json (un seul par chemin et par processus)"""
+    path = Path(programs_file).resolve()
+    with _journals_lock:
+        journal = _journals.get(str(path))
+        if journal is None:
+            journal = _journals[str(path)] = ProgramsJournal(path)
+        return journal
+
+
+@atexit.register
+def _compact_all():
+    """Compaction des journaux à la fermeture de l'application"""
+    for journal in list(_journals.values()):
+        try:
+            if journal.pending and journal.programs_file.exists():
+                journal.compact(get_catalog_service(journal.programs_file).get().categorized)
+        except Exception as e:
+            logger.warning(f"⚠️ Compaction de {journal.journal_file.name} impossible: {e}")
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Découverte des outils externes (winget, chocolatey)
+La présence d'un outil est déterminée par une recherche dans le PATH, sans
+lancer de processus. La version (`outil --version`, parfois plusieurs
+secondes au premier lancement de winget) est sondée en arrière-plan et
+mise en cache entre deux lancements de l'application, tant que
+l'exécutable n'a pas changé (chemin et date de modification) et que le
+délai de validité n'est pas écoulé.
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import threading
+import subprocess
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, Optional
+
+try:
+    from .portable_paths import get_portable_cache_dir
+except ImportError:
+    from portable_paths import get_portable_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Outils connus: {nom: commande de version}
+KNOWN_TOOLS = {
+    'winget': ['--version'],
+    'choco': ['--version'],
+}
+# Validité d'une version sondée (secondes)
+CACHE_TTL = 24 * 3600
+PROBE_TIMEOUT = 15
+
+
+@dataclass
+class ToolInfo:
+    """État connu d'un outil"""
+    name: str
+    path: str = ''                 # '' si introuvable dans le PATH
+    mtime: float = 0.0             # Date de modification de l'exécutable sondé
+    version: str = ''
+    working: Optional[bool] = None  # None tant que la sonde n'a pas répondu
+    checked: float = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Présent dans le PATH et pas en échec lors de la dernière sonde"""
+        return bool(self.path) and self.working is not False
+
+
+def _executable_mtime(path: str) -> float:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+
+class ToolDiscovery:
+    """Annuaire des outils externes avec sondes de version en arrière-plan"""
+
+    def __init__(self, cache_file=None, ttl: float = CACHE_TTL):
+        """
+        Args:
+            cache_file: Fichier JSON du cache (par défaut cache/tools/tools.json)
+            ttl: Durée de validité d'une version sondée
+        """
+        if cache_file is None:
+            cache_file = get_portable_cache_dir('tools') / 'tools.json'
+        self.cache_file = Path(cache_file)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tools: Dict[str, ToolInfo] = {}
+        self._probing: Dict[str, threading.Event] = {}
+        self._cached = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ Cache des outils illisible, réinitialisation: {e}")
+        return {}
+
+    def _save(self):
+        """Sauvegarde le cache (écriture atomique)"""
+        with self._lock:
+            self._cached.update((name, asdict(info)) for name, info in self._tools.items() if info.checked)
+            data = json.dumps(self._cached, indent=2, ensure_ascii=False)
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning(f"⚠️ Cache des outils non enregistré: {e}")
+
+    def _resolve(self, name: str) -> ToolInfo:
+        """Recherche PATH + version en cache si l'exécutable n'a pas changé"""
+        path = shutil.which(name) or ''
+        info = ToolInfo(name=name, path=path)
+        if not path:
+            return info
+        info.mtime = _executable_mtime(path)
+        cached = self._cached.get(name)
+        if (cached and cached.get('path') == path and cached.get('mtime') == info.mtime
+                and time.time() - cached.get('checked', 0) < self.ttl):
+            info.version = cached.get('version', '')
+            info.working = cached.get('working')
+            info.checked = cached.get('checked', 0)
+        return info
+
+    def find(self, name: str, probe: bool = True) -> ToolInfo:
+        """
+        État d'un outil, sans jamais attendre de processus
+
+        Args:
+            name: Nom de l'exécutable (winget, choco...)
+            probe: Lancer une sonde de version en arrière-plan si aucune n'est valide
+        """
+        with self._lock:
+            info = self._tools.get(name)
+            if info is None:
+                info = self._tools[name] = self._resolve(name)
+        if probe and info.path and not info.checked:
+            self.probe_async([name])
+        return info
+
+    def available(self, name: str) -> bool:
+        return self.find(name).available
+
+    def executable(self, name: str) -> Optional[str]:
+        """Chemin de l'outil, ou None s'il est indisponible"""
+        info = self.find(name)
+        return info.path if info.available else None
+
+    def _probe(self, name: str, done: threading.Event):
+        info = self.find(name, probe=False)
+        try:
+            result = subprocess.run(
+                [info.path] + KNOWN_TOOLS.get(name, ['--version']),
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                errors='ignore',
+                timeout=PROBE_TIMEOUT,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            )
+            working = result.returncode == 0
+            lines = (result.stdout or '').strip().splitlines()
+            version = lines[0] if working and lines else ''
+        except subprocess.TimeoutExpired:
+            # Outil présent mais lent: ne pas le déclarer en échec
+            working, version = None, ''
+        except OSError as e:
+            logger.debug(f"Sonde de {name} impossible: {e}")
+            working, version = False, ''
+
+        with self._lock:
+            current = self._tools.get(name)
+            if current is not None and current.path == info.path:
+                current.version = version
+                current.working = working
+                current.checked = time.time() if working is not None else 0.0
+            self._probing.pop(name, None)
+        if working:
+            logger.info(f"✅ {name} disponible: {version}")
+        elif working is False:
+            logger.warning(f"⚠️ {name} présent mais inutilisable: {info.path}")
+        self._save()
+        done.set()
+
+    def probe_async(self, names: Optional[Iterable[str]] = None) -> Dict[str, threading.Event]:
+        """
+        Sonde la version des outils en arrière-plan
+
+        Returns:
+            dict: {nom: Event signalé à la fin de la sonde}
+        """
+        events = {}
+        for name in (names or KNOWN_TOOLS):
+            info = self.find(name, probe=False)
+            if not info.path:
+                continue
+            with self._lock:
+                event = self._probing.get(name)
+                if event is None:
+                    if info.checked:
+                        continue
+                    event = self._probing[name] = threading.Event()
+                    threading.Thread(target=self._probe, args=(name, event), daemon=True,
+                                     name=f"nitrite-probe-{name}").start()
+            events[name] = event
+        return events
+
+    def version(self, name: str, timeout: Optional[float] = None) -> str:
+        """Version de l'outil, en attendant la sonde au plus `timeout` secondes"""
+        event = self.probe_async([name]).get(name)
+        if event is not None:
+            event.wait(timeout)
+        return self.find(name, probe=False).version
+
+    def invalidate(self, name: Optional[str] = None):
+        """Oublie l'état d'un outil (ou de tous), après son installation par exemple"""
+        with self._lock:
+            if name is None:
+                self._tools.clear()
+                self._cached.clear()
+            else:
+                self._tools.pop(name, None)
+                self._cached.pop(name, None)
+
+
+_discovery: Optional[ToolDiscovery] = None
+_discovery_lock = threading.Lock()
+
+
+def get_tool_discovery() -> ToolDiscovery:
+    """Annuaire des outils partagé par toute l'application"""
+    global _discovery
+    with _discovery_lock:
+        if _discovery is None:
+            _discovery = ToolDiscovery()
+        return _discovery
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Service de détection des mises à jour winget
+`winget upgrade` est exécuté hors du thread de l'interface, sa sortie est
+convertie en enregistrements (id, version installée, version disponible,
+source) mis en cache avec un délai de validité, et chaque analyse est
+comparée à la précédente pour n'afficher que les changements. Les mises à
+jour sélectionnées sont appliquées par lots, paquet par paquet, au lieu
+d'un unique `winget upgrade --all` bloquant.
+
+Sans winget, la détection se replie sur le catalogue: la version installée
+(DisplayVersion du registre, via l'inventaire) est comparée au champ
+`latest_version` des programmes de programs.json, hors ligne.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import subprocess
+from pathlib import Path
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+try:
+    from .winget_parser import parse_winget_table
+    from .winget_session import get_winget_session, _default_runner
+    from .portable_paths import get_portable_cache_dir
+    from .version_compare import parse_version
+    from .catalog_service import get_catalog
+    from .installed_inventory import get_inventory, normalize_name
+    from .name_matcher import DEFAULT_MIN_SCORE
+except ImportError:
+    from winget_parser import parse_winget_table
+    from winget_session import get_winget_session, _default_runner
+    from portable_paths import get_portable_cache_dir
+    from version_compare import parse_version
+    from catalog_service import get_catalog
+    from installed_inventory import get_inventory, normalize_name
+    from name_matcher import DEFAULT_MIN_SCORE
+
+logger = logging.getLogger(__name__)
+
+# Validité d'une analyse en cache (secondes)
+CACHE_TTL = 15 * 60
+SCAN_TIMEOUT = 180
+UPGRADE_TIMEOUT = 1800
+DEFAULT_BATCH_SIZE = 5
+# Caractère ajouté par winget aux colonnes tronquées
+TRUNCATION_MARK = '…'
+# Source des enregistrements détectés hors ligne à partir du catalogue
+CATALOG_SOURCE = 'catalogue'
+# Sources de l'inventaire portant une version installée
+VERSIONED_SOURCES = ('registry', 'winget')
+
+
+@dataclass(frozen=True)
+class UpdateRecord:
+    """Mise à jour disponible pour un paquet"""
+    id: str
+    name: str = ''
+    installed_version: str = ''
+    available_version: str = ''
+    source: str = ''
+
+    @property
+    def truncated(self) -> bool:
+        """Identifiant coupé par winget (inutilisable avec --id)"""
+        return self.id.endswith(TRUNCATION_MARK)
+
+
+@dataclass
+class UpdateDiff:
+    """Différences entre deux analyses"""
+    added: List[UpdateRecord] = field(default_factory=list)
+    removed: List[UpdateRecord] = field(default_factory=list)
+    changed: List[UpdateRecord] = field(default_factory=list)   # Nouvelle version disponible
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self) -> str:
+        parts = []
+        if self.added:
+            parts.append(f"{len(self.added)} nouvelle(s)")
+        if self.changed:
+            parts.append(f"{len(self.changed)} version(s) plus récente(s)")
+        if self.removed:
+            parts.append(f"{len(self.removed)} appliquée(s) ou retirée(s)")
+        return ', '.join(parts) or 'aucun changement'
+
+
+@dataclass
+class UpdateScan:
+    """Résultat d'une analyse"""
+    records: List[UpdateRecord] = field(default_factory=list)
+    scanned_at: float = 0.0
+    from_cache: bool = False
+    diff: UpdateDiff = field(default_factory=UpdateDiff)
+    error: str = ''
+    offline: bool = False       # Versions comparées au catalogue (winget absent)
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+def diff_scans(previous: Iterable[UpdateRecord], current: Iterable[UpdateRecord]) -> UpdateDiff:
+    """Compare deux listes de mises à jour (par identifiant)"""
+    before = {record.id.lower(): record for record in previous}
+    after = {record.id.lower(): record for record in current}
+    return UpdateDiff(
+        added=[record for key, record in after.items() if key not in before],
+        removed=[record for key, record in before.items() if key not in after],
+        changed=[record for key, record in after.items()
+                 if key in before and before[key].available_version != record.available_version]
+    )
+
+
+def parse_upgrade_output(output: str) -> List[UpdateRecord]:
+    """Convertit la sortie de `winget upgrade` en enregistrements"""
+    return [
+        UpdateRecord(
+            id=row['id'],
+            name=row.get('name', ''),
+            installed_version=row.get('version', ''),
+            available_version=row.get('available', ''),
+            source=row.get('source', '')
+        )
+        for row in parse_winget_table(output)
+        if row.get('available')
+    ]
+
+
+def _installed_entry(inventory, name: str, winget_id: str, min_score: float):
+    """Entrée de l'inventaire (avec version) correspondant à un programme du catalogue"""
+    if winget_id:
+        entry = inventory.by_winget_id.get(winget_id.lower())
+        if entry is not None and entry.version:
+            return entry
+    for entry in inventory.by_normalized_name.get(normalize_name(name), ()):
+        if entry.source in VERSIONED_SOURCES and entry.version:
+            return entry
+    for entry in inventory.find_by_name(name, VERSIONED_SOURCES, min_score):
+        if entry.version:
+            return entry
+    return None
+
+
+def find_catalog_updates(catalog=None, inventory=None,
+                         min_score: float = DEFAULT_MIN_SCORE) -> List[UpdateRecord]:
+    """
+    Programmes installés plus anciens que le `latest_version` du catalogue
+
+    Détection entièrement hors ligne: aucune commande n'est lancée. Les
+    programmes sans `latest_version`, non installés ou dont la version n'est
+    pas analysable sont ignorés.
+
+    Args:
+        catalog: Catalogue (catalogue partagé par défaut)
+        inventory: Inventaire des logiciels installés (partagé par défaut;
+                   FixtureInventoryBackend pour les tests)
+        min_score: Score minimum de correspondance des noms
+    """
+    catalog = catalog if catalog is not None else get_catalog()
+    inventory = inventory if inventory is not None else get_inventory()
+    records = []
+    for name, info in catalog.flat.items():
+        latest = parse_version(info.get('latest_version'))
+        if latest is None:
+            continue
+        winget_id = info.get('winget_id', '')
+        entry = _installed_entry(inventory, name, winget_id, min_score)
+        if entry is None:
+            continue
+        installed = parse_version(entry.version)
+        if installed is not None and installed < latest:
+            records.append(UpdateRecord(
+                id=winget_id or name,
+                name=name,
+                installed_version=entry.version,
+                available_version=info['latest_version'],
+                source=CATALOG_SOURCE
+            ))
+    return records
+
+
+class UpdateService:
+    """Analyse et application des mises à jour winget"""
+
+    def __init__(self, session=None, cache_file=None, ttl: float = CACHE_TTL,
+                 runner: Optional[Callable] = None, catalog=None, inventory=None):
+        """
+        Args:
+            session: Session winget (session partagée par défaut)
+            cache_file: Fichier JSON du cache (par défaut cache/updates/updates.json)
+            ttl: Durée de validité d'une analyse
+            runner: Fonction (cmd, timeout) -> (success, returncode, stdout, stderr)
+            catalog: Catalogue de la détection hors ligne (partagé par défaut)
+            inventory: Inventaire de la détection hors ligne (partagé par défaut)
+        """
+        if cache_file is None:
+            cache_file = get_portable_cache_dir('updates') / 'updates.json'
+        self.session = session
+        self.cache_file = Path(cache_file)
+        self.ttl = ttl
+        self.runner = runner or _default_runner
+        self.catalog = catalog
+        self.inventory = inventory
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        self._last = self._load()
+
+    def _winget(self):
+        return self.session or get_winget_session()
+
+    def _load(self) -> Optional[UpdateScan]:
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                return UpdateScan(records=[UpdateRecord(**record) for record in data.get('records', [])],
+                                  scanned_at=data.get('scanned_at', 0.0), from_cache=True,
+                                  offline=data.get('offline', False))
+        except Exception as e:
+            logger.warning(f"⚠️ Cache des mises à jour illisible, réinitialisation: {e}")
+        return None
+
+    def _save(self, scan: UpdateScan):
+        """Sauvegarde la dernière analyse (écriture atomique)"""
+        data = json.dumps({'scanned_at': scan.scanned_at, 'offline': scan.offline,
+                           'records': [asdict(r) for r in scan.records]},
+                          indent=2, ensure_ascii=False)
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning(f"⚠️ Cache des mises à jour non enregistré: {e}")
+
+    @property
+    def last_scan(self) -> Optional[UpdateScan]:
+        with self._lock:
+            return self._last
+
+    def scan(self, refresh: bool = False, timeout: float = SCAN_TIMEOUT) -> UpdateScan:
+        """
+        Liste les mises à jour disponibles (bloquant: à appeler hors de l'interface)
+
+        Args:
+            refresh: Ignorer le cache et relancer winget
+            timeout: Délai maximum de `winget upgrade`
+
+        Sans winget, les versions installées sont comparées au catalogue
+        (scan.offline est alors vrai).
+        """
+        with self._scan_lock:
+            previous = self.last_scan
+            if not refresh and previous and time.time() - previous.scanned_at < self.ttl:
+                return UpdateScan(records=previous.records, scanned_at=previous.scanned_at, from_cache=True,
+                                  offline=previous.offline)
+
+            session = self._winget()
+            if not session.available:
+                return self._store(previous, self._catalog_records(refresh), offline=True)
+            try:
+                success, returncode, stdout, stderr = self.runner(
+                    [session.executable, 'upgrade', '--accept-source-agreements', '--disable-interactivity'],
+                    timeout
+                )
+            except subprocess.TimeoutExpired:
+                return UpdateScan(error=f"winget upgrade ne répond pas après {int(timeout)} s")
+            except OSError as e:
+                return UpdateScan(error=str(e))
+
+            records = parse_upgrade_output(stdout or '')
+            # winget retourne un code non nul quand aucune mise à jour n'est trouvée (message sur stdout)
+            if not success and not (stdout or '').strip():
+                return UpdateScan(error=(stderr or '').strip() or f"Erreur winget (code {returncode})")
+
+            return self._store(previous, records)
+
+    def _catalog_records(self, refresh: bool) -> List[UpdateRecord]:
+        """Détection hors ligne: inventaire local comparé au catalogue"""
+        inventory = self.inventory
+        if inventory is None:
+            inventory = get_inventory(refresh=refresh, max_age=self.ttl)
+        return find_catalog_updates(self.catalog, inventory)
+
+    def _store(self, previous: Optional[UpdateScan], records: List[UpdateRecord],
+               offline: bool = False) -> UpdateScan:
+        """Mémorise une analyse et la compare à la précédente"""
+        scan = UpdateScan(records=records, scanned_at=time.time(), offline=offline,
+                          diff=diff_scans(previous.records if previous else [], records))
+        with self._lock:
+            self._last = scan
+        self._save(scan)
+        mode = " d'après le catalogue" if offline else ''
+        logger.info(f"🔄 {len(records)} mise(s) à jour disponible(s){mode} ({scan.diff.summary()})")
+        return scan
+
+    def scan_async(self, callback: Callable[[UpdateScan], None], refresh: bool = False) -> threading.Thread:
+        """
+        Analyse en arrière-plan; callback(scan) est appelé depuis le thread de travail
+        (l'interface doit repasser par after() pour modifier ses widgets)
+        """
+        def worker():
+            try:
+                scan = self.scan(refresh=refresh)
+            except Exception as e:
+                logger.exception("Analyse des mises à jour en erreur")
+                scan = UpdateScan(error=str(e))
+            callback(scan)
+
+        thread = threading.Thread(target=worker, daemon=True, name="nitrite-updates-scan")
+        thread.start()
+        return thread
+
+    def upgrade(self, ids: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE,
+                log_callback: Optional[Callable[[str], None]] = None,
+                progress_callback: Optional[Callable[[int, int], None]] = None,
+                stop_event: Optional[threading.Event] = None,
+                timeout: float = UPGRADE_TIMEOUT) -> Dict[str, bool]:
+        """
+        Met à jour des paquets par lots (bloquant: à appeler hors de l'interface)
+
+        Chaque paquet est mis à jour par sa propre commande `winget upgrade --id`;
+        les caches sont rafraîchis à la fin de chaque lot, et stop_event
+        interrompt le traitement entre deux paquets.
+
+        Returns:
+            dict: {id: succès} pour les paquets traités
+        """
+        log = log_callback or (lambda message: None)
+        session = self._winget()
+        ids = list(dict.fromkeys(i for i in ids if i))
+        results: Dict[str, bool] = {}
+        if not session.available:
+            log("❌ WinGet non trouvé. Installez-le depuis le Microsoft Store.")
+            return results
+
+        batch_size = max(1, int(batch_size))
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            log(f"📦 Lot {start // batch_size + 1}: {', '.join(batch)}")
+            for package_id in batch:
+                if stop_event is not None and stop_event.is_set():
+                    log("⏹️ Mise à jour interrompue")
+                    return results
+                if package_id.endswith(TRUNCATION_MARK):
+                    log(f"⚠️ {package_id}: identifiant tronqué par winget, mise à jour ignorée")
+                    results[package_id] = False
+                else:
+                    results[package_id] = self._upgrade_one(session, package_id, timeout, log)
+                if progress_callback:
+                    progress_callback(len(results), len(ids))
+            self._forget(package_id for package_id, ok in results.items() if ok)
+            session.invalidate()
+        return results
+
+    def _upgrade_one(self, session, package_id: str, timeout: float, log) -> bool:
+        cmd = [session.executable, 'upgrade', '--id', package_id, '--exact', '--silent',
+               '--accept-source-agreements', '--accept-package-agreements', '--disable-interactivity']
+        try:
+            success, returncode, _, stderr = self.runner(cmd, timeout)
+        except (subprocess.TimeoutExpired, OSError) as e:
+            success, returncode, stderr = False, None, str(e)
+        if success:
+            log(f"✅ {package_id} mis à jour")
+        else:
+            log(f"❌ {package_id}: échec (code {returncode}) {(stderr or '').strip()[:200]}")
+        return bool(success)
+
+    def _forget(self, ids: Iterable[str]):
+        """Retire de la dernière analyse les paquets mis à jour"""
+        done = {package_id.lower() for package_id in ids}
+        if not done:
+            return
+        with self._lock:
+            if self._last is None:
+                return
+            records = [record for record in self._last.records if record.id.lower() not in done]
+            self._last = UpdateScan(records=records, scanned_at=self._last.scanned_at, from_cache=True,
+                                    offline=self._last.offline)
+            scan = self._last
+        self._save(scan)
+
+
+_service: Optional[UpdateService] = None
+_service_lock = threading.Lock()
+
+
+def get_update_service() -> UpdateService:
+    """Service de mises à jour partagé"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = UpdateService()
+        return _service
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='update_service',
+                                     description="Détection hors ligne des mises à jour (catalogue)")
+    parser.add_argument('--inventory', metavar='FIXTURE_JSON',
+                        help="Inventaire au format FixtureInventoryBackend (inventaire du poste par défaut)")
+    parser.add_argument('--catalog', metavar='PROGRAMS_JSON', help="Catalogue (programs.json par défaut)")
+    args = parser.parse_args(argv)
+
+    try:
+        from .installed_inventory import InstalledInventory, FixtureInventoryBackend
+    except ImportError:
+        from installed_inventory import InstalledInventory, FixtureInventoryBackend
+    inventory = InstalledInventory(FixtureInventoryBackend(json_path=args.inventory)) if args.inventory else None
+    catalog = get_catalog(args.catalog) if args.catalog else None
+
+    start = time.perf_counter()
+    records = find_catalog_updates(catalog, inventory)
+    elapsed = (time.perf_counter() - start) * 1000
+    for record in records:
+        print(f"{record.name:40} {record.installed_version:>18} → {record.available_version}")
+    print(f"{len(records)} programme(s) à mettre à jour ({elapsed:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,41 +11,42 @@ from typing import Callable, Optional, List
 import json
 from pathlib import Path
 
+from process_runner import ProcessRunner
+from tool_discovery import get_tool_discovery
+
+# Libellés des phases signalées par winget/choco
+PHASE_MESSAGES = {
+    'download': ("⬇️ Téléchargement...", 50),
+    'verify': ("🔒 Vérification du fichier...", 75),
+    'install': ("⚙️ Installation...", 80),
+    'done': ("✅ Finalisation...", 90),
+}
+
 
 class InstallationManager:
     """Gestionnaire d'installations"""
     
     def __init__(self):
-        self.winget_available = self._check_winget()
-        self.chocolatey_available = self._check_chocolatey()
         self.current_installations = []
         self.installation_queue = []
     
+    @property
+    def winget_available(self) -> bool:
+        """WinGet présent dans le PATH (sans lancer de processus)"""
+        return self._check_winget()
+    
+    @property
+    def chocolatey_available(self) -> bool:
+        """Chocolatey présent dans le PATH (sans lancer de processus)"""
+        return self._check_chocolatey()
+    
     def _check_winget(self) -> bool:
         """Vérifier si WinGet est disponible"""
-        try:
-            result = subprocess.run(
-                ["winget", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except:
-            return False
+        return get_tool_discovery().available('winget')
     
     def _check_chocolatey(self) -> bool:
         """Vérifier si Chocolatey est disponible"""
-        try:
-            result = subprocess.run(
-                ["choco", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except:
-            return False
+        return get_tool_discovery().available('choco')
     
     def install_app(
         self,
@@ -138,24 +139,16 @@ class InstallationManager:
             if on_progress:
                 on_progress(f"⚙️ Exécution de l'installation...", 50)
             
-            # Exécuter commande
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            # Attendre fin
-            stdout, stderr = process.communicate()
+            # Exécuter commande (progression lue dans la sortie)
+            result = self._run_with_progress(cmd, on_progress)
             
             if on_progress:
                 on_progress(f"✅ Finalisation...", 90)
             
-            if process.returncode == 0:
+            if result.returncode == 0:
                 return True, f"✅ {app_name} installé avec succès"
             else:
-                return False, f"❌ Échec installation: {stderr}"
+                return False, f"❌ Échec installation: {result.stderr}"
         
         except Exception as e:
             return False, f"❌ Erreur WinGet: {str(e)}"
@@ -185,26 +178,31 @@ class InstallationManager:
             if on_progress:
                 on_progress(f"⚙️ Exécution de l'installation...", 50)
             
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            stdout, stderr = process.communicate()
+            result = self._run_with_progress(cmd, on_progress)
             
             if on_progress:
                 on_progress(f"✅ Finalisation...", 90)
             
-            if process.returncode == 0:
+            if result.returncode == 0:
                 return True, f"✅ {app_name} installé avec succès"
             else:
-                return False, f"❌ Échec installation: {stderr}"
+                return False, f"❌ Échec installation: {result.stderr}"
         
         except Exception as e:
             return False, f"❌ Erreur Chocolatey: {str(e)}"
     
+    def _run_with_progress(self, cmd, on_progress: Optional[Callable]):
+        """Exécute une commande en relayant sa progression (téléchargement: 50-75 %)"""
+        def on_event(event):
+            if not on_progress:
+                return
+            if event.kind == 'progress' and event.percent is not None:
+                on_progress(f"⬇️ Téléchargement... {event.percent:.0f}%", int(50 + event.percent / 4))
+            elif event.kind == 'phase' and event.phase in PHASE_MESSAGES:
+                on_progress(*PHASE_MESSAGES[event.phase])
+        
+        return ProcessRunner(progress_callback=on_event).run(cmd)
+    
     def _install_with_download(
         self,
         app_name: str,
@@ -255,7 +253,8 @@ class InstallationManager:
         self,
         apps: List[tuple[str, Optional[str], str]],
         on_app_complete: Optional[Callable[[str, bool, str], None]] = None,
-        on_all_complete: Optional[Callable[[int, int], None]] = None
+        on_all_complete: Optional[Callable[[int, int], None]] = None,
+        on_progress: Optional[Callable[[str, float], None]] = None
     ):
         """
         Installer plusieurs applications
@@ -264,6 +263,7 @@ class InstallationManager:
             apps: Liste de (app_name, package_id, method)
             on_app_complete: Callback (app_name, success, message)
             on_all_complete: Callback (success_count, total_count)
+            on_progress: Callback (message, progression globale 0-1)
         """
         def install_next(index: int, results: List[bool]):
             if index >= len(apps):
@@ -282,7 +282,11 @@ class InstallationManager:
                 # Installer suivante
                 install_next(index + 1, results)
             
-            self.install_app(app_name, package_id, method, None, on_complete)
+            def on_app_progress(message: str, percent: int):
+                if on_progress:
+                    on_progress(f"{app_name}: {message}", (index + percent / 100) / len(apps))
+            
+            self.install_app(app_name, package_id, method, on_app_progress, on_complete)
         
         # Démarrer installation séquentielle
         install_next(0, [])
@@ -22,6 +22,16 @@ else:
     if src_path not in sys.path:
         sys.path.insert(0, src_path)
 
+# Auxiliaire élevé du courtier d'élévation (exécutable figé): pas d'interface
+if len(sys.argv) > 1 and sys.argv[1] == '--elevation-broker':
+    from elevation_broker import serve_from_argv
+    sys.exit(serve_from_argv(sys.argv[2:]))
+
+# Gestion du miroir d'installateurs (prefetch/serve/list), sans interface
+if len(sys.argv) > 1 and sys.argv[1] == '--mirror':
+    from mirror_repository import main as mirror_main
+    sys.exit(mirror_main(sys.argv[2:]))
+
 
 import customtkinter as ctk
 import tkinter as tk
@@ -57,6 +67,8 @@ from v14_mvp.page_master_install import MasterInstallPage
 from v14_mvp.page_portables import PortableAppsPage
 from v14_mvp.page_terminal import TerminalPage
 from v14_mvp.splash_loader import SplashScreen
+from catalog_service import get_catalog
+from tool_discovery import get_tool_discovery
 
 
 class NiTriTeV14(ctk.CTk):
@@ -95,6 +107,9 @@ class NiTriTeV14(ctk.CTk):
         
         # Charger page par défaut
         self._show_page("applications")
+        
+        # Versions de winget/choco sondées en arrière-plan (jamais sur le chemin du démarrage)
+        self.after(1000, get_tool_discovery().probe_async)
     
     def _load_programs(self):
         """Charger données programmes (compatible PyInstaller et bureau)"""
@@ -105,8 +120,8 @@ class NiTriTeV14(ctk.CTk):
                 # Fallback chemin absolu depuis cwd
                 programs_path = os.path.abspath(os.path.join(os.getcwd(), 'data', 'programs.json'))
             if os.path.exists(programs_path):
-                with open(programs_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                # Catalogue partagé (déjà chargé par l'écran de démarrage, ou cache binaire)
+                return get_catalog(programs_path).categorized
             else:
                 print(f"⚠️ Fichier non trouvé: {programs_path}")
                 return {}
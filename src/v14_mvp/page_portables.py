@@ -14,6 +14,7 @@ from pathlib import Path
 from typing import Dict, List
 from v14_mvp.design_system import DesignTokens
 from v14_mvp.components import ModernCard, ModernButton, ModernSearchBar, ModernStatsCard
+from portable_database import PortableDatabase, PortableSearchIndex
 
 
 class PortableAppsPage(ctk.CTkFrame):
@@ -29,7 +30,27 @@ class PortableAppsPage(ctk.CTkFrame):
         # Base de données des applications portables
         self.portable_apps = self._get_portable_apps_database()
         
-        self.filtered_apps = self.portable_apps.copy()
+        # Historique des lancements (tri des cartes par utilisation)
+        try:
+            self.portable_db = PortableDatabase(
+                db_path=self.portable_dir / "portable_apps.db",
+                apps_folder=self.portable_dir
+            )
+        except Exception as e:
+            print(f"⚠️ Historique des lancements indisponible: {e}")
+            self.portable_db = None
+        self._usage = {}
+        self._usage_version = None
+        
+        self.filtered_apps = self._apps_by_usage()
+        
+        # Index plein texte pour la recherche à la frappe
+        self._search_entries = [
+            (category, app) for category, apps in self.portable_apps.items() for app in apps
+        ]
+        self._search_index = PortableSearchIndex(
+            dict(app, category=category) for category, app in self._search_entries
+        )
         self.downloading = set()  # Apps en cours de téléchargement
         
         self._create_header()
@@ -37,6 +58,23 @@ class PortableAppsPage(ctk.CTkFrame):
         self._create_search()
         self._create_content()
     
+    def _usage_ranks(self):
+        """Lancements par application (relus seulement après un nouvel enregistrement)"""
+        if self.portable_db is not None and self._usage_version != self.portable_db.usage_version:
+            self._usage_version = self.portable_db.usage_version
+            self._usage = self.portable_db.get_usage_ranks()
+        return self._usage
+    
+    def _apps_by_usage(self):
+        """Applications de chaque catégorie, les plus lancées d'abord"""
+        usage = self._usage_ranks()
+        if not usage:
+            return self.portable_apps.copy()
+        return {
+            category: sorted(apps, key=lambda app: -usage.get(app['name'], 0))
+            for category, apps in self.portable_apps.items()
+        }
+    
     def _get_portable_apps_database(self):
         """Base de données des applications portables avec URLs de téléchargement"""
         return {
@@ -644,19 +682,13 @@ class PortableAppsPage(ctk.CTkFrame):
             # Lancer le premier .exe trouvé
             main_exe = exe_files[0]
             print(f"🚀 Lancement de: {main_exe.name}")
-            try:
-                subprocess.Popen([str(main_exe)], cwd=str(app_folder))
-            except Exception as e:
-                print(f"❌ Erreur lancement: {e}")
+            self._run_tracked(app, [str(main_exe)], app_folder, main_exe)
         else:
             # Si pas d'exe, chercher LANCER.bat
             launcher = app_folder / "LANCER.bat"
             if launcher.exists():
                 print(f"🚀 Lancement du script: LANCER.bat")
-                try:
-                    subprocess.Popen(['cmd.exe', '/c', str(launcher)], cwd=str(app_folder), shell=False)
-                except Exception as e:
-                    print(f"❌ Erreur script: {e}")
+                self._run_tracked(app, ['cmd.exe', '/c', str(launcher)], app_folder, launcher)
             else:
                 # Ouvrir le dossier
                 print(f"📂 Ouverture du dossier")
@@ -665,6 +697,19 @@ class PortableAppsPage(ctk.CTkFrame):
                 except Exception as e:
                     print(f"❌ Erreur ouverture: {e}")
     
+    def _run_tracked(self, app, cmd, app_folder, executable):
+        """Lance l'application et enregistre le lancement (durée, succès) en arrière-plan"""
+        import subprocess
+        try:
+            process = subprocess.Popen(cmd, cwd=str(app_folder), shell=False)
+        except Exception as e:
+            print(f"❌ Erreur lancement: {e}")
+            if self.portable_db is not None:
+                self.portable_db.record_execution(app['name'], executable, success=False, notes=str(e))
+            return
+        if self.portable_db is not None:
+            self.portable_db.track_process(app['name'], process, executable)
+    
     def _uninstall_app(self, app, frame):
         """Désinstaller une application portable"""
         app_folder = self.portable_dir / app['name'].replace(" ", "_")
@@ -702,18 +747,15 @@ class PortableAppsPage(ctk.CTkFrame):
     
     def _on_search(self, query):
         """Recherche dans les apps portables"""
-        query = query.lower().strip()
+        query = query.strip()
         
         if not query:
-            self.filtered_apps = self.portable_apps.copy()
+            self.filtered_apps = self._apps_by_usage()
         else:
+            # Résultats classés (nom avant description), accents ignorés
             self.filtered_apps = {}
-            for category, apps in self.portable_apps.items():
-                filtered = [
-                    app for app in apps
-                    if query in app['name'].lower() or query in app['description'].lower()
-                ]
-                if filtered:
-                    self.filtered_apps[category] = filtered
+            for position in self._search_index.search(query):
+                category, app = self._search_entries[position]
+                self.filtered_apps.setdefault(category, []).append(app)
         
         self._update_display()
\ No newline at end of file
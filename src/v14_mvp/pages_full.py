@@ -12,10 +12,14 @@ import platform
 import os
 import json
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from v14_mvp.design_system import DesignTokens
 from v14_mvp.components import ModernCard, ModernButton, ModernStatsCard
+from installed_inventory import get_inventory
+from update_service import get_update_service, UpdateScan
 
 try:
     import psutil
@@ -31,6 +35,11 @@ class UpdatesPage(ctk.CTkFrame):
     def __init__(self, parent):
         super().__init__(parent, fg_color=DesignTokens.BG_PRIMARY)
         
+        # Lignes affichées {id: widgets}, mises à jour selon les différences entre analyses
+        self._update_rows = {}
+        self._scanning = False
+        self._updating = False
+        
         self._create_header()
         self._create_terminal()
         self._create_content()
@@ -161,67 +170,128 @@ class UpdatesPage(ctk.CTkFrame):
         )
         initial_msg.pack(pady=20)
     
-    def _check_updates(self):
-        """Rechercher mises à jour avec WinGet"""
+    def _check_updates(self, refresh=True):
+        """Rechercher mises à jour avec WinGet (analyse en arrière-plan)"""
+        if self._scanning:
+            return
+        self._scanning = True
         self._log_to_terminal("🔍 Recherche des mises à jour...")
         
-        # Clear liste
-        for widget in self.updates_scroll.winfo_children():
-            widget.destroy()
+        def worker():
+            # winget upgrade et inventaire des applications installées en parallèle
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                installed = executor.submit(lambda: get_inventory().installed_count())
+                try:
+                    scan = get_update_service().scan(refresh=refresh)
+                except Exception as e:
+                    # Catalogue introuvable, etc.: _show_scan libère _scanning
+                    scan = UpdateScan(error=str(e))
+                try:
+                    installed_count = installed.result()
+                except Exception:
+                    installed_count = None
+            self.after(0, lambda: self._show_scan(scan, installed_count))
         
-        try:
-            # Commande winget upgrade --list
-            result = subprocess.run(
-                ["winget", "upgrade"],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='ignore'
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _show_scan(self, scan, installed_count):
+        """Affiche le résultat d'une analyse (seules les lignes modifiées sont redessinées)"""
+        self._scanning = False
+        if not scan.ok:
+            self._log_to_terminal(f"❌ Erreur: {scan.error}")
+            return
+        
+        updates_count = len(scan.records)
+        self.stats_updates.update_value(str(updates_count))
+        if installed_count is not None:
+            self.stats_installed.update_value(str(installed_count))
+            self.stats_uptodate.update_value(str(max(0, installed_count - updates_count)))
+        
+        if scan.from_cache:
+            self._log_to_terminal(f"📊 {updates_count} mises à jour (analyse en cache)")
+        else:
+            self._log_to_terminal(f"✅ Scan terminé: {updates_count} mises à jour ({scan.diff.summary()})")
+        if scan.offline:
+            self._log_to_terminal("ℹ️ WinGet absent: versions installées comparées au catalogue")
+        
+        if not self._update_rows:
+            for widget in self.updates_scroll.winfo_children():
+                widget.destroy()
+        
+        current = {record.id: record for record in scan.records}
+        for package_id in [package_id for package_id in self._update_rows if package_id not in current]:
+            self._update_rows.pop(package_id)['frame'].destroy()
+        for record in scan.records:
+            row = self._update_rows.get(record.id)
+            if row is None:
+                self._update_rows[record.id] = self._create_update_row(record)
+            elif row['record'] != record:
+                row['label'].configure(text=self._update_row_text(record))
+                row['record'] = record
+        
+        if not self._update_rows:
+            msg = ctk.CTkLabel(
+                self.updates_scroll,
+                text="✅ Toutes les applications sont à jour",
+                font=(DesignTokens.FONT_FAMILY, DesignTokens.FONT_SIZE_MD),
+                text_color=DesignTokens.TEXT_PRIMARY
             )
-            
-            if result.returncode == 0:
-                output = result.stdout
-                self._log_to_terminal(f"✅ Scan terminé\n{output[:500]}...")
-                
-                # Parser output (simplifié)
-                lines = output.split('\n')
-                updates_count = 0
-                for line in lines:
-                    if '→' in line or 'Available' in line:
-                        updates_count += 1
-                
-                self.stats_updates.update_value(str(updates_count))
-                self._log_to_terminal(f"📊 {updates_count} mises à jour trouvées")
-                
-                # Afficher message
-                msg = ctk.CTkLabel(
-                    self.updates_scroll,
-                    text=f"✅ {updates_count} mises à jour disponibles\nUtilisez 'Tout Mettre à Jour' ou exécutez:\nwinget upgrade --all",
-                    font=(DesignTokens.FONT_FAMILY, DesignTokens.FONT_SIZE_MD),
-                    text_color=DesignTokens.TEXT_PRIMARY
-                )
-                msg.pack(pady=20)
-            else:
-                self._log_to_terminal(f"❌ Erreur: {result.stderr}")
-                
-        except FileNotFoundError:
-            self._log_to_terminal("❌ WinGet non trouvé. Installez depuis Microsoft Store.")
-        except Exception as e:
-            self._log_to_terminal(f"❌ Erreur: {e}")
+            msg.pack(pady=20)
+    
+    @staticmethod
+    def _update_row_text(record):
+        return f"{record.name or record.id}  ({record.id})   {record.installed_version} → {record.available_version}"
+    
+    def _create_update_row(self, record):
+        """Ligne d'une mise à jour avec case de sélection"""
+        frame = ctk.CTkFrame(self.updates_scroll, fg_color="transparent")
+        frame.pack(fill=tk.X, pady=2)
+        
+        selected = tk.BooleanVar(value=not record.truncated)
+        check = ctk.CTkCheckBox(frame, text="", variable=selected, width=24)
+        check.pack(side=tk.LEFT)
+        
+        label = ctk.CTkLabel(
+            frame,
+            text=self._update_row_text(record),
+            font=(DesignTokens.FONT_FAMILY, DesignTokens.FONT_SIZE_MD),
+            text_color=DesignTokens.TEXT_PRIMARY,
+            anchor="w"
+        )
+        label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        return {'frame': frame, 'label': label, 'selected': selected, 'record': record}
     
     def _update_all(self):
-        """Mettre à jour toutes les apps"""
-        self._log_to_terminal("⬇️ Lancement mise à jour globale...")
+        """Mettre à jour les applications sélectionnées (par lots, en arrière-plan)"""
+        if self._updating:
+            return
+        if not self._update_rows:
+            self._log_to_terminal("ℹ️ Lancez d'abord une recherche des mises à jour")
+            return
         
-        try:
-            # Ouvrir PowerShell avec commande winget
-            subprocess.Popen(
-                'start powershell -Command "winget upgrade --all"',
-                shell=True
-            )
-            self._log_to_terminal("✅ PowerShell lancé avec winget upgrade --all")
-        except Exception as e:
-            self._log_to_terminal(f"❌ Erreur: {e}")
+        ids = [package_id for package_id, row in self._update_rows.items() if row['selected'].get()]
+        if not ids:
+            self._log_to_terminal("ℹ️ Aucune mise à jour sélectionnée")
+            return
+        
+        self._updating = True
+        self._log_to_terminal(f"⬇️ Mise à jour de {len(ids)} application(s)...")
+        
+        def log(message):
+            self.after(0, lambda: self._log_to_terminal(message))
+        
+        def worker():
+            try:
+                results = get_update_service().upgrade(ids, log_callback=log)
+                succeeded = sum(1 for ok in results.values() if ok)
+                log(f"🏁 Terminé: {succeeded}/{len(ids)} mise(s) à jour appliquée(s)")
+            except Exception as e:
+                log(f"❌ Erreur: {e}")
+            finally:
+                self._updating = False
+                self.after(0, lambda: self._check_updates(refresh=False))
+        
+        threading.Thread(target=worker, daemon=True).start()
 
 
 class BackupPage(ctk.CTkFrame):
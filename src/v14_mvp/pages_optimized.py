@@ -521,23 +521,22 @@ class OptimizedApplicationsPage(ctk.CTkFrame):
             )
             close_btn.pack(pady=10)
         
+        # Progression réelle (événements des installateurs, relayés au thread UI)
+        def on_progress(message, fraction):
+            def update():
+                if progress_bar.get() >= 1.0:
+                    return  # Installation déjà terminée
+                progress_bar.set(min(fraction, 0.99))
+                progress_label.configure(text=message)
+            install_window.after(0, update)
+        
         # Lancer installations
         installer.install_multiple(
             apps_to_install,
             on_app_complete=on_app_complete,
-            on_all_complete=on_all_complete
+            on_all_complete=on_all_complete,
+            on_progress=on_progress
         )
-        
-        # Mettre à jour progress
-        total = len(apps_to_install)
-        def update_progress():
-            # Simuler progression (à améliorer avec vrai progress)
-            current = progress_bar.get()
-            if current < 0.95:
-                progress_bar.set(current + 0.01)
-                install_window.after(500, update_progress)
-        
-        update_progress()
     
     def _open_website(self, app_name):
         """Ouvrir le site web de l'application"""
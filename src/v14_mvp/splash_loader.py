@@ -14,6 +14,7 @@ import json
 import threading
 import time
 from v14_mvp.design_system import DesignTokens
+from catalog_service import get_catalog
 
 def resource_path(relative_path):
     try:
@@ -132,13 +133,10 @@ class SplashScreen(ctk.CTkToplevel):
             time.sleep(0.3)
             
             programs_path = resource_path(os.path.join('data', 'programs.json'))
-            if programs_path.exists():
-                with open(programs_path, 'r', encoding='utf-8') as f:
-                    self.data_loaded['programs'] = json.load(f)
-                    
-                    # Compter apps
-                    total_apps = sum(len(apps) for apps in self.data_loaded['programs'].values())
-                    self._update_stats(f"✅ {total_apps} applications chargées")
+            if os.path.exists(programs_path):
+                catalog = get_catalog(programs_path)
+                self.data_loaded['programs'] = catalog.categorized
+                self._update_stats(f"✅ {catalog.count} applications chargées")
             else:
                 self.data_loaded['programs'] = {}
                 self._update_stats("⚠️ Fichier programmes introuvable")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Comparaison de numéros de version
+Gère le versionnage sémantique (1.2.3-beta.1+build), les versions Windows
+à quatre composantes (10.0.19041.3693) et les particularités courantes des
+éditeurs: préfixe « v » ou « Version », suffixes d'architecture ou de langue
+(« 121.0 (x64 fr) »), séparateurs « _ » et « - », lettres de correctif
+(1.1.1w) et mots de préversion (alpha, beta, rc, preview...). Les zéros
+finaux sont ignorés: 1.2 == 1.2.0.0.
+
+Java: les notations 8u391, 8 Update 391 et 1.8.0_391 sont ramenées à la
+forme canonique 8.0.391 dès l'analyse (la chaîne seule suffit). Le numéro
+du registre (8.0.3910.9) n'est pas réinterprété.
+"""
+
+import re
+from functools import total_ordering
+from typing import Optional, Tuple
+
+# Rang des préversions (plus petit = plus ancien); les versions finales sont au-dessus
+PRERELEASE_RANKS = {
+    'dev': 0, 'snapshot': 0, 'nightly': 0,
+    'alpha': 1, 'a': 1,
+    'beta': 2, 'b': 2,
+    'preview': 3, 'pre': 3,
+    'rc': 4, 'c': 4,
+}
+
+_PARENTHESIS_RE = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+_PREFIX_RE = re.compile(r'^\s*(?:version|ver|v)\.?\s*', re.IGNORECASE)
+_JAVA_LEGACY_RE = re.compile(r'^1\.(\d+)\.0_(\d+)')
+_JAVA_UPDATE_RE = re.compile(r'^(\d+)(?:u|\s+update\s+)(\d+)', re.IGNORECASE)
+_JAVA_BUILD_RE = re.compile(r'-b\d+\b')
+_RELEASE_RE = re.compile(r'^\d+(?:[._]\d+)*')
+_TOKEN_RE = re.compile(r'[a-z]+|\d+')
+
+
+@total_ordering
+class Version:
+    """Version analysée, comparable avec les opérateurs habituels"""
+
+    __slots__ = ('text', 'release', 'prerelease', 'post')
+
+    def __init__(self, text: str, release: Tuple[int, ...], prerelease: Optional[Tuple] = None,
+                 post: Tuple = ()):
+        self.text = text
+        self.release = release
+        self.prerelease = prerelease
+        self.post = post
+
+    @property
+    def is_prerelease(self) -> bool:
+        return self.prerelease is not None
+
+    def _key(self):
+        # Une version finale est plus récente que toutes ses préversions
+        pre = (1,) if self.prerelease is None else (0,) + self.prerelease
+        return self.release, pre, self.post
+
+    def __eq__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __lt__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._key() < other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"Version({self.text!r})"
+
+
+def _identifier(token: str) -> Tuple:
+    """Identifiant comparable: les nombres avant le texte (règle semver)"""
+    return (0, int(token), '') if token.isdigit() else (1, 0, token)
+
+
+def parse_version(text) -> Optional[Version]:
+    """
+    Analyse une chaîne de version
+
+    Returns:
+        Version, ou None si la chaîne ne contient pas de numéro exploitable
+    """
+    if text is None:
+        return None
+    original = str(text)
+    value = _PARENTHESIS_RE.sub(' ', original).strip()
+    value = _PREFIX_RE.sub('', value)
+    # Métadonnées de build semver: sans effet sur l'ordre
+    value = value.split('+', 1)[0].strip().lower()
+    value = _JAVA_LEGACY_RE.sub(r'\1u\2', value)
+    java = bool(_JAVA_UPDATE_RE.match(value))
+    if java:
+        # Numéro de build (8u391-b13): pas une bêta
+        value = _JAVA_BUILD_RE.sub('', _JAVA_UPDATE_RE.sub(r'\1.0.\2', value))
+
+    match = _RELEASE_RE.match(value)
+    if not match:
+        return None
+    release = [int(part) for part in re.split(r'[._]', match.group(0))]
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+
+    attached = value[match.end():match.end() + 1].isalpha()
+    words = value[match.end():].strip(' .-_').split()
+    # Texte après la version (« 24.05 x64 », « 3.0.20 Final »): seul le premier mot compte,
+    # sauf un numéro de préversion séparé par une espace (« 7.0 preview 3 »)
+    tokens = _TOKEN_RE.findall(words[0]) if words else []
+    if len(tokens) == 1 and tokens[0] in PRERELEASE_RANKS and len(words) > 1 and words[1].isdigit():
+        tokens.append(words[1])
+    prerelease = None
+    post: Tuple = ()
+    if tokens:
+        word = tokens[0]
+        if word in PRERELEASE_RANKS and (word not in ('a', 'b', 'c') or len(tokens) > 1):
+            prerelease = (PRERELEASE_RANKS[word],) + tuple(_identifier(t) for t in tokens[1:])
+        elif word.isdigit():
+            # Composante supplémentaire séparée par « - » (1.2.3-4): révision
+            post = tuple(_identifier(t) for t in tokens)
+        elif attached and len(word) == 1:
+            # Lettre de correctif accolée (OpenSSL 1.1.1w): postérieure à la version nue
+            post = tuple(_identifier(t) for t in tokens)
+    return Version(original, tuple(release), prerelease, post)
+
+
+def compare_versions(a, b) -> Optional[int]:
+    """
+    Compare deux versions
+
+    Returns:
+        -1 si a < b, 0 si égales, 1 si a > b, None si l'une n'est pas analysable
+    """
+    version_a = a if isinstance(a, Version) else parse_version(a)
+    version_b = b if isinstance(b, Version) else parse_version(b)
+    if version_a is None or version_b is None:
+        return None
+    if version_a == version_b:
+        return 0
+    return -1 if version_a < version_b else 1
+
+
+def is_outdated(installed, latest) -> bool:
+    """Indique si la version installée est plus ancienne que la dernière connue"""
+    return compare_versions(installed, latest) == -1
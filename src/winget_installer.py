@@ -15,6 +15,13 @@ try:
 except ImportError:
     requests = None
 
+try:
+    from .http_client import get_http_client
+    from .tool_discovery import get_tool_discovery
+except ImportError:
+    from http_client import get_http_client
+    from tool_discovery import get_tool_discovery
+
 class WingetInstaller:
     """Installe winget automatiquement pour la version portable"""
     
@@ -26,19 +33,12 @@ class WingetInstaller:
         
     def is_winget_installed(self):
         """Vérifie si winget est déjà installé"""
-        try:
-            result = subprocess.run(
-                ["winget", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                self.logger.info(f"✅ Winget déjà installé: {version}")
+        discovery = get_tool_discovery()
+        if discovery.available('winget'):
+            version = discovery.version('winget', timeout=5)
+            if discovery.available('winget'):
+                self.logger.info(f"✅ Winget déjà installé: {version or 'version inconnue'}")
                 return True
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
         
         self.logger.info("⚠️ Winget non installé")
         return False
@@ -51,7 +51,7 @@ class WingetInstaller:
         
         try:
             self.logger.info(f"📥 Téléchargement: {url}")
-            response = requests.get(url, stream=True, timeout=60)
+            response = get_http_client().get(url, stream=True, timeout=60)
             response.raise_for_status()
             
             with open(destination, 'wb') as f:
@@ -127,6 +127,7 @@ class WingetInstaller:
             shutil.rmtree(temp_dir, ignore_errors=True)
             
             if result.returncode == 0:
+                get_tool_discovery().invalidate('winget')
                 self.logger.info("✅ Winget installé avec succès")
                 if callback:
                     callback("✅ Winget installé avec succès!")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analyse de la sortie texte de winget
+Convertit les tableaux de `winget list` / `winget upgrade` en enregistrements
+structurés, indépendamment de la langue de l'interface winget
+"""
+
+import re
+from typing import Dict, List
+
+# En-têtes connus (anglais, français, allemand, espagnol) -> clé normalisée
+HEADER_ALIASES = {
+    'name': 'name', 'nom': 'name', 'nombre': 'name',
+    'id': 'id', 'identifiant': 'id',
+    'version': 'version', 'versión': 'version',
+    'available': 'available', 'disponible': 'available', 'verfügbar': 'available',
+    'source': 'source', 'quelle': 'source', 'origen': 'source',
+}
+
+# Ordre des colonnes quand un en-tête n'est pas reconnu
+DEFAULT_COLUMNS = ['name', 'id', 'version', 'available', 'source']
+
+_SEPARATOR_RE = re.compile(r'^-{10,}\s*$')
+
+
+def _clean_line(line: str) -> str:
+    """Retire les animations de progression (\\r, spinner) d'une ligne winget"""
+    if '\r' in line:
+        line = line.split('\r')[-1]
+    return line.rstrip()
+
+
+def parse_winget_table(output: str) -> List[Dict[str, str]]:
+    """
+    Convertit le premier tableau d'une sortie winget en liste de dictionnaires
+
+    Les colonnes sont repérées par la position de leurs en-têtes (la ligne
+    précédant le séparateur '-----'), ce qui supporte les noms avec espaces.
+
+    Args:
+        output: Sortie texte de `winget list` ou `winget upgrade`
+
+    Returns:
+        Liste de dicts avec les clés 'name', 'id', 'version' et, selon la
+        commande, 'available' et 'source'
+    """
+    lines = [_clean_line(line) for line in output.splitlines()]
+
+    separator_index = None
+    for i, line in enumerate(lines):
+        if _SEPARATOR_RE.match(line.strip()) and i > 0:
+            separator_index = i
+            break
+    if separator_index is None:
+        return []
+
+    header = lines[separator_index - 1]
+    columns = [(m.start(), m.group(0)) for m in re.finditer(r'\S+', header)]
+    if not columns:
+        return []
+
+    keys = []
+    for index, (_, title) in enumerate(columns):
+        key = HEADER_ALIASES.get(title.lower())
+        if key is None or key in keys:
+            key = DEFAULT_COLUMNS[index] if index < len(DEFAULT_COLUMNS) else f'col{index}'
+        keys.append(key)
+
+    records = []
+    for line in lines[separator_index + 1:]:
+        if not line.strip():
+            break  # Fin du tableau (les lignes suivantes sont des résumés)
+        record = {}
+        for index, (start, _) in enumerate(columns):
+            end = columns[index + 1][0] if index + 1 < len(columns) else None
+            record[keys[index]] = line[start:end].strip() if end else line[start:].strip()
+        # Ligne de résumé sans identifiant ("3 mises à niveau disponibles.")
+        if not record.get('id'):
+            continue
+        records.append(record)
+
+    return records
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Session WinGet partagée
+Regroupe les appels winget: une seule liste des paquets installés mise en
+cache, et des installations groupées via un manifeste `winget import`
+au lieu d'un processus winget par paquet
+"""
+
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+try:
+    from .winget_parser import parse_winget_table
+    from .tool_discovery import get_tool_discovery
+except ImportError:
+    from winget_parser import parse_winget_table
+    from tool_discovery import get_tool_discovery
+
+logger = logging.getLogger(__name__)
+
+# Source winget par défaut (format du manifeste `winget export`)
+WINGET_SOURCE_DETAILS = {
+    "Argument": "https://cdn.winget.microsoft.com/cache",
+    "Identifier": "Microsoft.Winget.Source_8wekyb3d8bbwe",
+    "Name": "winget",
+    "Type": "Microsoft.PreIndexed.Package"
+}
+
+
+@dataclass
+class BatchResult:
+    """Résultat d'installation d'un paquet dans un lot"""
+    winget_id: str
+    success: bool
+    message: str = ''
+    already_installed: bool = False
+
+
+def _default_runner(cmd, timeout):
+    """Exécute une commande et retourne (success, returncode, stdout, stderr)"""
+    result = subprocess.run(
+        cmd,
+        capture_output=True,
+        text=True,
+        encoding='utf-8',
+        errors='ignore',
+        timeout=timeout,
+        creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+    )
+    return (result.returncode == 0, result.returncode, result.stdout, result.stderr)
+
+
+class WingetSession:
+    """
+    Accès groupé à winget
+
+    - `list_installed()` : une exécution de `winget list`, mise en cache (TTL)
+    - `installed_ids()` : identifiants exacts via `winget export` (JSON),
+      insensible à la troncature des colonnes de `winget list`
+    - `install_many()` : installation de plusieurs paquets avec un seul
+      `winget import`, puis résultat par paquet
+    """
+
+    def __init__(self, executable: Optional[str] = None, cache_ttl: float = 300):
+        """
+        Args:
+            executable: Chemin de winget (recherché à chaque appel par défaut)
+            cache_ttl: Durée de validité des listes en cache (secondes)
+        """
+        self._executable = executable
+        self.cache_ttl = cache_ttl
+        self._lock = threading.Lock()
+        self._list_cache = None
+        self._list_time = 0.0
+        self._ids_cache = None
+        self._ids_time = 0.0
+
+    @property
+    def executable(self) -> Optional[str]:
+        """
+        Chemin de winget, résolu à chaque appel par la découverte d'outils:
+        un winget installé pendant la session est pris en compte après
+        get_tool_discovery().invalidate('winget')
+        """
+        return self._executable or get_tool_discovery().executable('winget')
+
+    @property
+    def available(self) -> bool:
+        """winget est-il présent sur le système"""
+        return bool(self.executable)
+
+    def invalidate(self):
+        """Vide les listes en cache (après une installation)"""
+        with self._lock:
+            self._list_cache = None
+            self._ids_cache = None
+
+    def _fresh(self, timestamp: float) -> bool:
+        return (time.time() - timestamp) < self.cache_ttl
+
+    def list_installed(self, refresh=False, timeout=60) -> Optional[List[Dict[str, str]]]:
+        """
+        Paquets installés selon `winget list` (nom, id, version, disponible, source)
+
+        Returns:
+            Liste d'enregistrements, ou None si winget est indisponible
+        """
+        if not self.available:
+            return None
+        with self._lock:
+            if not refresh and self._list_cache is not None and self._fresh(self._list_time):
+                return self._list_cache
+
+        try:
+            success, _, stdout, _ = _default_runner(
+                [self.executable, 'list', '--accept-source-agreements', '--disable-interactivity'],
+                timeout
+            )
+        except (subprocess.TimeoutExpired, OSError) as e:
+            logger.debug(f"winget list indisponible: {e}")
+            return None
+        if not success:
+            return None
+
+        records = parse_winget_table(stdout)
+        with self._lock:
+            self._list_cache = records
+            self._list_time = time.time()
+        return records
+
+    def installed_ids(self, refresh=False, timeout=120) -> Optional[Dict[str, str]]:
+        """
+        Identifiants installés et leurs versions via `winget export`
+
+        Returns:
+            dict {id en minuscules: version}, ou None si winget est indisponible
+        """
+        if not self.available:
+            return None
+        with self._lock:
+            if not refresh and self._ids_cache is not None and self._fresh(self._ids_time):
+                return self._ids_cache
+
+        ids = None
+        export_file = Path(tempfile.gettempdir()) / f"nitrite_winget_export_{os.getpid()}.json"
+        try:
+            success, _, _, _ = _default_runner(
+                [self.executable, 'export', '-o', str(export_file), '--include-versions',
+                 '--accept-source-agreements', '--disable-interactivity'],
+                timeout
+            )
+            if export_file.exists():
+                with open(export_file, 'r', encoding='utf-8-sig') as f:
+                    data = json.load(f)
+                ids = {}
+                for source in data.get('Sources', []):
+                    for package in source.get('Packages', []):
+                        package_id = package.get('PackageIdentifier', '')
+                        if package_id:
+                            ids[package_id.lower()] = package.get('Version', '')
+        except (subprocess.TimeoutExpired, OSError, ValueError) as e:
+            logger.debug(f"winget export indisponible: {e}")
+        finally:
+            try:
+                export_file.unlink()
+            except OSError:
+                pass
+
+        if ids is None:
+            # Repli: identifiants lus dans le tableau de `winget list`
+            records = self.list_installed(refresh=refresh)
+            if records is None:
+                return None
+            ids = {r['id'].lower(): r.get('version', '') for r in records if r.get('id')}
+
+        with self._lock:
+            self._ids_cache = ids
+            self._ids_time = time.time()
+        return ids
+
+    def is_installed(self, winget_id: str) -> bool:
+        """Indique si un paquet est installé (liste en cache)"""
+        ids = self.installed_ids()
+        return bool(ids) and winget_id.lower() in ids
+
+    def build_import_manifest(self, winget_ids: List[str], manifest_path) -> Path:
+        """Écrit un manifeste `winget import` pour une liste d'identifiants"""
+        manifest = {
+            "$schema": "https://aka.ms/winget-packages.schema.2.0.json",
+            "CreationDate": datetime.now().isoformat(),
+            "Sources": [{
+                "Packages": [{"PackageIdentifier": winget_id} for winget_id in winget_ids],
+                "SourceDetails": WINGET_SOURCE_DETAILS
+            }],
+            "WinGetVersion": "1.6"
+        }
+        manifest_path = Path(manifest_path)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest_path
+
+    def install_many(self, winget_ids: List[str], timeout=3600,
+                     runner: Optional[Callable] = None,
+                     log_callback: Optional[Callable] = None) -> Dict[str, BatchResult]:
+        """
+        Installe plusieurs paquets avec un seul `winget import`
+
+        Args:
+            winget_ids: Identifiants winget à installer
+            timeout: Timeout global du lot (secondes)
+            runner: Fonction (cmd, timeout) -> (success, returncode, stdout, stderr),
+                    par ex. run_as_admin_silent pour une exécution élevée
+            log_callback: Fonction (message, level) pour les logs
+
+        Returns:
+            dict {winget_id: BatchResult} pour chaque identifiant demandé
+        """
+        log = log_callback if log_callback else (lambda message, level="info": logger.info(message))
+        results: Dict[str, BatchResult] = {}
+        if not self.available:
+            for winget_id in winget_ids:
+                results[winget_id] = BatchResult(winget_id, False, "WinGet n'est pas disponible")
+            return results
+
+        # Ne pas réinstaller ce qui est déjà présent
+        before = self.installed_ids() or {}
+        to_install = []
+        for winget_id in dict.fromkeys(winget_ids):
+            if winget_id.lower() in before:
+                results[winget_id] = BatchResult(winget_id, True, "Déjà installé", already_installed=True)
+            else:
+                to_install.append(winget_id)
+
+        if not to_install:
+            return results
+
+        manifest_path = Path(tempfile.gettempdir()) / f"nitrite_winget_import_{os.getpid()}_{int(time.time())}.json"
+        self.build_import_manifest(to_install, manifest_path)
+        cmd = [
+            self.executable, 'import', '-i', str(manifest_path),
+            '--accept-package-agreements', '--accept-source-agreements',
+            '--ignore-unavailable', '--ignore-versions', '--disable-interactivity'
+        ]
+        log(f"📦 Installation groupée WinGet: {len(to_install)} paquet(s)", "info")
+
+        output = ''
+        try:
+            _, returncode, stdout, stderr = (runner or _default_runner)(cmd, timeout)
+            output = f"{stdout or ''}\n{stderr or ''}"
+            log(f"🔧 winget import terminé (code {returncode})", "info")
+        except subprocess.TimeoutExpired:
+            log(f"⏱️ Timeout de l'installation groupée WinGet", "warning")
+        except Exception as e:
+            log(f"❌ Erreur installation groupée WinGet: {e}", "error")
+        finally:
+            try:
+                manifest_path.unlink()
+            except OSError:
+                pass
+
+        # Résultat par paquet: comparer la liste des paquets installés
+        self.invalidate()
+        after = self.installed_ids(refresh=True) or {}
+        for winget_id in to_install:
+            if winget_id.lower() in after:
+                results[winget_id] = BatchResult(winget_id, True, "Installé")
+            else:
+                results[winget_id] = BatchResult(winget_id, False, self._failure_reason(winget_id, output))
+        return results
+
+    @staticmethod
+    def _failure_reason(winget_id: str, output: str) -> str:
+        """Extrait de la sortie winget la ligne concernant un paquet, si présente"""
+        for line in output.splitlines():
+            if winget_id.lower() in line.lower():
+                return line.strip()[:200]
+        return "Paquet absent après l'installation groupée"
+
+
+# Session partagée par l'application
+_session: Optional[WingetSession] = None
+_session_lock = threading.Lock()
+
+
+def get_winget_session() -> WingetSession:
+    """Retourne la session winget partagée"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = WingetSession()
+        return _session